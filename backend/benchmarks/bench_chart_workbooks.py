@@ -0,0 +1,67 @@
+"""Benchmark the embedded chart workbook modes on a deck of preset charts.
+
+Builds the charts of bench_charts.py (--charts of every preset) into one
+deck per chart workbook mode and writes it with write_pptx, recording the
+best build and save times over --repeat decks, the deck size and the bytes
+of its embedded workbooks.
+
+Usage (from backend/):
+    python benchmarks/bench_chart_workbooks.py [--charts 10] [--categories 30] [--repeat 5]
+"""
+import argparse
+import io
+import os
+import sys
+import time
+import zipfile
+
+from pptx import Presentation
+from pptx.util import Inches
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_charts import preset_charts
+from services.chart_workbooks import CHART_WORKBOOK_MODES, ChartWorkbooks
+from services.ppt_generator import CHART_FACTORY
+from services.pptx_stream import write_pptx
+
+
+def build_and_save(charts, mode):
+    """(build seconds, save seconds, deck bytes)"""
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    start = time.perf_counter()
+    workbooks = ChartWorkbooks(prs.part.package, mode)
+    for index, (preset, chart_data, style) in enumerate(charts):
+        CHART_FACTORY.add_chart(slide.shapes, preset, Inches(index % 10), Inches(1), Inches(4), Inches(3), chart_data, workbooks=workbooks, **style)
+    built = time.perf_counter()
+    buffer = io.BytesIO()
+    write_pptx(prs, buffer)
+    return built - start, time.perf_counter() - built, buffer.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--charts", type=int, default=10, help="charts of each preset")
+    parser.add_argument("--categories", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    charts = preset_charts(args)
+    # Templates are cached per process; build them before timing any mode
+    build_and_save(charts, 'full')
+
+    print(f"{len(charts)} charts, {args.categories} categories")
+    print(f"{'mode':<10}{'build':>10}{'save':>10}{'total':>10}{'deck':>12}{'workbooks':>12}")
+    for mode in CHART_WORKBOOK_MODES:
+        runs = [build_and_save(charts, mode) for _ in range(args.repeat)]
+        build = min(run[0] for run in runs)
+        save = min(run[1] for run in runs)
+        deck = runs[-1][2]
+        with zipfile.ZipFile(io.BytesIO(deck)) as package:
+            embedded = sum(info.compress_size for info in package.infolist() if info.filename.startswith('ppt/embeddings/'))
+        print(f"{mode:<10}{build * 1000:>8.1f}ms{save * 1000:>8.1f}ms{(build + save) * 1000:>8.1f}ms{len(deck):>12}{embedded:>12}")
+
+
+if __name__ == "__main__":
+    main()
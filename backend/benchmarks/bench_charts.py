@@ -0,0 +1,113 @@
+"""Micro-benchmark charts built with add_chart plus styling against cached presets.
+
+Adds --charts charts of every preset to a blank deck, once through
+shapes.add_chart followed by the preset's style function (how every chart
+was built before) and once through ChartFactory, then checks that both decks
+have the same chart XML. The factory's first deck also pays for building
+its templates; later decks reuse them like a long-lived report worker does.
+
+Usage (from backend/):
+    python benchmarks/bench_charts.py [--charts 10] [--categories 30] [--repeat 10]
+"""
+import argparse
+import datetime
+import os
+import sys
+import time
+
+from lxml import etree
+from pptx import Presentation
+from pptx.chart.data import CategoryChartData, ChartData
+from pptx.util import Inches
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.chart_factory import ChartFactory
+from services.ppt_generator import CHART_PRESETS, DEFAULT_COLOR, POINT_STYLED_PRESETS
+
+SENTIMENTS = ['Positive', 'Neutral', 'Negative']
+FIRST_DAY = datetime.datetime(2025, 4, 1)
+
+
+def sentiment_data(categories, offset):
+    chart_data = CategoryChartData()
+    chart_data.categories = categories
+    for position, name in enumerate(SENTIMENTS):
+        chart_data.add_series(name, [(index * 7 + position * 3 + offset) % 50 for index in range(len(categories))])
+    return chart_data
+
+
+def preset_charts(args):
+    """(preset, chart data, style) of one deck, with data varying from chart to chart"""
+    days = [FIRST_DAY + datetime.timedelta(days=day) for day in range(args.categories)]
+    labels = [day.strftime('%Y-%m-%d') for day in days]
+    companies = [f"Company {index}" for index in range(args.categories)]
+    charts = []
+    for offset in range(args.charts):
+        donut = ChartData()
+        donut.categories = SENTIMENTS
+        donut.add_series('', [offset + 5, 2 * offset + 1, offset + 3])
+        authors = CategoryChartData()
+        authors.categories = [f"site{index}.az" for index in range(20)]
+        authors.add_series('', [(index + offset) * 3 for index in range(20)])
+        charts += [
+            ('sentiment_line', sentiment_data(days, offset), {'title': "Trend", 'graph_color': DEFAULT_COLOR}),
+            ('sentiment_donut', donut, {'title': "Donut", 'graph_color': DEFAULT_COLOR}),
+            ('company_overview', sentiment_data(companies, offset), {'graph_color': DEFAULT_COLOR}),
+            ('company_multibar', sentiment_data(companies, offset), {'title': "Companies", 'graph_color': DEFAULT_COLOR}),
+            ('author_bar', authors, {}),
+            ('day_multibar', sentiment_data(days, offset), {'title': "Days", 'graph_color': DEFAULT_COLOR}),
+            ('stacked_day_bar', sentiment_data(labels, offset), {'title': "Days", 'graph_color': DEFAULT_COLOR, 'data_labels': True}),
+        ]
+    return charts
+
+
+def add_and_style(slide, charts, factory):
+    for index, (preset, chart_data, style) in enumerate(charts):
+        chart_type, apply_style = CHART_PRESETS[preset]
+        chart = slide.shapes.add_chart(chart_type, Inches(index % 10), Inches(1), Inches(4), Inches(3), chart_data).chart
+        apply_style(chart, **style)
+
+
+def from_presets(slide, charts, factory):
+    for index, (preset, chart_data, style) in enumerate(charts):
+        factory.add_chart(slide.shapes, preset, Inches(index % 10), Inches(1), Inches(4), Inches(3), chart_data, **style)
+
+
+def measure(add_charts, args, charts):
+    """(first deck, best later deck) times over --repeat fresh decks, and the last deck"""
+    factory = ChartFactory(CHART_PRESETS, point_styled=POINT_STYLED_PRESETS)
+    times = []
+    for _ in range(args.repeat):
+        prs = Presentation()
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        start = time.perf_counter()
+        add_charts(slide, charts, factory)
+        times.append(time.perf_counter() - start)
+    return times[0], min(times[1:] or times), prs
+
+
+def chart_xml(prs):
+    return [etree.tostring(shape.chart.part._element) for slide in prs.slides for shape in slide.shapes if shape.has_chart]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--charts", type=int, default=10, help="charts of each preset")
+    parser.add_argument("--categories", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    charts = preset_charts(args)
+    old_first, old_best, old_deck = measure(add_and_style, args, charts)
+    new_first, new_best, new_deck = measure(from_presets, args, charts)
+
+    print(f"{len(charts)} charts, {args.categories} categories")
+    print(f"{'mode':<18}{'first deck':>12}{'best deck':>12}{'per chart':>12}")
+    for name, first, best in (("add_chart + style", old_first, old_best), ("chart presets", new_first, new_best)):
+        print(f"{name:<18}{first * 1000:>10.1f}ms{best * 1000:>10.1f}ms{best * 1000 / len(charts):>10.2f}ms")
+    print(f"speedup {old_best / new_best:.1f}x, identical chart XML: {chart_xml(old_deck) == chart_xml(new_deck)}")
+
+
+if __name__ == "__main__":
+    main()
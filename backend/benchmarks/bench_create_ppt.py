@@ -0,0 +1,187 @@
+"""Benchmark create_ppt region by region on synthetic inputs.
+
+Synthesizes the report workbooks and images at the requested scale, builds
+the deck, and records wall time per slide region, peak traced memory and
+output size as JSON. With --baseline, each metric is compared against a
+previous run and the exit status is 1 if any regressed past --threshold.
+
+Usage (from backend/):
+    python benchmarks/bench_create_ppt.py [--rows 20000] [--companies 8] [--days 30]
+        [--posts 4] [--competitor-logos 3] [--no-competitors] [--from-excel]
+        [--chart-workbooks full|minimal|shared|deferred] [--repeat 3] [--output results.json] [--baseline baseline.json]
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+import pptx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import CHART_WORKBOOK_MODE
+from benchmarks.synthetic_data import company_names, synthesize_images, synthesize_workbooks, typed_frames, write_workbooks
+from services.chart_workbooks import CHART_WORKBOOK_MODES
+from services.excel_parser import parse_excel_data
+from services.ppt_generator import create_ppt
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def build_deck(data_frames, report_options):
+    """Build one deck in memory; return ({region: seconds}, total seconds, deck bytes, image stats)"""
+    marks = []
+    buffer = io.BytesIO()
+    start = time.perf_counter()
+    image_stats = create_ppt(
+        data_frames=data_frames,
+        output_path=buffer,
+        progress_callback=lambda region: marks.append((region, time.perf_counter())),
+        **report_options
+    )
+    end = time.perf_counter()
+
+    # A region runs from its progress mark to the next one; the first mark
+    # also absorbs setup work done before it
+    regions = {}
+    boundaries = [start] + [mark for _, mark in marks[1:]] + [end]
+    for (region, _), region_start, region_end in zip(marks, boundaries, boundaries[1:]):
+        regions[region] = region_end - region_start
+    return regions, end - start, buffer.getbuffer().nbytes, image_stats
+
+
+def run_benchmark(args, workdir):
+    workbooks = synthesize_workbooks(args.rows, args.companies, args.days, seed=args.seed)
+    images = synthesize_images(workdir, posts=args.posts, competitor_logos=args.competitor_logos)
+    report_options = dict(
+        start_date='01.04.2025',
+        end_date='30.04.2025',
+        company_name=company_names(args.companies)[0],
+        positive_links=['https://example.com/positive'],
+        negative_links=['https://example.com/negative'],
+        has_competitors=not args.no_competitors,
+        template_color='#D63740',
+        title_color='#D63740',
+        graph_color='#D63740',
+        chart_workbook_mode=args.chart_workbooks,
+        **images
+    )
+
+    result = {}
+    if args.from_excel:
+        paths = write_workbooks(workbooks, workdir)
+        start = time.perf_counter()
+        data_frames = {role: parse_excel_data(path) for role, path in paths.items()}
+        result['parse_seconds'] = time.perf_counter() - start
+    else:
+        data_frames = typed_frames(workbooks)
+
+    # Best of --repeat untraced runs for timings, then one traced run for memory
+    runs = [build_deck(data_frames, report_options) for _ in range(args.repeat)]
+    regions = {region: min(run[0][region] for run in runs) for region in runs[0][0]}
+    total = min(run[1] for run in runs)
+
+    tracemalloc.start()
+    _, _, output_bytes, image_stats = build_deck(data_frames, report_options)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    result.update({
+        'regions': regions,
+        'total_seconds': total,
+        'peak_memory_bytes': peak,
+        'output_bytes': output_bytes,
+        'image_stats': image_stats,
+    })
+    return result
+
+
+def compare(result, baseline, threshold, min_seconds):
+    """Print current vs baseline metrics; return the names of regressed metrics"""
+    rows = [(f"region {name}", seconds, baseline['regions'].get(name)) for name, seconds in result['regions'].items()]
+    rows += [(key, result[key], baseline.get(key)) for key in ('total_seconds', 'peak_memory_bytes', 'output_bytes', 'parse_seconds') if key in result]
+
+    regressions = []
+    print(f"{'metric':<28}{'baseline':>14}{'current':>14}{'change':>10}")
+    for name, current, previous in rows:
+        if not previous:
+            print(f"{name:<28}{'-':>14}{current:>14.4g}")
+            continue
+        change = (current - previous) / previous
+        flag = ""
+        # Regions that take a few milliseconds are mostly noise in relative terms
+        timing = name.startswith('region') or name.endswith('seconds')
+        if change > threshold and not (timing and current - previous < min_seconds):
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<28}{previous:>14.4g}{current:>14.4g}{change:>+10.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000, help="Mentions per combined_sources sheet")
+    parser.add_argument("--companies", type=int, default=8)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--posts", type=int, default=4, help="Positive and negative post images each")
+    parser.add_argument("--competitor-logos", type=int, default=3)
+    parser.add_argument("--no-competitors", action="store_true")
+    parser.add_argument("--from-excel", action="store_true", help="Write and parse real workbooks instead of typed frames")
+    parser.add_argument("--chart-workbooks", choices=CHART_WORKBOOK_MODES, default=CHART_WORKBOOK_MODE, help="Embedded chart workbook mode")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "create_ppt.json"))
+    parser.add_argument("--baseline", help="Earlier --output file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown/growth counted as a regression")
+    parser.add_argument("--min-seconds", type=float, default=0.005, help="Ignore timing regressions smaller than this")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-create-ppt-") as workdir:
+        result = run_benchmark(args, workdir)
+
+    result['scale'] = {
+        'rows': args.rows,
+        'companies': args.companies,
+        'days': args.days,
+        'posts': args.posts,
+        'competitor_logos': args.competitor_logos,
+        'has_competitors': not args.no_competitors,
+        'from_excel': args.from_excel,
+        'seed': args.seed,
+    }
+    # Not part of the scale, so runs in different modes compare against each other
+    result['chart_workbooks'] = args.chart_workbooks
+    result['environment'] = {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'python_pptx': pptx.__version__,
+        'machine': platform.machine(),
+    }
+    result['recorded_at'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(result, f, indent=2)
+    print(f"Wrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('scale') != result['scale']:
+            print("Warning: baseline was recorded at a different scale")
+        if compare(result, baseline, args.threshold, args.min_seconds):
+            sys.exit(1)
+    else:
+        for region, seconds in result['regions'].items():
+            print(f"{region:<14}{seconds:>8.3f}s")
+        print(f"{'total':<14}{result['total_seconds']:>8.3f}s  peak {result['peak_memory_bytes'] / 2**20:.1f} MiB  deck {result['output_bytes'] / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
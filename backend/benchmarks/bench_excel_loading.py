@@ -0,0 +1,70 @@
+"""Benchmark Excel loading against the sample workbooks in uploads/.
+
+Compares the old per-sheet ``pd.read_excel`` loop (which re-opens the
+workbook for every sheet) with ``parse_excel_data``, which opens it once.
+
+Usage (from backend/):
+    python benchmarks/bench_excel_loading.py [--repeat 3] [files ...]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.excel_parser import get_excel_engine, parse_excel_data
+
+UPLOADS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "uploads")
+
+
+def parse_per_sheet(path, engine=None):
+    """Previous implementation: one read_excel call (and zip parse) per sheet"""
+    excel_file = pd.ExcelFile(path, engine=engine)
+    return {
+        sheet_name: pd.read_excel(path, sheet_name=sheet_name, engine=engine)
+        for sheet_name in excel_file.sheet_names
+    }
+
+
+def parse_single_handle(path, engine):
+    with pd.ExcelFile(path, engine=engine) as excel_file:
+        return {sheet_name: excel_file.parse(sheet_name) for sheet_name in excel_file.sheet_names}
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*", help="Workbooks to load (default: uploads/*.xlsx)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    files = args.files or sorted(glob.glob(os.path.join(UPLOADS_DIR, "*.xlsx")))
+    engine = get_excel_engine()
+
+    print(f"{'file':<28}{'sheets':>7}{'per-sheet':>12}{'openpyxl x1':>13}{engine + ' x1':>14}{'speedup':>9}")
+    total_old = total_new = 0.0
+    for path in files:
+        sheets = len(pd.ExcelFile(path).sheet_names)
+        old = best_of(lambda: parse_per_sheet(path), args.repeat)
+        single = best_of(lambda: parse_single_handle(path, "openpyxl"), args.repeat)
+        new = best_of(lambda: parse_excel_data(path), args.repeat)
+        total_old += old
+        total_new += new
+        print(f"{os.path.basename(path):<28}{sheets:>7}{old:>11.3f}s{single:>12.3f}s{new:>13.3f}s{old / new:>8.1f}x")
+    print(f"{'total':<35}{total_old:>11.3f}s{'':>13}{total_new:>13.3f}s{total_old / total_new:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark parsing the uploaded workbooks serially vs in parallel.
+
+Serial is the previous path: each workbook parsed one after another in the
+report worker. Parallel parses every workbook on its own process of a warm
+pool (as parse_workbooks does) and unpickles the returned frames. The parse
+cache is pointed at a fresh directory for every run so each one is a miss.
+
+Usage (from backend/):
+    python benchmarks/bench_parallel_parse.py [--repeat 3] [--workers 4] [files ...]
+"""
+import argparse
+import glob
+import multiprocessing
+import os
+import pickle
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.parse_cache import parse_excel_data_cached, parse_excel_payload
+
+UPLOADS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "uploads")
+
+
+def parse_serial(uploads, cache_dir):
+    return {role: parse_excel_data_cached(content, role, cache_dir) for role, content in uploads.items()}
+
+
+def parse_parallel(executor, uploads, cache_dir):
+    futures = {role: executor.submit(parse_excel_payload, content, role, cache_dir) for role, content in uploads.items()}
+    return {role: pickle.loads(future.result()) for role, future in futures.items()}
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory(prefix="bench-parse-cache-") as cache_dir:
+            start = time.perf_counter()
+            func(cache_dir)
+            timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*", help="Workbooks to parse (default: uploads/*.xlsx)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    files = args.files or sorted(glob.glob(os.path.join(UPLOADS_DIR, "*.xlsx")))
+    uploads = {}
+    for path in files:
+        with open(path, "rb") as f:
+            uploads[os.path.basename(path).split('.')[0]] = f.read()
+
+    # The report pool is long-lived, so worker start-up is excluded
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        with tempfile.TemporaryDirectory(prefix="bench-parse-cache-") as cache_dir:
+            parse_parallel(executor, uploads, cache_dir)
+
+        for role, content in uploads.items():
+            single = best_of(lambda cache_dir: parse_serial({role: content}, cache_dir), args.repeat)
+            print(f"{role:<28}{len(content) / 2**20:>8.1f} MiB{single:>10.3f}s")
+
+        serial = best_of(lambda cache_dir: parse_serial(uploads, cache_dir), args.repeat)
+        parallel = best_of(lambda cache_dir: parse_parallel(executor, uploads, cache_dir), args.repeat)
+
+    print(f"{'serial':<40}{serial:>10.3f}s")
+    print(f"{'parallel (' + str(args.workers) + ' workers)':<40}{parallel:>10.3f}s{serial / parallel:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
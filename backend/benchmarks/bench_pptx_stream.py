@@ -0,0 +1,112 @@
+"""Benchmark peak memory of saving a large synthetic deck.
+
+Builds a deck of chart slides with full-resolution photos and compares the
+Python heap peak (tracemalloc) while saving it with ``Presentation.save`` and
+with the streaming writer in ``services.pptx_stream``, with and without
+release_parts (PPTX_RELEASE_PARTS for create_ppt).
+
+Usage (from backend/):
+    python benchmarks/bench_pptx_stream.py [--slides 24] [--image-size 3000x2000]
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+from PIL import Image
+from pptx import Presentation
+from pptx.chart.data import CategoryChartData
+from pptx.enum.chart import XL_CHART_TYPE
+from pptx.util import Inches
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.pptx_stream import write_pptx
+
+
+def make_photo(width, height, seed):
+    """Noisy JPEG that compresses about as badly as a real photo"""
+    rng = np.random.default_rng(seed)
+    pixels = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def build_deck(slides, width, height, days=90):
+    prs = Presentation()
+    prs.slide_width = Inches(13.33)
+    prs.slide_height = Inches(7.5)
+    for index in range(slides):
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        chart_data = CategoryChartData()
+        chart_data.categories = [f"2025-01-{day % 28 + 1:02d}" for day in range(days)]
+        for series in ("Positive", "Neutral", "Negative"):
+            chart_data.add_series(series, [(index + day) % 17 for day in range(days)])
+        slide.shapes.add_chart(XL_CHART_TYPE.COLUMN_STACKED, Inches(0.5), Inches(0.5), Inches(7), Inches(6), chart_data)
+        slide.shapes.add_picture(io.BytesIO(make_photo(width, height, index)), Inches(8), Inches(0.5), width=Inches(4.5))
+    return prs
+
+
+def save_default(prs):
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    return len(buffer.getvalue())
+
+
+def save_streaming_memory(prs):
+    buffer = io.BytesIO()
+    write_pptx(prs, buffer)
+    return len(buffer.getvalue())
+
+
+def save_streaming_file(prs):
+    with tempfile.TemporaryFile() as pkg_file:
+        write_pptx(prs, pkg_file)
+        return pkg_file.tell()
+
+
+def save_releasing_parts(prs):
+    buffer = io.BytesIO()
+    write_pptx(prs, buffer, release_parts=True)
+    return len(buffer.getvalue())
+
+
+def measure(save, args):
+    # Trace the build too, so blobs released during the save count against the peak
+    tracemalloc.start()
+    prs = build_deck(args.slides, *args.image_size)
+    baseline = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    size = save(prs)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    return size, peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slides", type=int, default=24)
+    parser.add_argument("--image-size", type=lambda value: tuple(int(n) for n in value.split("x")), default=(3000, 2000))
+    args = parser.parse_args()
+
+    modes = [
+        ("Presentation.save -> BytesIO", save_default),
+        ("write_pptx -> BytesIO", save_streaming_memory),
+        ("write_pptx -> file", save_streaming_file),
+        ("write_pptx release_parts", save_releasing_parts),
+    ]
+    print(f"{'mode':<32}{'deck MiB':>10}{'peak MiB':>10}{'time':>9}")
+    for name, save in modes:
+        size, peak, elapsed = measure(save, args)
+        print(f"{name:<32}{size / 2**20:>10.1f}{peak / 2**20:>10.1f}{elapsed:>8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
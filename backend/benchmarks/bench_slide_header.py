@@ -0,0 +1,95 @@
+"""Micro-benchmark slide headers built shape by shape against cloned fragments.
+
+Adds the header and side line to --slides blank slides, once through
+add_slide_header/add_side_line on every slide and once by capturing them on
+the first slide and cloning the fragment onto the rest, then checks that both
+decks have the same slide XML.
+
+Usage (from backend/):
+    python benchmarks/bench_slide_header.py [--slides 10] [--repeat 20] [--no-logo]
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+from lxml import etree
+from PIL import Image
+from pptx import Presentation
+from pptx.util import Inches
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.image_registry import ImageRegistry
+from services.ppt_generator import DEFAULT_COLOR, add_side_line, add_slide_header, capture_slide_header, header_title
+
+HEADER_ARGS = ('01.04.2025', '30.04.2025')
+
+
+def make_logo():
+    buffer = io.BytesIO()
+    Image.new('RGBA', (400, 160), (214, 55, 64, 255)).save(buffer, 'PNG')
+    return buffer
+
+
+def new_deck(slides):
+    prs = Presentation()
+    prs.slide_width = Inches(13.33)
+    prs.slide_height = Inches(7.5)
+    for _ in range(slides):
+        prs.slides.add_slide(prs.slide_layouts[6])
+    return prs
+
+
+def shape_by_shape(prs, logo):
+    images = ImageRegistry(prs.part.package)
+    for index, slide in enumerate(prs.slides):
+        add_slide_header(slide, logo, *HEADER_ARGS, f"Slide {index}", DEFAULT_COLOR, DEFAULT_COLOR, images=images)
+        add_side_line(slide, DEFAULT_COLOR)
+
+
+def cloned(prs, logo):
+    images = ImageRegistry(prs.part.package)
+    fragment = None
+    for index, slide in enumerate(prs.slides):
+        if fragment is None:
+            fragment = capture_slide_header(slide, logo, *HEADER_ARGS, f"Slide {index}", DEFAULT_COLOR, DEFAULT_COLOR, images=images)
+        else:
+            fragment.clone_into(slide, title=header_title(f"Slide {index}"))
+
+
+def measure(add_headers, args, logo):
+    """Best time over --repeat fresh decks, and the last deck"""
+    best = float('inf')
+    for _ in range(args.repeat):
+        prs = new_deck(args.slides)
+        start = time.perf_counter()
+        add_headers(prs, logo)
+        best = min(best, time.perf_counter() - start)
+    return best, prs
+
+
+def slide_xml(prs):
+    return [etree.tostring(slide._element) for slide in prs.slides]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slides", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--no-logo", action="store_true")
+    args = parser.parse_args()
+
+    logo = None if args.no_logo else make_logo()
+    old_seconds, old_deck = measure(shape_by_shape, args, logo)
+    new_seconds, new_deck = measure(cloned, args, logo)
+
+    print(f"{'mode':<18}{'total':>10}{'per slide':>12}")
+    for name, seconds in (("shape by shape", old_seconds), ("cloned fragment", new_seconds)):
+        print(f"{name:<18}{seconds * 1000:>8.2f}ms{seconds * 1000 / args.slides:>10.3f}ms")
+    print(f"speedup {old_seconds / new_seconds:.1f}x, identical slide XML: {slide_xml(old_deck) == slide_xml(new_deck)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark DataFrame vs streaming ingestion of combined_sources.
+
+Writes synthetic combined_sources workbooks of growing size and measures
+wall time and peak RSS growth for parse_excel_data + build_aggregates
+against stream_aggregates, checking both give the same aggregates. Each
+measurement runs in a fresh process so native (calamine) allocations and
+earlier runs do not blur the peak.
+
+Usage (from backend/):
+    python benchmarks/bench_stream_ingest.py [--rows 10000 40000] [--chunk-rows 5000]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_data import synthesize_workbooks, write_workbooks
+from services.aggregations import AUTHOR_KEYS, CUBE_KEYS, build_aggregates
+from services.excel_parser import parse_excel_data
+from services.excel_stream import stream_aggregates
+
+
+def load_frames(path):
+    return build_aggregates({'combined_sources': parse_excel_data(path, 'combined_sources')})
+
+
+def memory_status(field):
+    """VmRSS / VmHWM of this process in bytes (Linux only)"""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) * 1024
+    raise RuntimeError(f"{field} not found in /proc/self/status")
+
+
+def run_measured(func, *args, **kwargs):
+    # ru_maxrss survives exec, so the child would start at the parent's peak;
+    # VmHWM belongs to this process image only
+    baseline = memory_status("VmRSS")
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    peak = memory_status("VmHWM") - baseline
+    return result, elapsed, peak
+
+
+def measure(func, *args, **kwargs):
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return executor.submit(run_measured, func, *args, **kwargs).result()
+
+
+def same_aggregates(left, right):
+    for key, keys in (('sentiment', CUBE_KEYS), ('authors', AUTHOR_KEYS), ('facebook_engagement', ['Company'])):
+        a = left[key].sort_values(keys, kind='stable').reset_index(drop=True)
+        b = right[key].sort_values(keys, kind='stable').reset_index(drop=True)
+        try:
+            pd.testing.assert_frame_equal(a, b, check_dtype=False)
+        except AssertionError:
+            return False
+    return left['sources'] == right['sources']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 40000], help="Mentions per sheet")
+    parser.add_argument("--chunk-rows", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{'rows/sheet':>10}{'xlsx MiB':>10}{'frames':>10}{'RSS MiB':>10}{'stream':>10}{'RSS MiB':>10}{'same':>6}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory(prefix="bench-stream-") as workdir:
+            workbooks = synthesize_workbooks(rows=rows)
+            path = write_workbooks({'combined_sources': workbooks['combined_sources']}, workdir)['combined_sources']
+            size = os.path.getsize(path)
+
+            frames, frames_time, frames_peak = measure(load_frames, path)
+            streamed, stream_time, stream_peak = measure(stream_aggregates, path, chunk_rows=args.chunk_rows)
+
+        print(
+            f"{rows:>10}{size / 2**20:>10.1f}{frames_time:>9.2f}s{frames_peak / 2**20:>10.1f}"
+            f"{stream_time:>9.2f}s{stream_peak / 2**20:>10.1f}{'yes' if same_aggregates(frames, streamed) else 'NO':>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
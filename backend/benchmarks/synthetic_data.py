@@ -0,0 +1,137 @@
+"""Synthetic report inputs for benchmarks.
+
+Generates the four uploaded workbooks (combined_sources, official_facebook,
+official_instagram, facebook_reachs) with the columns declared in
+services.sheet_schemas, at a configurable number of rows, companies and days,
+plus logo and post images.
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.sheet_schemas import apply_schema, get_sheet_schema
+
+MENTION_SHEETS = ['News', 'Facebook', 'Instagram', 'Twitter', 'Linkedin']
+
+# Rough share of positive, neutral, negative and unlabelled mentions in the sample exports
+SENTIMENT_CHOICES = [1, 0, -1, np.nan]
+SENTIMENT_WEIGHTS = [0.25, 0.52, 0.18, 0.05]
+
+
+def company_names(companies):
+    return [f"Bank {index + 1}" for index in range(companies)]
+
+
+def mention_sheet(rng, rows, companies, days, start_date):
+    names = company_names(companies)
+    # The reporting company gets the largest share of mentions
+    weights = np.linspace(2.0, 1.0, companies)
+    return pd.DataFrame({
+        'Day': pd.Timestamp(start_date) + pd.to_timedelta(rng.integers(0, days, size=rows), unit='D'),
+        'Company': rng.choice(names, size=rows, p=weights / weights.sum()),
+        'Sentiment': rng.choice(SENTIMENT_CHOICES, size=rows, p=SENTIMENT_WEIGHTS),
+    })
+
+
+def engagement_columns(rng, rows):
+    return {
+        'comment_count': rng.poisson(12, size=rows),
+        'like_count': rng.poisson(150, size=rows),
+        'share_count': rng.poisson(5, size=rows),
+        'view_count': rng.poisson(2500, size=rows),
+    }
+
+
+def synthesize_workbooks(rows=20000, companies=8, days=30, start_date='2025-04-01', seed=0):
+    """Return {role: {sheet_name: DataFrame}} shaped like the raw uploads.
+
+    rows is the number of mentions per combined_sources sheet; the official
+    page exports get a tenth of that as posts.
+    """
+    rng = np.random.default_rng(seed)
+    names = company_names(companies)
+    posts = max(rows // 10, 1)
+
+    combined = {}
+    for sheet in MENTION_SHEETS:
+        df = mention_sheet(rng, rows, companies, days, start_date)
+        if sheet == 'News':
+            df['Author'] = rng.choice([f"Outlet {index + 1}" for index in range(40)], size=rows)
+        if sheet == 'Facebook':
+            df = df.assign(**engagement_columns(rng, rows))
+        combined[sheet] = df
+
+    return {
+        'combined_sources': combined,
+        'official_facebook': {
+            'Sheet1': pd.DataFrame({'author_name': rng.choice(names, size=posts), **engagement_columns(rng, posts)}),
+        },
+        'official_instagram': {
+            'Instagram Posts': pd.DataFrame({
+                'Company': rng.choice(names, size=posts),
+                'Likes': rng.poisson(300, size=posts),
+                'Comments': rng.poisson(20, size=posts),
+            }),
+        },
+        'facebook_reachs': {
+            'Sheet1': pd.DataFrame(engagement_columns(rng, posts)),
+        },
+    }
+
+
+def typed_frames(workbooks):
+    """Apply the declared sheet schemas, as parse_excel_data would"""
+    return {
+        role: {
+            sheet_name: apply_schema(df, role, sheet_name, get_sheet_schema(role, sheet_name))
+            for sheet_name, df in sheets.items()
+        }
+        for role, sheets in workbooks.items()
+    }
+
+
+def write_workbooks(workbooks, directory):
+    """Write each role to <directory>/<role>.xlsx and return {role: path}"""
+    paths = {}
+    for role, sheets in workbooks.items():
+        path = os.path.join(directory, f"{role}.xlsx")
+        with pd.ExcelWriter(path, engine='openpyxl') as writer:
+            for sheet_name, df in sheets.items():
+                df.to_excel(writer, sheet_name=sheet_name, index=False)
+        paths[role] = path
+    return paths
+
+
+def write_image(path, size, seed):
+    """Noisy RGB image, so it compresses like a photo rather than a flat logo"""
+    rng = np.random.default_rng(seed)
+    width, height = size
+    pixels = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+    Image.fromarray(pixels).save(path)
+    return path
+
+
+def synthesize_images(directory, posts=4, competitor_logos=3, logo_size=(400, 400), post_size=(1080, 1350)):
+    """Write logo and post images and return the create_ppt image arguments"""
+    def logo(name, seed):
+        return write_image(os.path.join(directory, f"{name}.png"), logo_size, seed)
+
+    def post(name, seed):
+        return {
+            'image_path': write_image(os.path.join(directory, f"{name}.jpg"), post_size, seed),
+            'link': f"https://example.com/{name}",
+        }
+
+    return {
+        'company_logo_path': logo('company_logo', 1),
+        'mediaeye_logo_path': logo('mediaeye_logo', 2),
+        'neurotime_logo_path': logo('neurotime_logo', 3),
+        'competitor_logo_paths': [logo(f"competitor_logo_{index}", 10 + index) for index in range(competitor_logos)],
+        'positive_posts': [post(f"positive_post_{index}", 100 + index) for index in range(posts)],
+        'negative_posts': [post(f"negative_post_{index}", 200 + index) for index in range(posts)],
+    }
@@ -0,0 +1,260 @@
+"""Command line report generation.
+
+Usage (from backend/):
+    python cli.py run JOBS [--workers 4] [--output-dir decks] [--report timings.json]
+    python cli.py batch --input uploads/combined_sources.xlsx --input uploads/official_facebook.xlsx ...
+        --start-date 2025-04-01 --end-date 2025-04-30 --companies companies.json
+        --mediaeye-logo mediaeye.png --neurotime-logo neurotime.png [--competitor-logo logo.png ...]
+        [--no-competitors] [--use-mention-store] [--output-dir decks] [--zip decks.zip] [--workers 4]
+
+run takes a manifest (a JSON list of jobs, or {"defaults": {...}, "jobs": [...]})
+or a directory whose subdirectories each hold a job.json. A job is:
+    {"name": "abb-april", "inputs": ["combined_sources.xlsx", ...],
+     "start_date": "2025-04-01", "end_date": "2025-04-30", "company_name": "ABB Bank",
+     "company_logo": "abb.png", "mediaeye_logo": "...", "neurotime_logo": "...",
+     "competitor_logos": [...], "has_competitors": true,
+     "template_color": "#D63740", "title_color": "#D63740", "graph_color": "#D63740",
+     "positive_links": [...], "negative_links": [...],
+     "positive_posts": [{"image": "p1.jpg", "link": "https://..."}], "negative_posts": [...],
+     "output": "abb-april.pptx"}
+Paths are relative to the manifest or job.json. A job directory without
+"inputs" uses every data file in it.
+
+companies.json is a list of {"company_name", "company_logo", "template_color",
+"title_color", "graph_color"}; company_logo is a path relative to the file.
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from config import REPORT_MAX_WORKERS, REPORT_POOL_START_METHOD
+from services.input_formats import INPUT_EXTENSIONS, input_name
+from services.report_jobs import BATCH_COMPANY_OPTIONS, batch_deck_name, build_batch_deck, load_report_data, prepare_batch, render_report, report_date_range
+
+logger = logging.getLogger("cli")
+
+
+def read_inputs(paths):
+    """{input name: bytes} for data files given on the command line"""
+    inputs = {}
+    for path in paths:
+        with open(path, "rb") as f:
+            inputs[input_name(os.path.basename(path))] = f.read()
+    return inputs
+
+
+def load_companies(path):
+    """companies.json entries as (create_ppt options, logo path or None)"""
+    with open(path) as f:
+        entries = json.load(f)
+    base_dir = os.path.dirname(os.path.abspath(path))
+    companies = []
+    for index, entry in enumerate(entries):
+        if not entry.get("company_name"):
+            raise ValueError(f"{path}: entry {index} needs a company_name")
+        logo = entry.get("company_logo")
+        companies.append((
+            {key: entry[key] for key in BATCH_COMPANY_OPTIONS if key in entry},
+            os.path.join(base_dir, logo) if logo else None,
+        ))
+    return companies
+
+
+# Job file name inside each subdirectory of a jobs directory
+JOB_FILE = "job.json"
+
+# Job keys passed to create_ppt unchanged
+JOB_OPTIONS = ["start_date", "end_date", "company_name", "has_competitors", "template_color", "title_color", "graph_color", "positive_links", "negative_links"]
+
+
+def load_jobs(path):
+    """Resolve a manifest file or jobs directory into a list of job dicts with absolute paths"""
+    if os.path.isdir(path):
+        jobs = []
+        for entry in sorted(os.scandir(path), key=lambda entry: entry.name):
+            job_file = os.path.join(entry.path, JOB_FILE)
+            if entry.is_dir() and os.path.isfile(job_file):
+                with open(job_file) as f:
+                    jobs.append(_resolve_job({"name": entry.name, **json.load(f)}, entry.path))
+        return jobs
+
+    with open(path) as f:
+        manifest = json.load(f)
+    if isinstance(manifest, list):
+        manifest = {"jobs": manifest}
+    base_dir = os.path.dirname(os.path.abspath(path))
+    defaults = manifest.get("defaults", {})
+    return [
+        _resolve_job({"name": f"job-{index + 1}", **defaults, **job}, base_dir)
+        for index, job in enumerate(manifest["jobs"])
+    ]
+
+
+def _resolve_job(job, base_dir):
+    def resolve(relative):
+        return os.path.join(base_dir, relative) if relative else None
+
+    inputs = job.get("inputs")
+    if inputs is None:
+        # A job directory holds its own data files
+        inputs = sorted(
+            entry.name for entry in os.scandir(base_dir)
+            if entry.is_file() and any(entry.name.lower().endswith(extension) for extension in INPUT_EXTENSIONS)
+        )
+    return {
+        **job,
+        "inputs": [resolve(name) for name in inputs],
+        "company_logo": resolve(job.get("company_logo")),
+        "mediaeye_logo": resolve(job.get("mediaeye_logo")),
+        "neurotime_logo": resolve(job.get("neurotime_logo")),
+        "competitor_logos": [resolve(logo) for logo in job.get("competitor_logos", [])],
+        "positive_posts": [{"image": resolve(post["image"]), "link": post.get("link", "")} for post in job.get("positive_posts", [])],
+        "negative_posts": [{"image": resolve(post["image"]), "link": post.get("link", "")} for post in job.get("negative_posts", [])],
+        "output": resolve(job["output"]) if job.get("output") else None,
+    }
+
+
+def run_job(job, output_path):
+    """Build one job's deck; runs in a worker process. Returns its timings in seconds"""
+    start = time.perf_counter()
+    report_options = {
+        **{key: job[key] for key in JOB_OPTIONS if key in job},
+        "company_logo_path": job["company_logo"],
+        "mediaeye_logo_path": job["mediaeye_logo"],
+        "neurotime_logo_path": job["neurotime_logo"],
+        "competitor_logo_paths": job["competitor_logos"],
+        "positive_posts": [{"image_path": post["image"], "link": post["link"]} for post in job["positive_posts"]],
+        "negative_posts": [{"image_path": post["image"], "link": post["link"]} for post in job["negative_posts"]],
+        "output_path": output_path,
+    }
+    data_frames, aggregates = load_report_data(read_inputs(job["inputs"]), report_date_range(report_options))
+    parsed = time.perf_counter()
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    render_report(data_frames, aggregates, report_options)
+    end = time.perf_counter()
+    return {"parse_seconds": parsed - start, "build_seconds": end - parsed, "total_seconds": end - start}
+
+
+def run_jobs(args):
+    """Build every job of a manifest or jobs directory on a process pool"""
+    jobs = load_jobs(args.jobs)
+    if not jobs:
+        logger.error(f"No jobs found in {args.jobs}")
+        return 1
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    used_names = set()
+    results = {}
+    start = time.perf_counter()
+    context = multiprocessing.get_context(REPORT_POOL_START_METHOD)
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=context) as executor:
+        futures = {}
+        for job in jobs:
+            output_path = job["output"] or os.path.join(args.output_dir, batch_deck_name(job["name"], used_names))
+            futures[job["name"]] = (output_path, executor.submit(run_job, job, output_path))
+
+        for name, (output_path, future) in futures.items():
+            try:
+                timings = future.result()
+                results[name] = {"status": "ok", "output": output_path, **timings}
+                logger.info(
+                    f"{name}: {timings['total_seconds']:.2f}s (parse {timings['parse_seconds']:.2f}s, "
+                    f"build {timings['build_seconds']:.2f}s) -> {output_path}"
+                )
+            except Exception as e:
+                results[name] = {"status": "failed", "error": str(e)}
+                logger.error(f"{name}: failed: {str(e)}")
+
+    failed = [name for name, result in results.items() if result["status"] != "ok"]
+    logger.info(f"Built {len(jobs) - len(failed)} of {len(jobs)} decks in {time.perf_counter() - start:.2f}s")
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(results, f, indent=2)
+        logger.info(f"Wrote {args.report}")
+    return 1 if failed else 0
+
+
+def run_batch(args):
+    """Parse and aggregate once, then build one deck per company on a process pool"""
+    report_options = dict(
+        start_date=args.start_date,
+        end_date=args.end_date,
+        mediaeye_logo_path=args.mediaeye_logo,
+        neurotime_logo_path=args.neurotime_logo,
+        competitor_logo_paths=args.competitor_logo,
+        has_competitors=not args.no_competitors,
+    )
+    companies = load_companies(args.companies)
+    prepared = prepare_batch(read_inputs(args.input), report_date_range(report_options), from_store=args.use_mention_store)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    used_names = set()
+    context = multiprocessing.get_context(REPORT_POOL_START_METHOD)
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=context) as executor:
+        futures = {}
+        for options, logo_path in companies:
+            output_path = os.path.join(args.output_dir, batch_deck_name(options["company_name"], used_names))
+            futures[output_path] = executor.submit(
+                build_batch_deck, prepared,
+                {**report_options, **options, "company_logo_path": logo_path, "output_path": output_path},
+            )
+
+        failed = 0
+        for output_path, future in futures.items():
+            try:
+                future.result()
+                logger.info(f"Wrote {output_path}")
+            except Exception as e:
+                failed += 1
+                logger.error(f"Failed to build {output_path}: {str(e)}")
+
+    if args.zip:
+        with zipfile.ZipFile(args.zip, "w", compression=zipfile.ZIP_STORED) as zipf:
+            for output_path in futures:
+                if os.path.exists(output_path):
+                    zipf.write(output_path, os.path.basename(output_path))
+        logger.info(f"Wrote {args.zip}")
+
+    logger.info(f"Built {len(futures) - failed} of {len(futures)} decks")
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Build every report job of a manifest or jobs directory")
+    run.add_argument("jobs", help="Manifest JSON file, or a directory of job subdirectories with job.json")
+    run.add_argument("--output-dir", default="decks", help="Where decks of jobs without an output go")
+    run.add_argument("--report", help="Write per-job status and timings to this JSON file")
+    run.add_argument("--workers", type=int, default=REPORT_MAX_WORKERS)
+    run.set_defaults(handler=run_jobs)
+
+    batch = commands.add_parser("batch", help="Build the same report for several companies from one dataset")
+    batch.add_argument("--input", action="append", required=True, help="Data file (xlsx, csv, parquet, arrow); repeat per file")
+    batch.add_argument("--start-date", required=True)
+    batch.add_argument("--end-date", required=True)
+    batch.add_argument("--companies", required=True, help="JSON list of per-company settings")
+    batch.add_argument("--mediaeye-logo", required=True)
+    batch.add_argument("--neurotime-logo", required=True)
+    batch.add_argument("--competitor-logo", action="append", default=[])
+    batch.add_argument("--no-competitors", action="store_true")
+    batch.add_argument("--use-mention-store", action="store_true", help="Read combined_sources from the mention store")
+    batch.add_argument("--output-dir", default="decks")
+    batch.add_argument("--zip", help="Also pack the decks into this zip file")
+    batch.add_argument("--workers", type=int, default=REPORT_MAX_WORKERS)
+    batch.set_defaults(handler=run_batch)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
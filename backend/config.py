@@ -0,0 +1,66 @@
+"""Runtime settings for the report backend, overridable through environment variables"""
+import os
+
+# Root for per-request workspaces (uploaded images and the generated deck)
+UPLOADS_DIR = os.getenv("UPLOADS_DIR", "uploads")
+# "memory" keeps uploads and the generated deck in memory end to end,
+# "disk" stages them in a per-request workspace under UPLOADS_DIR
+REPORT_IO_MODE = os.getenv("REPORT_IO_MODE", "memory")
+
+# Parsed workbook cache (services/parse_cache.py)
+PARSE_CACHE_ENABLED = os.getenv("PARSE_CACHE_ENABLED", "1") == "1"
+PARSE_CACHE_DIR = os.getenv("PARSE_CACHE_DIR", "cache/parsed")
+PARSE_CACHE_MAX_BYTES = int(os.getenv("PARSE_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# "frames" loads combined_sources into DataFrames; "stream" reads it row by row
+# into the slide count tables (services/excel_stream.py) with bounded memory
+INGEST_MODE = os.getenv("INGEST_MODE", "frames")
+# Rows converted and counted at a time in stream mode
+STREAM_CHUNK_ROWS = int(os.getenv("STREAM_CHUNK_ROWS", "5000"))
+
+# Report worker pool (services/report_pool.py)
+REPORT_MAX_WORKERS = int(os.getenv("REPORT_MAX_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Jobs allowed to wait for a free worker before new requests are rejected with 503;
+# each parse and deck of a request counts as one job
+REPORT_QUEUE_DEPTH = int(os.getenv("REPORT_QUEUE_DEPTH", "8"))
+# Seconds a report request may take from admission until its deck is built
+REPORT_JOB_TIMEOUT = float(os.getenv("REPORT_JOB_TIMEOUT", "300"))
+# Worker start method; "spawn" avoids forking the running event loop and its threads
+REPORT_POOL_START_METHOD = os.getenv("REPORT_POOL_START_METHOD", "spawn")
+
+# Asynchronous report jobs (services/job_store.py)
+JOBS_DIR = os.getenv("JOBS_DIR", "jobs")
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", os.path.join(JOBS_DIR, "jobs.sqlite3"))
+# Finished jobs and their decks are deleted after this many seconds
+JOB_RETENTION_SECONDS = int(os.getenv("JOB_RETENTION_SECONDS", str(24 * 60 * 60)))
+
+# Local mention store for incremental ingestion (services/mention_store.py)
+MENTION_STORE_PATH = os.getenv("MENTION_STORE_PATH", os.path.join("store", "mentions.sqlite3"))
+
+# Content-addressed logo library (services/asset_store.py)
+ASSETS_DIR = os.getenv("ASSETS_DIR", "assets")
+
+# Image stage of create_ppt (services/image_optimizer.py): images are downsampled
+# to their size on the slide at this DPI and re-encoded before embedding
+IMAGE_OPTIMIZE = os.getenv("IMAGE_OPTIMIZE", "1") == "1"
+IMAGE_EMBED_DPI = int(os.getenv("IMAGE_EMBED_DPI", "200"))
+IMAGE_JPEG_QUALITY = int(os.getenv("IMAGE_JPEG_QUALITY", "85"))
+IMAGE_OPTIMIZE_WORKERS = int(os.getenv("IMAGE_OPTIMIZE_WORKERS", "4"))
+# Optimized images are kept on disk by content hash, display size and DPI
+IMAGE_CACHE_ENABLED = os.getenv("IMAGE_CACHE_ENABLED", "1") == "1"
+IMAGE_CACHE_DIR = os.getenv("IMAGE_CACHE_DIR", "cache/images")
+IMAGE_CACHE_MAX_BYTES = int(os.getenv("IMAGE_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Workbook embedded behind every chart for PowerPoint's Edit Data
+# (services/chart_workbooks.py): "full" writes python-pptx's XlsxWriter workbook,
+# "minimal" a hand-written single-sheet one, "shared" one full workbook per
+# distinct chart data, "deferred" full workbooks built while the deck is saved
+CHART_WORKBOOK_MODE = os.getenv("CHART_WORKBOOK_MODE", "full")
+
+# Styled chart templates kept per report worker (services/chart_factory.py);
+# one per preset, style options and data shape, least recently used dropped first
+CHART_TEMPLATE_CACHE_SIZE = int(os.getenv("CHART_TEMPLATE_CACHE_SIZE", "64"))
+
+# create_ppt's save (services/pptx_stream.py): "1" empties image and workbook
+# parts as they are written, lowering peak memory for photo-heavy decks
+PPTX_RELEASE_PARTS = os.getenv("PPTX_RELEASE_PARTS", "0") == "1"
@@ -1,21 +1,41 @@
 from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Request, BackgroundTasks
-from fastapi.responses import FileResponse
-from services.excel_parser import parse_excel_data
-from services.ppt_generator import create_ppt
+from fastapi.responses import FileResponse, Response
+from services import job_store
+from services.asset_store import AssetError, asset_embed_path, delete_asset, get_asset, list_assets, save_asset
+from services.mention_store import ingest_upload
+from services.input_formats import InputFormatError, upload_input_name
+from services.report_jobs import BATCH_COMPANY_OPTIONS, batch_deck_name, build_batch_deck, build_report, build_report_job, parse_workbooks, prepare_batch, report_date_range
+from services.report_pool import ReportPoolSaturated, ReportRequest, ReportTimeout, ensure_report_capacity, run_in_report_pool, shutdown_executor
+from services.sheet_schemas import SchemaError
+from config import REPORT_IO_MODE, REPORT_MAX_WORKERS, UPLOADS_DIR
+import io
 import os
 from fastapi.middleware.cors import CORSMiddleware
 import traceback
 import logging
 import json
 import shutil
+import tempfile
+import zipfile
 import asyncio
-from typing import List
+from contextlib import asynccontextmanager
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+# Running asynchronous report jobs
+job_tasks = set()
+# Workspace removals waiting for report pool jobs that are still running
+cleanup_tasks = set()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    job_store.fail_interrupted_jobs()
+    yield
+    shutdown_executor()
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -25,28 +45,185 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+PPTX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+# Per-company status file added to /generate-batch/ zips
+BATCH_MANIFEST_NAME = "manifest.json"
+
 # Create uploads directory if it doesn't exist
-os.makedirs("uploads", exist_ok=True)
+os.makedirs(UPLOADS_DIR, exist_ok=True)
+
+def create_workspace():
+    """Create a private scratch directory for one request's inputs and output"""
+    workspace = tempfile.mkdtemp(prefix="report-", dir=UPLOADS_DIR)
+    logger.debug(f"Created workspace: {workspace}")
+    return workspace
+
+def cleanup_workspace(workspace: str):
+    """Background task to remove a request's scratch directory"""
+    if workspace is None:
+        return
+    try:
+        shutil.rmtree(workspace)
+        logger.debug(f"Cleaned up workspace: {workspace}")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Could not delete workspace {workspace}: {str(e)}")
+
+def cleanup_when_finished(workspace: str, *report_requests):
+    """Remove a request's scratch directory once none of its report pool jobs is still running.
+
+    A job the request gave up on (e.g. after a timeout) may still be reading
+    its inputs from the workspace or writing the deck into it.
+    """
+    if workspace is None:
+        return
+
+    async def cleanup():
+        for report_request in report_requests:
+            await report_request.finished()
+        cleanup_workspace(workspace)
+
+    task = asyncio.create_task(cleanup())
+    cleanup_tasks.add(task)
+    task.add_done_callback(cleanup_tasks.discard)
+
+async def stage_upload(upload: UploadFile, workspace: str, name: str):
+    """Return an uploaded file as an in-memory buffer, or its path once saved to the workspace"""
+    content = await upload.read()
+    if workspace is None:
+        return io.BytesIO(content)
+    path = os.path.join(workspace, name)
+    with open(path, "wb") as buffer:
+        buffer.write(content)
+    return path
 
-def cleanup_files(file_paths: List[str]):
-    """Background task to clean up temporary files"""
-    for file_path in file_paths:
+async def stage_logo(upload: UploadFile, asset_id: str, workspace: str, name: str):
+    """Stage an uploaded logo, or return the embed path of a stored asset; None if neither is given"""
+    if asset_id:
         try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                logger.debug(f"Cleaned up temporary file: {file_path}")
-        except Exception as e:
-            logger.warning(f"Could not delete temporary file {file_path}: {str(e)}")
+            return asset_embed_path(asset_id)
+        except KeyError:
+            raise HTTPException(status_code=404, detail=f"Unknown asset: {asset_id}")
+    if upload:
+        return await stage_upload(upload, workspace, name)
+    return None
+
+def form_logo_assets(company_logo_asset, mediaeye_logo_asset, neurotime_logo_asset, competitor_logo_assets):
+    """logo_assets for collect_report_inputs from the *_asset form fields"""
+    return {
+        "company_logo": company_logo_asset,
+        "mediaeye_logo": mediaeye_logo_asset,
+        "neurotime_logo": neurotime_logo_asset,
+        "competitor_logos": json.loads(competitor_logo_assets) if competitor_logo_assets else [],
+    }
+
+async def collect_report_inputs(
+    request: Request,
+    workspace: str,
+    excel_files: list[UploadFile],
+    company_logo: UploadFile,
+    mediaeye_logo: UploadFile,
+    neurotime_logo: UploadFile,
+    competitor_logos: list[UploadFile],
+    positive_links: str,
+    negative_links: str,
+    logo_assets: dict = None,
+    required_logos=("company_logo", "mediaeye_logo", "neurotime_logo"),
+    **options
+):
+    """Read a report form into (excel_inputs, report_options) for build_report.
+
+    logo_assets maps "company_logo", "mediaeye_logo", "neurotime_logo" to
+    stored asset ids used instead of an upload, and "competitor_logos" to a
+    list of asset ids added after the uploaded competitor logos.
+    """
+    logo_assets = logo_assets or {}
+    # Parse links
+    positive_links_list = json.loads(positive_links) if positive_links else []
+    negative_links_list = json.loads(negative_links) if negative_links else []
+
+    # Read data files (Excel, CSV, Parquet or Arrow); they are parsed in the report worker.
+    # A role can be split over several files named "<role>.<sheet>.<ext>".
+    excel_inputs = {}
+    for file in excel_files:
+        try:
+            name = upload_input_name(file.filename)
+        except InputFormatError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        excel_inputs[name] = await file.read()
+
+    # Stage logos in memory or in this request's workspace, or point at stored assets
+    logo_paths = {}
+    for field, upload in (("company_logo", company_logo), ("mediaeye_logo", mediaeye_logo), ("neurotime_logo", neurotime_logo)):
+        logo_paths[field] = await stage_logo(upload, logo_assets.get(field), workspace, f"{field}.png")
+        if logo_paths[field] is None and field in required_logos:
+            raise HTTPException(status_code=422, detail=f"{field} or {field}_asset is required")
+    company_logo_path = logo_paths["company_logo"]
+    mediaeye_logo_path = logo_paths["mediaeye_logo"]
+    neurotime_logo_path = logo_paths["neurotime_logo"]
+
+    # Save competitor logos
+    competitor_logo_paths = []
+    if competitor_logos:
+        for i, logo in enumerate(competitor_logos):
+            competitor_logo_paths.append(await stage_upload(logo, workspace, f"competitor_logo_{i}.png"))
+    for asset_id in logo_assets.get("competitor_logos", []):
+        competitor_logo_paths.append(await stage_logo(None, asset_id, workspace, None))
+
+    # Process post images
+    positive_posts = []
+    negative_posts = []
+    
+    # Get all form fields
+    form_data = await request.form()
+    
+    # Process positive posts
+    index = 0
+    while f"positive_post_image_{index}" in form_data:
+        image = form_data[f"positive_post_image_{index}"]
+        link = form_data[f"positive_post_link_{index}"]
+        if image:
+            file_path = await stage_upload(image, workspace, f"positive_post_{index}.jpg")
+            positive_posts.append({"image_path": file_path, "link": link})
+        index += 1
+
+    # Process negative posts
+    index = 0
+    while f"negative_post_image_{index}" in form_data:
+        image = form_data[f"negative_post_image_{index}"]
+        link = form_data[f"negative_post_link_{index}"]
+        if image:
+            file_path = await stage_upload(image, workspace, f"negative_post_{index}.jpg")
+            negative_posts.append({"image_path": file_path, "link": link})
+        index += 1
+
+    report_options = dict(
+        company_logo_path=company_logo_path,
+        mediaeye_logo_path=mediaeye_logo_path,
+        neurotime_logo_path=neurotime_logo_path,
+        competitor_logo_paths=competitor_logo_paths,
+        positive_links=positive_links_list,
+        negative_links=negative_links_list,
+        positive_posts=positive_posts,
+        negative_posts=negative_posts,
+        **options
+    )
+    return excel_inputs, report_options
 
 @app.post("/generate-ppt/")
 async def generate_ppt(
     background_tasks: BackgroundTasks,
     request: Request,
     excel_files: list[UploadFile] = File(...),
-    company_logo: UploadFile = File(...),
-    mediaeye_logo: UploadFile = File(...),
-    neurotime_logo: UploadFile = File(...),
+    company_logo: UploadFile = File(None),
+    mediaeye_logo: UploadFile = File(None),
+    neurotime_logo: UploadFile = File(None),
     competitor_logos: list[UploadFile] = File(None),
+    company_logo_asset: str = Form(None),
+    mediaeye_logo_asset: str = Form(None),
+    neurotime_logo_asset: str = Form(None),
+    competitor_logo_assets: str = Form(None),
     positive_links: str = Form(None),
     negative_links: str = Form(None),
     start_date: str = Form(...),
@@ -55,144 +232,388 @@ async def generate_ppt(
     has_competitors: bool = Form(True),
     template_color: str = Form(...),
     title_color: str = Form(...),
-    graph_color: str = Form(... )
+    graph_color: str = Form(... ),
+    use_mention_store: bool = Form(False)
 ):
-    temp_files = []  # Keep track of all temporary files
+    workspace = create_workspace() if REPORT_IO_MODE == "disk" else None
+    report_request = ReportRequest()
     try:
-        # Parse links
-        positive_links_list = json.loads(positive_links) if positive_links else []
-        negative_links_list = json.loads(negative_links) if negative_links else []
-
-        # Process Excel files
-        data_frames = {}
-        for file in excel_files:
-            file_path = f"uploads/{file.filename}"
-            temp_files.append(file_path)  # Add to tracking list
-            
-            # Save file
-            with open(file_path, "wb") as buffer:
-                content = await file.read()
-                buffer.write(content)
-            
-            # Parse Excel data
-            data_frames[file.filename.split('.')[0]] = parse_excel_data(file_path)
-
-        # Process logos
-        company_logo_path = "uploads/company_logo.png"
-        mediaeye_logo_path = "uploads/mediaeye_logo.png"
-        neurotime_logo_path = "uploads/neurotime_logo.png"
-        competitor_logo_paths = []
-
-        # Save company logo
-        with open(company_logo_path, "wb") as buffer:
-            content = await company_logo.read()
-            buffer.write(content)
-        temp_files.append(company_logo_path)
-
-        # Save MediaEye logo
-        with open(mediaeye_logo_path, "wb") as buffer:
-            content = await mediaeye_logo.read()
-            buffer.write(content)
-        temp_files.append(mediaeye_logo_path)
-
-        # Save NeuroTime logo
-        with open(neurotime_logo_path, "wb") as buffer:
-            content = await neurotime_logo.read()
-            buffer.write(content)
-        temp_files.append(neurotime_logo_path)
-
-        # Save competitor logos
-        if competitor_logos:
-            for i, logo in enumerate(competitor_logos):
-                logo_path = f"uploads/competitor_logo_{i}.png"
-                with open(logo_path, "wb") as buffer:
-                    content = await logo.read()
-                    buffer.write(content)
-                competitor_logo_paths.append(logo_path)
-                temp_files.append(logo_path)
-
-        # Process post images
-        positive_posts = []
-        negative_posts = []
-        
-        # Get all form fields
-        form_data = await request.form()
-        
-        # Process positive posts
-        index = 0
-        while f"positive_post_image_{index}" in form_data:
-            image = form_data[f"positive_post_image_{index}"]
-            link = form_data[f"positive_post_link_{index}"]
-            if image:
-                file_path = f"uploads/positive_post_{index}.jpg"
-                temp_files.append(file_path)  # Add to tracking list
-                with open(file_path, "wb") as buffer:
-                    content = await image.read()
-                    buffer.write(content)
-                positive_posts.append({"image_path": file_path, "link": link})
-            index += 1
-
-        # Process negative posts
-        index = 0
-        while f"negative_post_image_{index}" in form_data:
-            image = form_data[f"negative_post_image_{index}"]
-            link = form_data[f"negative_post_link_{index}"]
-            if image:
-                file_path = f"uploads/negative_post_{index}.jpg"
-                temp_files.append(file_path)  # Add to tracking list
-                with open(file_path, "wb") as buffer:
-                    content = await image.read()
-                    buffer.write(content)
-                negative_posts.append({"image_path": file_path, "link": link})
-            index += 1
-
-        # Generate PowerPoint
-        output_path = "uploads/report.pptx"
-        temp_files.append(output_path)  # Add to tracking list
-        
-        create_ppt(
-            data_frames=data_frames,
-            output_path=output_path,
+        excel_inputs, report_options = await collect_report_inputs(
+            request, workspace, excel_files, company_logo, mediaeye_logo, neurotime_logo,
+            competitor_logos, positive_links, negative_links,
+            logo_assets=form_logo_assets(company_logo_asset, mediaeye_logo_asset, neurotime_logo_asset, competitor_logo_assets),
             start_date=start_date,
             end_date=end_date,
             company_name=company_name,
-            company_logo_path=company_logo_path,
-            mediaeye_logo_path=mediaeye_logo_path,
-            neurotime_logo_path=neurotime_logo_path,
-            competitor_logo_paths=competitor_logo_paths,
-            positive_links=positive_links_list,
-            negative_links=negative_links_list,
-            positive_posts=positive_posts,
-            negative_posts=negative_posts,
             has_competitors=has_competitors,
             template_color=template_color,
             title_color=title_color,
             graph_color=graph_color
         )
 
-        # Create a copy of the output file for response
-        response_path = "uploads/response_report.pptx"
-        shutil.copy2(output_path, response_path)
-        temp_files.append(response_path)  # Add to tracking list
+        # Generate PowerPoint
+        # None builds the deck into an in-memory buffer
+        report_options["output_path"] = os.path.join(workspace, "report.pptx") if workspace else None
+
+        # Parse the workbooks side by side, then build the deck, all under one request deadline
+        async with report_request:
+            parsed_workbooks = await parse_workbooks(report_request, excel_inputs, report_date_range(report_options))
+            result = await report_request.run(
+                build_report, report_options, parsed_workbooks=parsed_workbooks, from_store=use_mention_store
+            )
+
+        if workspace is None:
+            # Send the deck bytes straight from memory
+            return Response(
+                content=result,
+                media_type=PPTX_MEDIA_TYPE,
+                headers={"Content-Disposition": 'attachment; filename="report.pptx"'}
+            )
 
         # Schedule cleanup for after response is sent
-        background_tasks.add_task(cleanup_files, temp_files)
+        background_tasks.add_task(cleanup_workspace, workspace)
 
         # Return the response file
         return FileResponse(
-            response_path,
-            media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation",
+            result,
+            media_type=PPTX_MEDIA_TYPE,
             filename="report.pptx",
             background=background_tasks
         )
 
+    except HTTPException:
+        cleanup_when_finished(workspace, report_request)
+        raise
+    except ReportPoolSaturated as e:
+        cleanup_when_finished(workspace, report_request)
+        logger.warning(str(e))
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+    except ReportTimeout as e:
+        cleanup_when_finished(workspace, report_request)
+        logger.error(str(e))
+        raise HTTPException(status_code=504, detail=str(e))
+    except SchemaError as e:
+        # Uploaded file does not match its declared sheet schema
+        cleanup_when_finished(workspace, report_request)
+        logger.error(f"Invalid input file: {str(e)}")
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         # Clean up files in case of error
-        cleanup_files(temp_files)
+        cleanup_when_finished(workspace, report_request)
         logger.error(f"Error generating PowerPoint: {str(e)}")
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=str(e))
 
+def parse_batch_companies(companies: str):
+    """Validate the /generate-batch/ companies field into (create_ppt option dicts, logo asset ids)"""
+    try:
+        entries = json.loads(companies)
+    except ValueError:
+        raise HTTPException(status_code=422, detail="companies must be a JSON list")
+    if not isinstance(entries, list) or not entries:
+        raise HTTPException(status_code=422, detail="companies must be a non-empty JSON list")
+    options = []
+    logo_assets = []
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict) or not entry.get("company_name"):
+            raise HTTPException(status_code=422, detail=f"companies[{index}] needs a company_name")
+        logo_asset = entry.get("company_logo_asset")
+        if logo_asset is not None and not isinstance(logo_asset, str):
+            raise HTTPException(status_code=422, detail=f"companies[{index}].company_logo_asset must be an asset id")
+        options.append({key: entry[key] for key in BATCH_COMPANY_OPTIONS if key in entry})
+        logo_assets.append(logo_asset)
+    return options, logo_assets
+
+@app.post("/generate-batch/")
+async def generate_batch(
+    request: Request,
+    excel_files: list[UploadFile] = File(...),
+    mediaeye_logo: UploadFile = File(None),
+    neurotime_logo: UploadFile = File(None),
+    competitor_logos: list[UploadFile] = File(None),
+    mediaeye_logo_asset: str = Form(None),
+    neurotime_logo_asset: str = Form(None),
+    competitor_logo_assets: str = Form(None),
+    positive_links: str = Form(None),
+    negative_links: str = Form(None),
+    start_date: str = Form(...),
+    end_date: str = Form(...),
+    companies: str = Form(...),
+    has_competitors: bool = Form(True),
+    use_mention_store: bool = Form(False)
+):
+    """Build the same report for several companies from one upload, returned as a zip.
+
+    companies is a JSON list of {"company_name", "template_color",
+    "title_color", "graph_color", "company_logo_asset"}; company i's logo is
+    the company_logo_<i> file or its stored asset. The inputs are parsed and aggregated once, then the decks are built
+    in parallel on the report pool. A company whose deck fails is left out of
+    the zip; its manifest.json gives each company's deck or error, and the
+    X-Batch-Failed header counts the failures. The request only fails when
+    every deck does.
+    """
+    company_options, company_assets = parse_batch_companies(companies)
+    workspace = create_workspace() if REPORT_IO_MODE == "disk" else None
+    # The batch's parse and prepare, then one request per deck
+    report_requests = [ReportRequest()]
+    try:
+        excel_inputs, report_options = await collect_report_inputs(
+            request, workspace, excel_files, None, mediaeye_logo, neurotime_logo,
+            competitor_logos, positive_links, negative_links,
+            logo_assets=form_logo_assets(None, mediaeye_logo_asset, neurotime_logo_asset, competitor_logo_assets),
+            required_logos=("mediaeye_logo", "neurotime_logo"),
+            start_date=start_date,
+            end_date=end_date,
+            has_competitors=has_competitors
+        )
+        form_data = await request.form()
+        date_range = report_date_range(report_options)
+        async with report_requests[0] as report_request:
+            parsed_workbooks = await parse_workbooks(report_request, excel_inputs, date_range)
+            prepared = await report_request.run(
+                prepare_batch, date_range=date_range, parsed_workbooks=parsed_workbooks, from_store=use_mention_store
+            )
+
+        # At most one deck per worker at a time, so a batch cannot fill the queue by itself
+        slots = asyncio.Semaphore(REPORT_MAX_WORKERS)
+
+        async def build_deck(index, options):
+            logo_path = await stage_logo(
+                form_data.get(f"company_logo_{index}"), company_assets[index], workspace, f"company_logo_{index}.png"
+            )
+            async with slots:
+                deck_request = ReportRequest()
+                report_requests.append(deck_request)
+                async with deck_request:
+                    return await deck_request.run(
+                        build_batch_deck, prepared,
+                        {**report_options, **options, "company_logo_path": logo_path, "output_path": None}
+                    )
+
+        # One company's failure must not discard the decks of the others
+        decks = await asyncio.gather(
+            *(build_deck(index, options) for index, options in enumerate(company_options)),
+            return_exceptions=True
+        )
+        failures = [deck for deck in decks if isinstance(deck, BaseException)]
+        if len(failures) == len(decks):
+            raise failures[0]
+
+        # Decks are already deflated, so the archive only stores them
+        archive = io.BytesIO()
+        used_names = set()
+        manifest = []
+        with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_STORED) as zipf:
+            for options, deck in zip(company_options, decks):
+                if isinstance(deck, BaseException):
+                    error = deck.detail if isinstance(deck, HTTPException) else str(deck)
+                    logger.error(f"Batch deck for {options['company_name']} failed: {error}")
+                    manifest.append({"company_name": options["company_name"], "status": "failed", "error": error})
+                    continue
+                deck_name = batch_deck_name(options["company_name"], used_names)
+                zipf.writestr(deck_name, deck)
+                manifest.append({"company_name": options["company_name"], "status": "ok", "deck": deck_name})
+            zipf.writestr(BATCH_MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, indent=2))
+        cleanup_when_finished(workspace, *report_requests)
+        return Response(
+            content=archive.getvalue(),
+            media_type="application/zip",
+            headers={
+                "Content-Disposition": 'attachment; filename="reports.zip"',
+                "X-Batch-Failed": str(len(failures)),
+            }
+        )
+
+    except HTTPException:
+        cleanup_when_finished(workspace, *report_requests)
+        raise
+    except ReportPoolSaturated as e:
+        cleanup_when_finished(workspace, *report_requests)
+        logger.warning(str(e))
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+    except ReportTimeout as e:
+        cleanup_when_finished(workspace, *report_requests)
+        logger.error(str(e))
+        raise HTTPException(status_code=504, detail=str(e))
+    except SchemaError as e:
+        cleanup_when_finished(workspace, *report_requests)
+        logger.error(f"Invalid input file: {str(e)}")
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        cleanup_when_finished(workspace, *report_requests)
+        logger.error(f"Error generating report batch: {str(e)}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/ingest/")
+async def ingest_mentions(files: list[UploadFile] = File(...)):
+    """Append combined_sources mention rows to the local mention store.
+
+    Accepts the same formats and names as /generate-ppt/; mentions already
+    stored (same source, company and post id or link) are skipped. Reports
+    built with use_mention_store=true then read combined_sources from the store.
+    """
+    try:
+        summary = {}
+        for file in files:
+            name = upload_input_name(file.filename)
+            summary[name] = await run_in_report_pool(ingest_upload, await file.read(), name)
+        return {"ingested": summary}
+    except ReportPoolSaturated as e:
+        logger.warning(str(e))
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+    except ReportTimeout as e:
+        logger.error(str(e))
+        raise HTTPException(status_code=504, detail=str(e))
+    except SchemaError as e:
+        logger.error(f"Invalid input file: {str(e)}")
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error ingesting mentions: {str(e)}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail=str(e))
+
+# region Asynchronous report jobs
+# Submit returns a job id immediately; clients poll the status endpoint and
+# download the deck once the job is done.
+
+def job_response(job):
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "stage": job["stage"],
+        "stages_done": job["stages_done"],
+        "stages_total": job["stages_total"],
+        "error": job["error"],
+        "status_url": f"/jobs/{job['id']}",
+        "download_url": f"/jobs/{job['id']}/download" if job["status"] == job_store.DONE else None,
+    }
+
+async def run_report_job(job_id: str, excel_inputs: dict, report_options: dict, from_store: bool = False):
+    """Background task driving one job through the report pool"""
+    try:
+        async with ReportRequest() as report_request:
+            parsed_workbooks = await parse_workbooks(report_request, excel_inputs, report_date_range(report_options))
+            await report_request.run(
+                build_report_job, job_id, report_options, parsed_workbooks=parsed_workbooks, from_store=from_store
+            )
+    except Exception as e:
+        logger.error(f"Report job {job_id} failed: {str(e)}")
+        # Jobs that time out while queued never reach the worker
+        job = job_store.get_job(job_id)
+        if job is not None and job["status"] != job_store.FAILED:
+            job_store.mark_failed(job_id, str(e))
+
+@app.post("/jobs/", status_code=202)
+async def submit_report_job(
+    request: Request,
+    excel_files: list[UploadFile] = File(...),
+    company_logo: UploadFile = File(None),
+    mediaeye_logo: UploadFile = File(None),
+    neurotime_logo: UploadFile = File(None),
+    competitor_logos: list[UploadFile] = File(None),
+    company_logo_asset: str = Form(None),
+    mediaeye_logo_asset: str = Form(None),
+    neurotime_logo_asset: str = Form(None),
+    competitor_logo_assets: str = Form(None),
+    positive_links: str = Form(None),
+    negative_links: str = Form(None),
+    start_date: str = Form(...),
+    end_date: str = Form(...),
+    company_name: str = Form(...),
+    has_competitors: bool = Form(True),
+    template_color: str = Form(...),
+    title_color: str = Form(...),
+    graph_color: str = Form(... ),
+    use_mention_store: bool = Form(False)
+):
+    try:
+        ensure_report_capacity()
+    except ReportPoolSaturated as e:
+        logger.warning(str(e))
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+
+    # Job inputs stay in memory until a worker picks them up
+    excel_inputs, report_options = await collect_report_inputs(
+        request, None, excel_files, company_logo, mediaeye_logo, neurotime_logo,
+        competitor_logos, positive_links, negative_links,
+        logo_assets=form_logo_assets(company_logo_asset, mediaeye_logo_asset, neurotime_logo_asset, competitor_logo_assets),
+        start_date=start_date,
+        end_date=end_date,
+        company_name=company_name,
+        has_competitors=has_competitors,
+        template_color=template_color,
+        title_color=title_color,
+        graph_color=graph_color
+    )
+
+    job_store.purge_expired_jobs()
+    job_id = job_store.create_job()
+    task = asyncio.create_task(run_report_job(job_id, excel_inputs, report_options, use_mention_store))
+    # Keep a reference so the task is not garbage collected while it runs
+    job_tasks.add(task)
+    task.add_done_callback(job_tasks.discard)
+
+    return job_response(job_store.get_job(job_id))
+
+@app.get("/jobs/{job_id}")
+async def get_report_job(job_id: str):
+    job = job_store.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_response(job)
+
+@app.get("/jobs/{job_id}/download")
+async def download_report_job(job_id: str):
+    job = job_store.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] == job_store.FAILED:
+        raise HTTPException(status_code=409, detail=f"Job failed: {job['error']}")
+    if job["status"] != job_store.DONE:
+        raise HTTPException(status_code=409, detail=f"Job is still {job['status']}")
+    return FileResponse(job["output_path"], media_type=PPTX_MEDIA_TYPE, filename="report.pptx")
+
+# endregion
+
+# region Logo asset library
+# Logos are stored once, content addressed, and referenced by id from the
+# report forms (company_logo_asset, mediaeye_logo_asset, ...) instead of
+# being uploaded with every request.
+
+@app.post("/assets/", status_code=201)
+async def upload_asset(file: UploadFile = File(...)):
+    try:
+        return await run_in_report_pool(save_asset, await file.read(), file.filename)
+    except ReportPoolSaturated as e:
+        logger.warning(str(e))
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+    except ReportTimeout as e:
+        logger.error(str(e))
+        raise HTTPException(status_code=504, detail=str(e))
+    except AssetError as e:
+        logger.error(f"Invalid asset: {str(e)}")
+        raise HTTPException(status_code=422, detail=str(e))
+
+@app.get("/assets/")
+async def get_assets():
+    return {"assets": list_assets()}
+
+@app.get("/assets/{asset_id}")
+async def get_asset_metadata(asset_id: str):
+    asset = get_asset(asset_id)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    return asset
+
+@app.delete("/assets/{asset_id}", status_code=204)
+async def remove_asset(asset_id: str):
+    if not delete_asset(asset_id):
+        raise HTTPException(status_code=404, detail="Asset not found")
+    return Response(status_code=204)
+
+# endregion
+
 
 if __name__ == "__main__":
     import uvicorn
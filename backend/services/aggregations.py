@@ -0,0 +1,168 @@
+import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+# combined_sources sheets that carry per-mention sentiment
+SENTIMENT_SOURCES = ['News', 'Facebook', 'Instagram', 'Twitter', 'Linkedin']
+
+CUBE_KEYS = ['Source', 'Company', 'Day', 'Sentiment']
+AUTHOR_KEYS = ['Company', 'Author']
+ENGAGEMENT_SUMS = ['comment_count', 'like_count', 'share_count', 'view_count']
+
+
+def build_sentiment_cube(data_frames):
+    """Count mentions per (Source, Company, Day, Sentiment) in a single groupby.
+
+    Rows with a missing company, day or sentiment are kept under a NaN key so
+    row totals match the raw sheets; the slicing helpers drop them where the
+    slides did.
+    """
+    try:
+        logger.debug("Building sentiment cube")
+        sheets = data_frames.get('combined_sources', {})
+        frames = [
+            pd.DataFrame({
+                'Source': source,
+                'Company': sheets[source]['Company'].astype(object),
+                'Day': sheets[source]['Day'],
+                'Sentiment': sheets[source]['Sentiment'],
+            })
+            for source in SENTIMENT_SOURCES
+            if source in sheets
+        ]
+        if not frames:
+            return pd.DataFrame(columns=CUBE_KEYS + ['count'])
+
+        mentions = pd.concat(frames, ignore_index=True)
+        cube = mentions.groupby(CUBE_KEYS, dropna=False, sort=False).size().reset_index(name='count')
+        logger.debug(f"Sentiment cube has {len(cube)} cells for {len(mentions)} mentions")
+        return cube
+    except Exception as e:
+        logger.error(f"Error building sentiment cube: {str(e)}")
+        raise
+
+
+def build_author_counts(data_frames):
+    """Count News mentions per (Company, Author), keeping rows without a company"""
+    news = data_frames.get('combined_sources', {}).get('News')
+    if news is None:
+        return pd.DataFrame(columns=AUTHOR_KEYS + ['count'])
+    authors = pd.DataFrame({'Company': news['Company'].astype(object), 'Author': news['Author'].astype(object)})
+    return authors.groupby(AUTHOR_KEYS, dropna=False, sort=False).size().reset_index(name='count')
+
+
+def build_facebook_engagement(data_frames):
+    """Engagement sums and post counts per company for the combined Facebook sheet.
+
+    Like the sentiment cube, posts without a company are kept under a NaN key;
+    facebook_engagement() drops that row for the slide table.
+    """
+    facebook = data_frames.get('combined_sources', {}).get('Facebook')
+    if facebook is None:
+        return pd.DataFrame(columns=['Company'] + ENGAGEMENT_SUMS + ['post_count'])
+    facebook = facebook.assign(Company=facebook['Company'].astype(object))
+    grouped = facebook.groupby('Company', dropna=False, sort=False)
+    engagement = grouped[ENGAGEMENT_SUMS].sum().astype('int64')
+    engagement['post_count'] = grouped.size()
+    return engagement.reset_index()
+
+
+def build_aggregates(data_frames):
+    """Everything the slides need from combined_sources, as small count tables"""
+    sheets = data_frames.get('combined_sources', {})
+    return {
+        'sources': list(sheets),
+        # Rows dropped at ingestion for falling outside the report dates
+        'rows_skipped': {sheet: df.attrs.get('rows_skipped', 0) for sheet, df in sheets.items()},
+        'sentiment': build_sentiment_cube(data_frames),
+        'authors': build_author_counts(data_frames),
+        'facebook_engagement': build_facebook_engagement(data_frames),
+    }
+
+
+def combine_aggregates(parts):
+    """Combine aggregates built from disjoint sets of rows, with one concat and groupby per table"""
+    def add(key, keys):
+        # Skip empty placeholders so key columns keep their dtypes
+        frames = [part[key] for part in parts if len(part[key])]
+        if len(frames) < 2:
+            return frames[0] if frames else parts[0][key]
+        combined = pd.concat(frames, ignore_index=True)
+        return combined.groupby(keys, dropna=False, sort=False).sum().reset_index()
+
+    sources = []
+    rows_skipped = {}
+    for part in parts:
+        sources += [source for source in part['sources'] if source not in sources]
+        for sheet, count in part['rows_skipped'].items():
+            rows_skipped[sheet] = rows_skipped.get(sheet, 0) + count
+    return {
+        'sources': sources,
+        'rows_skipped': rows_skipped,
+        'sentiment': add('sentiment', CUBE_KEYS),
+        'authors': add('authors', AUTHOR_KEYS),
+        'facebook_engagement': add('facebook_engagement', ['Company']),
+    }
+
+
+def merge_aggregates(left, right):
+    """Combine aggregates built from two disjoint sets of rows"""
+    return combine_aggregates([left, right])
+
+
+def select_cells(cube, source, company=None):
+    """Cube cells for one source, optionally limited to one company"""
+    cells = cube[cube['Source'] == source]
+    if company is not None:
+        cells = cells[cells['Company'] == company]
+    return cells
+
+
+def mention_count(cube, source, company=None):
+    """Number of raw rows behind a slice, including rows without a sentiment"""
+    return int(select_cells(cube, source, company)['count'].sum())
+
+
+def sentiment_totals(cube, source, company=None):
+    """Series of counts indexed by sentiment, like Sentiment.value_counts()"""
+    cells = select_cells(cube, source, company).dropna(subset=['Sentiment'])
+    return cells.groupby('Sentiment')['count'].sum()
+
+
+def sentiment_by_day(cube, source, company=None):
+    """Day x sentiment counts, sorted by day"""
+    cells = select_cells(cube, source, company).dropna(subset=['Day', 'Sentiment'])
+    return cells.groupby(['Day', 'Sentiment'])['count'].sum().unstack(fill_value=0)
+
+
+def sentiment_by_date_label(cube, source, company=None, date_format='%Y-%m-%d'):
+    """Sentiment counts per formatted date string, for category axes that need text labels.
+
+    Only the News sheet was charted on a date axis; the other sheets keep
+    their ISO date text as categories.
+    """
+    by_day = sentiment_by_day(cube, source, company)
+    if by_day.empty:
+        return by_day
+    return by_day.groupby(by_day.index.strftime(date_format)).sum()
+
+
+def sentiment_by_company(cube, source):
+    """Company x sentiment counts for one source"""
+    cells = select_cells(cube, source).dropna(subset=['Company', 'Sentiment'])
+    return cells.groupby(['Company', 'Sentiment'])['count'].sum().unstack(fill_value=0)
+
+
+def author_counts(aggregates, company=None):
+    """News mentions per author, like groupby('Author').size()"""
+    authors = aggregates['authors']
+    if company is not None:
+        authors = authors[authors['Company'] == company]
+    return authors.dropna(subset=['Author']).groupby('Author')['count'].sum()
+
+
+def facebook_engagement(aggregates):
+    """Per-company Facebook engagement table, sorted by company, without posts that name no company"""
+    engagement = aggregates['facebook_engagement'].dropna(subset=['Company'])
+    return engagement.sort_values('Company', kind='stable').reset_index(drop=True)
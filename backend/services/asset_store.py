@@ -0,0 +1,186 @@
+import functools
+import hashlib
+import io
+import json
+import logging
+import os
+import tempfile
+import time
+
+from PIL import Image, UnidentifiedImageError
+
+from config import ASSETS_DIR
+
+logger = logging.getLogger(__name__)
+
+# Longest side of the embed version; logos never show larger than 4.5" on a slide
+MAX_EMBED_SIDE = 1024
+
+# PIL format -> (embed format, extension). Formats python-pptx cannot embed
+# (WebP, ...) and lossless ones are stored as PNG.
+EMBED_FORMATS = {
+    'JPEG': ('JPEG', 'jpg'),
+    'PNG': ('PNG', 'png'),
+}
+DEFAULT_EMBED_FORMAT = ('PNG', 'png')
+
+
+class AssetError(ValueError):
+    """Raised when an uploaded asset is not a usable image"""
+
+
+def asset_id_for(content):
+    """Content address of an asset: SHA-256 of its bytes"""
+    return hashlib.sha256(content).hexdigest()
+
+
+def _path(asset_id, suffix, assets_dir=ASSETS_DIR):
+    # Ids come from clients; anything but a hex digest is rejected before touching the disk
+    if len(asset_id) != 64 or any(char not in '0123456789abcdef' for char in asset_id):
+        raise KeyError(asset_id)
+    return os.path.join(assets_dir, f"{asset_id}{suffix}")
+
+
+def _write_atomic(path, payload):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    # Write to a temp file and rename so readers never see partial files
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _embed_version(image):
+    """(bytes, format, extension, size) of the slide-ready copy of an image"""
+    embed_format, extension = EMBED_FORMATS.get(image.format, DEFAULT_EMBED_FORMAT)
+    image.load()
+    if max(image.size) > MAX_EMBED_SIDE:
+        image = image.copy()
+        image.thumbnail((MAX_EMBED_SIDE, MAX_EMBED_SIDE), Image.LANCZOS)
+    if embed_format == 'JPEG':
+        image = image.convert('RGB')
+        options = {'quality': 90, 'optimize': True}
+    else:
+        if image.mode not in ('RGB', 'RGBA', 'L', 'LA', 'P'):
+            image = image.convert('RGBA')
+        options = {'optimize': True}
+    buffer = io.BytesIO()
+    image.save(buffer, embed_format, **options)
+    return buffer.getvalue(), embed_format, extension, image.size
+
+
+def save_asset(content, filename=None, assets_dir=ASSETS_DIR):
+    """Store an uploaded image and return its metadata; storing the same bytes again is a no-op"""
+    asset_id = asset_id_for(content)
+    existing = get_asset(asset_id, assets_dir)
+    if existing is not None:
+        logger.debug(f"Asset already stored: {asset_id[:12]}")
+        return existing
+
+    try:
+        with Image.open(io.BytesIO(content)) as image:
+            source_format, source_size = image.format, image.size
+            embed, embed_format, extension, embed_size = _embed_version(image)
+    except (UnidentifiedImageError, OSError) as e:
+        raise AssetError(f"{filename or 'asset'} is not a readable image: {str(e)}")
+
+    # Keep whichever is smaller when the original is already embeddable as is
+    if source_format == embed_format and embed_size == source_size and len(content) <= len(embed):
+        embed = content
+
+    metadata = {
+        'id': asset_id,
+        'filename': filename,
+        'format': source_format,
+        'width': source_size[0],
+        'height': source_size[1],
+        'bytes': len(content),
+        'embed': {
+            'format': embed_format,
+            'width': embed_size[0],
+            'height': embed_size[1],
+            'bytes': len(embed),
+            'file': f"{asset_id}.embed.{extension}",
+        },
+        'created_at': time.time(),
+    }
+    _write_atomic(_path(asset_id, '.orig', assets_dir), content)
+    _write_atomic(os.path.join(assets_dir, metadata['embed']['file']), embed)
+    # Metadata last: an asset exists once its sidecar does
+    _write_atomic(_path(asset_id, '.json', assets_dir), json.dumps(metadata).encode())
+    logger.debug(f"Stored asset {asset_id[:12]} ({source_format} {source_size[0]}x{source_size[1]}, embed {len(embed)} bytes)")
+    return metadata
+
+
+def get_asset(asset_id, assets_dir=ASSETS_DIR):
+    """Metadata of a stored asset, or None"""
+    try:
+        with open(_path(asset_id, '.json', assets_dir)) as f:
+            return json.load(f)
+    except (KeyError, FileNotFoundError):
+        return None
+
+
+def list_assets(assets_dir=ASSETS_DIR):
+    """Metadata of every stored asset, oldest first"""
+    if not os.path.isdir(assets_dir):
+        return []
+    assets = []
+    for entry in os.scandir(assets_dir):
+        if entry.name.endswith('.json'):
+            asset = get_asset(entry.name[:-len('.json')], assets_dir)
+            if asset is not None:
+                assets.append(asset)
+    return sorted(assets, key=lambda asset: asset['created_at'])
+
+
+def delete_asset(asset_id, assets_dir=ASSETS_DIR):
+    """Remove an asset and its derived files; returns False if it did not exist"""
+    metadata = get_asset(asset_id, assets_dir)
+    if metadata is None:
+        return False
+    # Sidecar first, so a half-deleted asset is simply absent
+    for path in (_path(asset_id, '.json', assets_dir), _path(asset_id, '.orig', assets_dir), os.path.join(assets_dir, metadata['embed']['file'])):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    logger.debug(f"Deleted asset {asset_id[:12]}")
+    return True
+
+
+def asset_embed_path(asset_id, assets_dir=ASSETS_DIR):
+    """Path of the slide-ready version of an asset, for create_ppt; KeyError if unknown"""
+    metadata = get_asset(asset_id, assets_dir)
+    if metadata is None:
+        raise KeyError(asset_id)
+    return os.path.join(assets_dir, metadata['embed']['file'])
+
+
+@functools.lru_cache(maxsize=256)
+def cached_image_size(path):
+    """(width, height) of an asset embed from its metadata, or None for other files.
+
+    Embeds are content addressed and never change, so sizes are cached for the
+    life of the process.
+    """
+    name = os.path.basename(path)
+    if '.embed.' not in name:
+        return None
+    metadata = get_asset(name.split('.', 1)[0], os.path.dirname(path))
+    if metadata is None:
+        return None
+    return metadata['embed']['width'], metadata['embed']['height']
+
+
+def is_asset_embed(image):
+    """Whether an image argument is the embed version of a stored asset, already sized for slides"""
+    return isinstance(image, (str, os.PathLike)) and cached_image_size(os.fspath(image)) is not None
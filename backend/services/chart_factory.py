@@ -0,0 +1,104 @@
+import logging
+from collections import OrderedDict
+
+from lxml import etree
+from pptx.chart.xmlwriter import SeriesXmlRewriterFactory
+from pptx.opc.constants import CONTENT_TYPE as CT
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.packuri import PackURI
+from pptx.oxml.ns import qn
+from pptx.parts.chart import ChartPart
+
+from config import CHART_TEMPLATE_CACHE_SIZE
+from services.pptx_compat import require_pptx_internals
+
+logger = logging.getLogger(__name__)
+
+# Relies on python-pptx internals; fails on import if they moved
+require_pptx_internals()
+
+
+class ChartFactory:
+    """Charts built from named presets whose styled XML is made once per process.
+
+    presets maps a preset name to (chart type, style function). The first
+    chart of a preset, style and data shape is built and styled with the
+    python-pptx API as a template; every chart after that parses the
+    template and only replaces its series and category data. Presets in
+    point_styled style individual data points, so their templates are also
+    kept per category count. At most max_templates templates are cached,
+    least recently used first out.
+    """
+
+    def __init__(self, presets, point_styled=(), max_templates=CHART_TEMPLATE_CACHE_SIZE):
+        self._presets = presets
+        self._point_styled = set(point_styled)
+        self._max_templates = max_templates
+        # (preset, style, data shape) -> styled c:chartSpace XML without its workbook link
+        self._templates = OrderedDict()
+
+    @staticmethod
+    def _data_shape(chart_data):
+        # What chart_data.xml_bytes() writes besides the series data itself
+        categories = chart_data.categories
+        are_dates = categories.are_dates if len(categories) else False
+        return len(chart_data), categories.depth, are_dates, chart_data.number_format
+
+    def _key(self, preset, chart_data, style):
+        shape = self._data_shape(chart_data)
+        if preset in self._point_styled:
+            # One c:dPt per point: a template only fits charts with as many categories
+            shape += (len(chart_data.categories),)
+        return preset, tuple(sorted(style.items())), shape
+
+    def template(self, preset, chart_data, **style):
+        """Styled chart XML of a preset for chart_data's shape, built on first use"""
+        key = self._key(preset, chart_data, style)
+        blob = self._templates.get(key)
+        if blob is not None:
+            self._templates.move_to_end(key)
+            return blob
+
+        chart_type, apply_style = self._presets[preset]
+        # A detached part: styling never touches the package or the workbook
+        part = ChartPart.load(PackURI(ChartPart.partname_template % 1), CT.DML_CHART, None, chart_data.xml_bytes(chart_type))
+        apply_style(part.chart, **style)
+        chart_space = part._element
+        external_data = chart_space.find(qn('c:externalData'))
+        if external_data is not None:
+            chart_space.remove(external_data)
+        blob = etree.tostring(chart_space)
+        self._templates[key] = blob
+        if len(self._templates) > self._max_templates:
+            self._templates.popitem(last=False)
+        logger.debug(f"Built chart template '{preset}' ({len(self._templates)} cached)")
+        return blob
+
+    def add_chart(self, shapes, preset, x, y, cx, cy, chart_data, workbooks=None, **style):
+        """Add a preset chart to a slide's shapes, like shapes.add_chart plus the preset's styling.
+
+        workbooks is the build's ChartWorkbooks; without one the chart gets
+        python-pptx's full workbook.
+        """
+        try:
+            blob = self.template(preset, chart_data, **style)
+            package = shapes.part.package
+            chart_part = ChartPart.load(package.next_partname(ChartPart.partname_template), CT.DML_CHART, package, blob)
+            # What chart.replace_data() does: rewrite c:tx/c:cat/c:val of every series, then embed the workbook
+            chart = chart_part.chart
+            SeriesXmlRewriterFactory(chart.chart_type, chart_data).replace_series_data(chart_part._element)
+            if workbooks is None:
+                chart_part.chart_workbook.update_from_xlsx_blob(chart_data.xlsx_blob)
+            else:
+                workbooks.embed(chart_part, chart_data)
+            rId = shapes.part.relate_to(chart_part, RT.CHART)
+            graphic_frame = shapes._add_chart_graphicFrame(rId, x, y, cx, cy)
+            shapes._recalculate_extents()
+            return shapes._shape_factory(graphic_frame).chart
+        except Exception as e:
+            logger.error(f"Error adding '{preset}' chart: {str(e)}")
+            raise
+
+    def clear(self):
+        """Drop every cached template"""
+        self._templates.clear()
@@ -0,0 +1,249 @@
+import datetime
+import io
+import logging
+import math
+import time
+import zipfile
+from xml.sax.saxutils import escape
+
+from pptx.chart.data import CategoryChartData
+from pptx.chart.xlsx import CategoryWorkbookWriter
+from pptx.opc.packuri import PackURI
+from pptx.parts.embeddedpackage import EmbeddedXlsxPart
+
+from config import CHART_WORKBOOK_MODE
+
+logger = logging.getLogger(__name__)
+
+CHART_WORKBOOK_MODES = ('full', 'minimal', 'shared', 'deferred')
+
+_MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+_CONTENT_TYPES_XML = (
+    _XML_DECLARATION
+    + '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+_PACKAGE_RELS_XML = (
+    _XML_DECLARATION
+    + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    f'<Relationship Id="rId1" Type="{_REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_WORKBOOK_XML = (
+    _XML_DECLARATION
+    + f'<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}">'
+    '<sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets></workbook>'
+)
+_WORKBOOK_RELS_XML = (
+    _XML_DECLARATION
+    + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    f'<Relationship Id="rId1" Type="{_REL_NS}/worksheet" Target="worksheets/sheet1.xml"/>'
+    f'<Relationship Id="rId2" Type="{_REL_NS}/styles" Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+# Excel's day zero for serial dates (1900 date system, past the 1900 leap-year bug)
+_EXCEL_EPOCH = datetime.datetime(1899, 12, 30)
+# First id Excel leaves free for custom number formats
+_FIRST_CUSTOM_NUMBER_FORMAT = 164
+
+
+def _styles_xml(number_formats):
+    # Style 0 is the default; style n + 1 applies number_formats[n]
+    custom = [(_FIRST_CUSTOM_NUMBER_FORMAT + index, code) for index, code in enumerate(number_formats)]
+    num_fmts = ''.join(f'<numFmt numFmtId="{num_fmt_id}" formatCode="{escape(code, {chr(34): "&quot;"})}"/>' for num_fmt_id, code in custom)
+    xfs = ''.join(f'<xf numFmtId="{num_fmt_id}" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>' for num_fmt_id, _ in custom)
+    return (
+        _XML_DECLARATION
+        + f'<styleSheet xmlns="{_MAIN_NS}">'
+        + (f'<numFmts count="{len(custom)}">{num_fmts}</numFmts>' if custom else '')
+        + '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        f'<cellXfs count="{len(custom) + 1}"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>{xfs}</cellXfs>'
+        '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+        '</styleSheet>'
+    )
+
+
+def _cell_xml(ref, value, style):
+    # Same cell types XlsxWriter's worksheet.write() picks; blanks are left out
+    style_attr = f' s="{style}"' if style else ''
+    if value is None:
+        return ''
+    if isinstance(value, str):
+        if not value:
+            return ''
+        return f'<c r="{ref}" t="inlineStr"{style_attr}><is><t xml:space="preserve">{escape(value)}</t></is></c>'
+    if isinstance(value, bool):
+        return f'<c r="{ref}" t="b"{style_attr}><v>{int(value)}</v></c>'
+    if isinstance(value, datetime.datetime):
+        serial = (value.replace(tzinfo=None) - _EXCEL_EPOCH).total_seconds() / 86400
+        return f'<c r="{ref}"{style_attr}><v>{serial!r}</v></c>'
+    if isinstance(value, datetime.date):
+        return f'<c r="{ref}"{style_attr}><v>{(value - _EXCEL_EPOCH.date()).days}</v></c>'
+    number = float(value)
+    if math.isnan(number) or math.isinf(number):
+        return ''
+    text = str(int(number)) if number.is_integer() and abs(number) < 2 ** 53 else repr(number)
+    return f'<c r="{ref}"{style_attr}><v>{text}</v></c>'
+
+
+def minimal_xlsx_blob(chart_data):
+    """Single-sheet workbook holding chart_data in python-pptx's category layout.
+
+    Cells sit where the chart's Sheet1!$A$2:... references point, as in the
+    workbook python-pptx writes with XlsxWriter, so PowerPoint's Edit Data
+    works the same; the package just carries no theme, document properties
+    or shared-string table. Non-category chart data gets the full workbook.
+    """
+    if not isinstance(chart_data, CategoryChartData):
+        return chart_data.xlsx_blob
+
+    categories = chart_data.categories
+    depth = categories.depth
+    number_formats = []
+    styles = {}
+
+    def style_of(number_format):
+        if number_format == 'General':
+            return 0
+        if number_format not in styles:
+            number_formats.append(number_format)
+            styles[number_format] = len(number_formats)
+        return styles[number_format]
+
+    column = CategoryWorkbookWriter._column_reference
+    rows = {0: []}
+    category_style = style_of(categories.number_format)
+    for level_index, level in enumerate(categories.levels):
+        letter = column(depth - level_index)
+        for offset, label in level:
+            rows.setdefault(offset + 1, []).append((depth - level_index, _cell_xml(f"{letter}{offset + 2}", label, category_style)))
+    for index, series in enumerate(chart_data):
+        series_column = depth + index + 1
+        letter = column(series_column)
+        rows[0].append((series_column, _cell_xml(f"{letter}1", series.name, 0)))
+        value_style = style_of(series.number_format)
+        for offset, value in enumerate(series.values):
+            rows.setdefault(offset + 1, []).append((series_column, _cell_xml(f"{letter}{offset + 2}", value, value_style)))
+
+    sheet_rows = []
+    for row in sorted(rows):
+        cells = ''.join(xml for _, xml in sorted(rows[row], key=lambda cell: cell[0]))
+        if cells:
+            sheet_rows.append(f'<row r="{row + 1}">{cells}</row>')
+    # Category columns as wide as python-pptx makes them, enough for a date
+    cols = f'<cols><col min="1" max="{depth}" width="10" customWidth="1"/></cols>' if depth else ''
+    sheet = f'{_XML_DECLARATION}<worksheet xmlns="{_MAIN_NS}">{cols}<sheetData>{"".join(sheet_rows)}</sheetData></worksheet>'
+
+    buffer = io.BytesIO()
+    # Stored, not deflated: the deck's own zip compresses the workbook better as plain XML
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_STORED) as xlsx:
+        xlsx.writestr('[Content_Types].xml', _CONTENT_TYPES_XML)
+        xlsx.writestr('_rels/.rels', _PACKAGE_RELS_XML)
+        xlsx.writestr('xl/workbook.xml', _WORKBOOK_XML)
+        xlsx.writestr('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS_XML)
+        xlsx.writestr('xl/styles.xml', _styles_xml(number_formats))
+        xlsx.writestr('xl/worksheets/sheet1.xml', sheet)
+    return buffer.getvalue()
+
+
+class DeferredXlsxPart(EmbeddedXlsxPart):
+    """Embedded chart workbook written from its chart data only when the package is saved"""
+
+    def __init__(self, partname, package, chart_data):
+        super().__init__(partname, self.content_type, package, None)
+        self._chart_data = chart_data
+
+    @property
+    def blob(self):
+        if self._blob is None:
+            self._blob = self._chart_data.xlsx_blob
+            self._chart_data = None
+        return self._blob
+
+    @blob.setter
+    def blob(self, blob):
+        self._blob = blob
+        self._chart_data = None
+
+
+def _data_key(chart_data):
+    # Everything the workbook of a category chart is written from
+    categories = chart_data.categories
+    return (
+        type(chart_data).__name__,
+        categories.number_format,
+        tuple(tuple(level) for level in categories.levels),
+        tuple((series.name, series.number_format, tuple(series.values)) for series in chart_data),
+    )
+
+
+class ChartWorkbooks:
+    """Embedded chart workbooks of one create_ppt build, written per mode.
+
+    full: python-pptx's XlsxWriter workbook for every chart, as add_chart does.
+    minimal: the hand-written minimal_xlsx_blob workbook for every chart.
+    shared: charts with the same data share one full workbook part.
+    deferred: full workbooks, built as each part is written to the deck.
+    Every mode keeps the chart's Edit Data link to its own data.
+    """
+
+    def __init__(self, package, mode=CHART_WORKBOOK_MODE):
+        if mode not in CHART_WORKBOOK_MODES:
+            raise ValueError(f"Unknown chart workbook mode '{mode}', expected one of {', '.join(CHART_WORKBOOK_MODES)}")
+        self._package = package
+        self.mode = mode
+        # data key -> EmbeddedXlsxPart, for shared mode
+        self._shared = {}
+        # Partnames taken when the first workbook was added, and the next index to try
+        self._taken = None
+        self._next_index = 1
+        self.charts = 0
+        self.workbooks = 0
+        # Time spent in embed(); deferred workbooks are written while saving instead
+        self.seconds = 0.0
+
+    def _partname(self):
+        """The partname package.next_partname would give, without walking the package per workbook.
+
+        Every chart workbook of the build is added here, so the package is
+        only scanned for taken partnames once.
+        """
+        if self._taken is None:
+            self._taken = {part.partname for part in self._package.iter_parts()}
+        while True:
+            partname = PackURI(EmbeddedXlsxPart.partname_template % self._next_index)
+            self._next_index += 1
+            if partname not in self._taken:
+                return partname
+
+    def embed(self, chart_part, chart_data):
+        """Link chart_part to a workbook holding chart_data"""
+        start = time.perf_counter()
+        workbook = chart_part.chart_workbook
+        self.charts += 1
+        key = _data_key(chart_data) if self.mode == 'shared' and isinstance(chart_data, CategoryChartData) else None
+        xlsx_part = self._shared.get(key) if key is not None else None
+        if xlsx_part is None:
+            if self.mode == 'deferred':
+                xlsx_part = DeferredXlsxPart(self._partname(), self._package, chart_data)
+            else:
+                blob = minimal_xlsx_blob(chart_data) if self.mode == 'minimal' else chart_data.xlsx_blob
+                xlsx_part = EmbeddedXlsxPart(self._partname(), EmbeddedXlsxPart.content_type, self._package, blob)
+            if key is not None:
+                self._shared[key] = xlsx_part
+            self.workbooks += 1
+        # Relates the part and points c:externalData at it, as update_from_xlsx_blob does
+        workbook.xlsx_part = xlsx_part
+        self.seconds += time.perf_counter() - start
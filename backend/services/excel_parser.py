@@ -1,20 +1,60 @@
 import pandas as pd
+import importlib.util
 import logging
+import os
+from services.sheet_schemas import select_sheets, usecols_for, apply_schema, filter_date_range, with_key_columns
 
 logger = logging.getLogger(__name__)
 
-def parse_excel_data(path):
+# Engines in order of preference; calamine (Rust) parses xlsx several times
+# faster than openpyxl and is used whenever python-calamine is installed.
+PREFERRED_EXCEL_ENGINES = [
+    ('calamine', 'python_calamine'),
+    ('openpyxl', 'openpyxl'),
+]
+
+_excel_engine = None
+
+def get_excel_engine():
+    """Return the fastest installed pandas Excel engine (resolved once)"""
+    global _excel_engine
+    if _excel_engine is None:
+        for engine, module_name in PREFERRED_EXCEL_ENGINES:
+            if importlib.util.find_spec(module_name) is not None:
+                _excel_engine = engine
+                break
+        logger.debug(f"Using Excel engine: {_excel_engine}")
+    return _excel_engine
+
+def parse_excel_data(path, role=None, date_range=None, with_keys=False):
+    """Read the sheets of an uploaded workbook into DataFrames.
+
+    role names the input file ("combined_sources", "official_facebook", ...)
+    and defaults to the file name without extension. Sheets with a declared
+    schema are column-projected and typed; see services.sheet_schemas.
+    With a (start, end) date_range, dated rows outside it are dropped before
+    anything else sees them; the count is kept in df.attrs['rows_skipped'].
+    with_keys also loads the post id and link columns used by the mention store.
+    """
     try:
-        logger.debug(f"Reading Excel file: {path}")
-        # Read all sheets from the Excel file
-        excel_file = pd.ExcelFile(path)
+        if role is None:
+            role = os.path.basename(path).split('.')[0]
+        logger.debug(f"Reading Excel file: {path} ({role})")
+        # Open the workbook once and read every sheet from the same handle
         data = {}
-        
-        for sheet_name in excel_file.sheet_names:
-            logger.debug(f"Reading sheet: {sheet_name}")
-            df = pd.read_excel(path, sheet_name=sheet_name)
-            data[sheet_name] = df
-            logger.debug(f"Successfully read sheet: {sheet_name}")
+        with pd.ExcelFile(path, engine=get_excel_engine()) as excel_file:
+            sheets = select_sheets(role, excel_file.sheet_names)
+            for sheet_name, schema in sheets.items():
+                logger.debug(f"Reading sheet: {sheet_name}")
+                if with_keys:
+                    schema = with_key_columns(schema)
+                df = excel_file.parse(sheet_name, usecols=usecols_for(schema))
+                df, skipped = filter_date_range(apply_schema(df, role, sheet_name, schema), schema, date_range)
+                if skipped:
+                    logger.info(f"{role}.{sheet_name}: skipped {skipped} rows outside the report dates")
+                df.attrs['rows_skipped'] = skipped
+                data[sheet_name] = df
+                logger.debug(f"Successfully read sheet: {sheet_name}")
         
         return data
     except Exception as e:
@@ -54,7 +94,7 @@ def get_company_sentiment_counts(df):
     try:
         logger.debug("Getting company sentiment counts")
         # Get sentiment counts by company
-        company_sentiments = df.groupby('Company')['Sentiment'].value_counts().unstack(fill_value=0)
+        company_sentiments = df.groupby('Company', observed=True)['Sentiment'].value_counts().unstack(fill_value=0)
         logger.debug("Successfully got company sentiment counts")
         return company_sentiments
     except Exception as e:
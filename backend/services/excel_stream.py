@@ -0,0 +1,92 @@
+import itertools
+import logging
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from config import STREAM_CHUNK_ROWS
+from services.aggregations import build_aggregates, combine_aggregates
+from services.sheet_schemas import apply_schema, filter_date_range, select_sheets
+
+logger = logging.getLogger(__name__)
+
+STREAMED_ROLE = 'combined_sources'
+
+# Chunk counts are combined in one groupby every this many chunks, which
+# bounds memory without regrouping the whole running total per chunk
+COMBINE_EVERY_CHUNKS = 32
+
+
+def _iter_sheet_chunks(worksheet, role, sheet_name, schema, chunk_rows):
+    """Yield typed DataFrames of at most chunk_rows rows from a read-only worksheet"""
+    rows = worksheet.iter_rows(values_only=True)
+    header = next(rows, ())
+    # First occurrence of each declared column, as pandas' usecols would pick
+    positions = {}
+    for index, name in enumerate(header):
+        if name in schema['columns'] and name not in positions:
+            positions[name] = index
+
+    def project(row):
+        return [row[index] if index < len(row) else None for index in positions.values()]
+
+    def iter_records():
+        # As in read_excel: blank rows between mentions are kept as empty
+        # rows, trailing blank rows are dropped
+        blank = 0
+        for row in rows:
+            if all(value is None for value in row):
+                blank += 1
+                continue
+            for _ in range(blank):
+                yield [None] * len(positions)
+            blank = 0
+            yield project(row)
+
+    records = iter_records()
+    first = True
+    while True:
+        chunk = list(itertools.islice(records, chunk_rows))
+        if not chunk and not first:
+            return
+        first = False
+        # apply_schema also runs on an empty first chunk, so missing columns fail loudly
+        df = pd.DataFrame(chunk, columns=list(positions), dtype=object)
+        yield apply_schema(df, role, sheet_name, schema)
+        if len(chunk) < chunk_rows:
+            return
+
+
+def stream_aggregates(source, role=STREAMED_ROLE, chunk_rows=STREAM_CHUNK_ROWS, date_range=None):
+    """Count a combined_sources workbook into slide aggregates without loading it.
+
+    Rows are read through openpyxl's read-only cursor and counted chunk by
+    chunk, so memory depends on chunk_rows and the number of distinct
+    (company, day, author) keys rather than on the row count. The result is
+    the same as build_aggregates() over parse_excel_data(). Rows outside
+    date_range are dropped per chunk, before they reach the counters.
+    """
+    try:
+        logger.debug(f"Streaming workbook into aggregates: {role}")
+        workbook = load_workbook(source, read_only=True, data_only=True)
+        try:
+            parts = [build_aggregates({})]
+            for sheet_name, schema in select_sheets(role, workbook.sheetnames).items():
+                rows = skipped = 0
+                for chunk in _iter_sheet_chunks(workbook[sheet_name], role, sheet_name, schema, chunk_rows):
+                    rows += len(chunk)
+                    chunk, chunk_skipped = filter_date_range(chunk, schema, date_range)
+                    skipped += chunk_skipped
+                    chunk.attrs['rows_skipped'] = chunk_skipped
+                    parts.append(build_aggregates({role: {sheet_name: chunk}}))
+                    if len(parts) > COMBINE_EVERY_CHUNKS:
+                        parts = [combine_aggregates(parts)]
+                if skipped:
+                    logger.info(f"{role}.{sheet_name}: skipped {skipped} rows outside the report dates")
+                logger.debug(f"Streamed {rows} rows from sheet: {sheet_name}")
+        finally:
+            workbook.close()
+        return combine_aggregates(parts)
+    except Exception as e:
+        logger.error(f"Error streaming workbook {role}: {str(e)}")
+        raise
@@ -0,0 +1,232 @@
+import hashlib
+import io
+import logging
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import PIL
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+try:
+    from PIL import ImageCms
+    SRGB_PROFILE = ImageCms.createProfile('sRGB')
+except ImportError:
+    # Pillow built without LittleCMS
+    ImageCms = None
+
+from config import IMAGE_CACHE_DIR, IMAGE_CACHE_ENABLED, IMAGE_CACHE_MAX_BYTES, IMAGE_EMBED_DPI, IMAGE_JPEG_QUALITY, IMAGE_OPTIMIZE_WORKERS
+from services.parse_cache import evict
+
+logger = logging.getLogger(__name__)
+
+# Formats python-pptx embeds as they are; anything else (WebP, ...) is always re-encoded
+EMBEDDABLE_FORMATS = {'PNG', 'JPEG', 'GIF', 'BMP', 'TIFF'}
+
+EXIF_ORIENTATION = 0x0112
+# EXIF orientations that turn the image by 90 degrees, swapping width and height
+TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+
+CACHE_SUFFIX = ".img"
+
+# Modes whose pixels are RGB, so their ICC profile still applies after converting to RGB(A)
+RGB_MODES = {'RGB', 'RGBA', 'RGBX', 'RGBa', 'P', 'PA'}
+
+# Images with at most this many colors (logos, flat graphics) stay lossless PNG
+PALETTE_MAX_COLORS = 256
+
+
+def read_image_bytes(image):
+    """Bytes of an image argument (file path or file-like object)"""
+    if isinstance(image, (str, os.PathLike)):
+        with open(image, 'rb') as f:
+            return f.read()
+    if hasattr(image, 'getvalue'):
+        return image.getvalue()
+    image.seek(0)
+    return image.read()
+
+
+def _image_key(image, display_size):
+    # Paths compare by value; buffers by identity
+    return (image if isinstance(image, (str, os.PathLike)) else id(image), display_size)
+
+
+def target_size(size, display_size, dpi=IMAGE_EMBED_DPI):
+    """Pixel size that fills a (width, height) display box in inches at dpi.
+
+    Either side of the box may be None to leave it unbounded. Images are
+    only ever scaled down.
+    """
+    width, height = size
+    box_width, box_height = display_size
+    inches_per_pixel = min(
+        box_width / width if box_width else float('inf'),
+        box_height / height if box_height else float('inf'),
+    )
+    scale = min(inches_per_pixel * dpi, 1.0)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def _has_alpha(image):
+    return image.mode in ('RGBA', 'LA', 'PA') or (image.mode == 'P' and 'transparency' in image.info)
+
+
+def _convert(image, mode):
+    """(image converted to RGB or RGBA, ICC profile to embed with it).
+
+    The source profile is only kept when the pixels were RGB already. CMYK
+    and greyscale images are converted to sRGB through their profile when
+    LittleCMS can read it, and are saved untagged (sRGB) either way.
+    """
+    icc_profile = image.info.get('icc_profile')
+    if not icc_profile or image.mode in RGB_MODES:
+        return image.convert(mode), icc_profile
+    if ImageCms is not None and image.mode in ('CMYK', 'L'):
+        try:
+            source_profile = ImageCms.ImageCmsProfile(io.BytesIO(icc_profile))
+            return ImageCms.profileToProfile(image, source_profile, SRGB_PROFILE, outputMode='RGB').convert(mode), None
+        except (ImageCms.PyCMSError, OSError) as e:
+            logger.debug(f"Dropping unusable {image.mode} ICC profile: {str(e)}")
+    return image.convert(mode), None
+
+
+def _encode(image, dpi=IMAGE_EMBED_DPI):
+    """Re-encode without metadata: PNG for transparent or flat images, JPEG for photos"""
+    buffer = io.BytesIO()
+    if _has_alpha(image):
+        rgba, icc_profile = _convert(image, 'RGBA')
+        rgba.save(buffer, 'PNG', optimize=True, dpi=(dpi, dpi), icc_profile=icc_profile)
+        return buffer.getvalue()
+
+    rgb, icc_profile = _convert(image, 'RGB')
+    colors = rgb.getcolors(PALETTE_MAX_COLORS)
+    if colors is not None:
+        # Flat graphics compress far better as an exact palette than as JPEG
+        rgb.quantize(len(colors)).save(buffer, 'PNG', optimize=True, dpi=(dpi, dpi), icc_profile=icc_profile)
+    else:
+        rgb.save(buffer, 'JPEG', quality=IMAGE_JPEG_QUALITY, optimize=True, progressive=True, dpi=(dpi, dpi), icc_profile=icc_profile)
+    return buffer.getvalue()
+
+
+def _cache_path(content, display_size, dpi, cache_dir):
+    # An empty entry means the original is embedded as it is
+    digest = hashlib.sha256(content).hexdigest()
+    box = 'x'.join('any' if side is None else f"{side:g}" for side in display_size)
+    return os.path.join(cache_dir, f"{digest}-{box}-{dpi}-q{IMAGE_JPEG_QUALITY}-pil{PIL.__version__}{CACHE_SUFFIX}")
+
+
+def _read_cached(path):
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    try:
+        # Mark as recently used for LRU eviction
+        os.utime(path)
+    except OSError:
+        pass
+    return data
+
+
+def _write_cached(path, data, cache_dir):
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a temp file and rename so concurrent builds never read partial entries
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        evict(cache_dir, IMAGE_CACHE_MAX_BYTES, CACHE_SUFFIX)
+    except OSError as e:
+        logger.warning(f"Could not write optimized image cache entry {path}: {str(e)}")
+
+
+def _optimize(content, display_size, dpi):
+    """Optimized bytes of an image, or None to embed the original"""
+    try:
+        with Image.open(io.BytesIO(content)) as img:
+            source_format = img.format
+            orientation = img.getexif().get(EXIF_ORIENTATION, 1)
+            rotated = orientation != 1
+            transposed = orientation in TRANSPOSED_ORIENTATIONS
+            size = target_size(img.size[::-1] if transposed else img.size, display_size, dpi)
+            stored_size = size[::-1] if transposed else size
+            if not rotated and source_format in EMBEDDABLE_FORMATS and stored_size == img.size:
+                # Already no larger than it is shown: keep it without decoding it
+                return None
+            if source_format == 'JPEG':
+                # Decode at the smallest DCT scale that still covers the target size
+                img.draft(img.mode, stored_size)
+            # Apply EXIF rotation before the EXIF block is dropped
+            upright = ImageOps.exif_transpose(img) if rotated else img
+            if size != upright.size:
+                upright = upright.resize(size, Image.LANCZOS)
+            optimized = _encode(upright, dpi)
+    except (UnidentifiedImageError, OSError) as e:
+        # Leave unreadable images to python-pptx, which reports them as before
+        logger.debug(f"Not optimizing image: {str(e)}")
+        return None
+
+    if not rotated and source_format in EMBEDDABLE_FORMATS and len(content) <= len(optimized):
+        return None
+    return optimized
+
+
+def optimize_image(image, display_size, dpi=IMAGE_EMBED_DPI, cache_dir=IMAGE_CACHE_DIR):
+    """Downsample an image to its display size and re-encode it without metadata.
+
+    Returns (image argument for add_picture, bytes before, bytes after). The
+    original is returned unchanged when it is already embeddable, needs no
+    rotation and is either no larger than its display size or no larger than
+    the re-encoded copy; add_picture is always given the display size, so the
+    pixel size does not change the layout. Results are cached on disk by
+    content hash, display size and DPI, so later builds skip the work.
+    """
+    content = read_image_bytes(image)
+    path = _cache_path(content, display_size, dpi, cache_dir) if IMAGE_CACHE_ENABLED else None
+    optimized = _read_cached(path) if path else None
+    if optimized is None:
+        optimized = _optimize(content, display_size, dpi) or b''
+        if path:
+            _write_cached(path, optimized, cache_dir)
+    else:
+        logger.debug(f"Optimized image cache hit: {os.path.basename(path)[:12]}")
+
+    if not optimized:
+        return image, len(content), len(content)
+    return io.BytesIO(optimized), len(content), len(optimized)
+
+
+def optimize_images(images, dpi=IMAGE_EMBED_DPI, max_workers=IMAGE_OPTIMIZE_WORKERS):
+    """Optimize (image, display_size) pairs on a thread pool.
+
+    Returns the optimized image arguments in the same order and a stats dict
+    with the image count and the bytes before, after and saved. The same
+    image shown at the same size is only processed once.
+    """
+    try:
+        unique = {}
+        for image, display_size in images:
+            unique.setdefault(_image_key(image, display_size), (image, display_size))
+
+        # PIL releases the GIL while decoding, resampling and encoding
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(unique)))) as executor:
+            futures = {key: executor.submit(optimize_image, image, display_size, dpi) for key, (image, display_size) in unique.items()}
+            results = {key: future.result() for key, future in futures.items()}
+
+        bytes_in = sum(result[1] for result in results.values())
+        bytes_out = sum(result[2] for result in results.values())
+        stats = {
+            'images': len(results),
+            'optimized': sum(1 for key, result in results.items() if result[0] is not unique[key][0]),
+            'bytes_in': bytes_in,
+            'bytes_out': bytes_out,
+            'bytes_saved': bytes_in - bytes_out,
+        }
+        optimized = [results[_image_key(image, display_size)][0] for image, display_size in images]
+        return optimized, stats
+    except Exception as e:
+        logger.error(f"Error optimizing images: {str(e)}")
+        raise
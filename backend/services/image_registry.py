@@ -0,0 +1,108 @@
+import logging
+import os
+
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.parts.image import Image, ImagePart
+from pptx.util import Emu
+
+from services.asset_store import cached_image_size
+from services.pptx_compat import require_pptx_internals
+
+logger = logging.getLogger(__name__)
+
+# Relies on python-pptx internals; fails on import if they moved
+require_pptx_internals()
+
+EMU_PER_INCH = 914400
+
+
+class ImageRegistry:
+    """Images of one create_ppt build, each read, hashed and measured once.
+
+    add_picture does what SlideShapes.add_picture does, but the bytes, SHA-1,
+    pixel size and DPI of an image come from the registry instead of being
+    re-read from the file and re-parsed with PIL for every picture. Paths are
+    keyed by value and file-like objects by identity.
+    """
+
+    def __init__(self, package):
+        self._package = package
+        self._images = {}
+        # SHA-1 -> ImagePart, so identical bytes under different names share a part
+        self._parts = {}
+        self._available = {}
+
+    @staticmethod
+    def _key(image):
+        return os.fspath(image) if isinstance(image, (str, os.PathLike)) else id(image)
+
+    def available(self, image):
+        """Whether an image argument (file path or file-like object) can be embedded"""
+        if image is None:
+            return False
+        if not isinstance(image, (str, os.PathLike)):
+            return True
+        key = self._key(image)
+        if key not in self._available:
+            self._available[key] = os.path.exists(image)
+        return self._available[key]
+
+    def get(self, image):
+        """The pptx Image of an image argument, read on first use"""
+        key = self._key(image)
+        entry = self._images.get(key)
+        if entry is None:
+            if isinstance(image, (str, os.PathLike)):
+                with open(image, 'rb') as f:
+                    entry = Image.from_blob(f.read(), os.path.basename(image))
+            else:
+                if hasattr(image, 'seek'):
+                    image.seek(0)
+                entry = Image.from_blob(image.read())
+            self._images[key] = entry
+            logger.debug(f"Registered image {entry.sha1[:12]} ({len(entry.blob)} bytes)")
+        return entry
+
+    def size(self, image):
+        """(width, height) in pixels; stored assets answer from their metadata"""
+        if isinstance(image, (str, os.PathLike)) and self._key(image) not in self._images:
+            size = cached_image_size(os.fspath(image))
+            if size is not None:
+                return size
+        return self.get(image).size
+
+    def native_size(self, image):
+        """(width, height) in EMU at the image's own DPI, as python-pptx computes it"""
+        entry = self.get(image)
+        (width_px, height_px), (horz_dpi, vert_dpi) = entry.size, entry.dpi
+        return Emu(int(EMU_PER_INCH * width_px / horz_dpi)), Emu(int(EMU_PER_INCH * height_px / vert_dpi))
+
+    def scale(self, image, width=None, height=None):
+        """Display size for add_picture's width/height arguments, like ImagePart.scale"""
+        image_cx, image_cy = self.native_size(image)
+        if width and height:
+            return width, height
+        if width:
+            return width, int(round(image_cy * float(width) / float(image_cx)))
+        if height:
+            return int(round(image_cx * float(height) / float(image_cy))), height
+        return image_cx, image_cy
+
+    def image_part(self, image):
+        """The package's ImagePart for an image, created on first use"""
+        entry = self.get(image)
+        part = self._parts.get(entry.sha1)
+        if part is None:
+            part = ImagePart.new(self._package, entry)
+            self._parts[entry.sha1] = part
+        return part
+
+    def add_picture(self, shapes, image, left, top, width=None, height=None):
+        """Add a picture to a slide's shapes, like shapes.add_picture(image, ...)"""
+        image_part = self.image_part(image)
+        rId = shapes.part.relate_to(image_part, RT.IMAGE)
+        cx, cy = self.scale(image, width, height)
+        shape_id = shapes._next_shape_id
+        pic = shapes._grpSp.add_pic(shape_id, f"Picture {shape_id - 1}", image_part.desc, rId, left, top, cx, cy)
+        shapes._recalculate_extents()
+        return shapes._shape_factory(pic)
@@ -0,0 +1,200 @@
+import importlib.util
+import io
+import logging
+import os
+import re
+
+import pandas as pd
+
+from services.excel_parser import parse_excel_data
+from services.sheet_schemas import CATEGORY, KEY, SchemaError, apply_schema, filter_date_range, get_sheet_schema, has_schemas, with_key_columns
+
+logger = logging.getLogger(__name__)
+
+EXCEL = 'excel'
+CSV = 'csv'
+PARQUET = 'parquet'
+ARROW = 'arrow'
+
+# Leading bytes of each binary format; anything else is read as CSV text.
+# Gzip is a transport wrapper and only ever holds CSV here.
+MAGIC_BYTES = [
+    (b'PK\x03\x04', EXCEL),            # xlsx/xlsm (zip container)
+    (b'\xd0\xcf\x11\xe0', EXCEL),      # legacy xls (OLE2)
+    (b'PAR1', PARQUET),
+    (b'ARROW1', ARROW),                # Arrow IPC file / Feather v2
+    (b'\xff\xff\xff\xff', ARROW),      # Arrow IPC stream
+]
+GZIP_MAGIC = b'\x1f\x8b'
+
+# Upload file extensions, longest first so ".csv.gz" wins over ".gz"
+INPUT_EXTENSIONS = ['.csv.gz', '.parquet', '.feather', '.arrows', '.arrow', '.xlsx', '.xlsm', '.xls', '.csv', '.ipc']
+
+# Sheet name given to single-table inputs of roles whose schema is "role.*"
+DEFAULT_SHEET = 'Sheet1'
+
+# Sheet names accepted in upload names of roles whose schema is "role.*"
+SHEET_NAME_PATTERN = re.compile(r'[\w -]+')
+
+
+class InputFormatError(SchemaError):
+    """Raised when an upload cannot be read in its detected format"""
+
+
+def input_name(filename):
+    """Upload name without its format extension: "combined_sources.News.csv.gz" -> "combined_sources.News" """
+    lowered = filename.lower()
+    for extension in INPUT_EXTENSIONS:
+        if lowered.endswith(extension):
+            return filename[:-len(extension)]
+    return filename
+
+
+def upload_input_name(filename):
+    """input_name for a client-supplied file name, checked against the declared inputs.
+
+    Any directory part is dropped, and the name must be "role" or
+    "role.Sheet" for a role and sheet with a declared schema; anything else
+    raises InputFormatError.
+    """
+    name = input_name(os.path.basename(filename or ''))
+    role, sheet_name = split_input_name(name)
+    if not has_schemas(role):
+        raise InputFormatError(f"{filename}: unknown input, expected a file named after one of the report inputs")
+    if sheet_name is not None and (get_sheet_schema(role, sheet_name) is None or not SHEET_NAME_PATTERN.fullmatch(sheet_name)):
+        raise InputFormatError(f"{filename}: unknown sheet '{sheet_name}' of {role}")
+    return name
+
+
+def split_input_name(name):
+    """(role, sheet_name) for an input name; sheet_name is None when not given"""
+    role, _, sheet_name = name.partition('.')
+    return role, sheet_name or None
+
+
+def _head(source, size=8):
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source[:size])
+    if isinstance(source, io.BytesIO):
+        return bytes(source.getbuffer()[:size])
+    with open(source, 'rb') as f:
+        return f.read(size)
+
+
+def detect_format(source):
+    """(format, gzipped) of a path, BytesIO or bytes, from its leading bytes"""
+    head = _head(source)
+    if head.startswith(GZIP_MAGIC):
+        return CSV, True
+    for magic, input_format in MAGIC_BYTES:
+        if head.startswith(magic):
+            return input_format, False
+    return CSV, False
+
+
+def _require_pyarrow(input_format):
+    if importlib.util.find_spec('pyarrow') is None:
+        raise InputFormatError(f"Reading {input_format} inputs requires pyarrow, which is not installed")
+
+
+def _wanted_columns(names, schema):
+    if schema is None:
+        return list(names)
+    return [name for name in names if name in schema['columns']]
+
+
+def read_csv_table(source, schema, gzipped=False):
+    """Read a CSV upload, loading only the schema's columns"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    columns = set(schema['columns']) if schema else None
+    # Labels stay text as in Excel (no "NA" -> NaN, no numeric-looking company names)
+    labels = {column: str for column, kind in schema['columns'].items() if kind in (CATEGORY, KEY)} if schema else None
+    return pd.read_csv(
+        source,
+        usecols=(lambda column: column in columns) if columns else None,
+        dtype=labels,
+        keep_default_na=False,
+        na_values=[''],
+        compression='gzip' if gzipped else None,
+    )
+
+
+def read_parquet_table(source, schema):
+    """Read a Parquet upload, decoding only the schema's columns"""
+    _require_pyarrow(PARQUET)
+    import pyarrow.parquet as pq
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    parquet_file = pq.ParquetFile(source)
+    return parquet_file.read(columns=_wanted_columns(parquet_file.schema_arrow.names, schema)).to_pandas()
+
+
+def read_arrow_table(source, schema):
+    """Read an Arrow IPC upload without copying it.
+
+    Paths are memory-mapped and in-memory uploads are wrapped as Arrow
+    buffers, so only the selected columns are materialized by to_pandas().
+    """
+    _require_pyarrow(ARROW)
+    import pyarrow as pa
+
+    if isinstance(source, (str, os.PathLike)):
+        buffer = pa.memory_map(os.fspath(source), 'r')
+    elif isinstance(source, io.BytesIO):
+        buffer = pa.py_buffer(source.getbuffer())
+    else:
+        buffer = pa.py_buffer(source)
+
+    if _head(source).startswith(b'ARROW1'):
+        table = pa.ipc.open_file(buffer).read_all()
+    else:
+        table = pa.ipc.open_stream(buffer).read_all()
+    return table.select(_wanted_columns(table.column_names, schema)).to_pandas()
+
+
+def parse_input(source, name, date_range=None, with_keys=False):
+    """Read one uploaded input into {sheet_name: DataFrame}, whatever its format.
+
+    name is the upload name without extension (see input_name): "role" for a
+    workbook, "role.Sheet" for a single-table CSV, Parquet or Arrow file that
+    holds one sheet of a role. Workbooks go through parse_excel_data; other
+    formats are projected, typed and date-filtered the same way. with_keys
+    also loads the post id and link columns, as in parse_excel_data.
+    """
+    try:
+        role, sheet_name = split_input_name(name)
+        input_format, gzipped = detect_format(source)
+        if input_format == EXCEL:
+            return parse_excel_data(source, role, date_range, with_keys)
+
+        logger.debug(f"Reading {input_format} input: {name}")
+        if sheet_name is None:
+            sheet_name = DEFAULT_SHEET
+        schema = get_sheet_schema(role, sheet_name)
+        if has_schemas(role) and schema is None:
+            if sheet_name == DEFAULT_SHEET:
+                raise InputFormatError(
+                    f"{name}: {input_format} inputs of {role} hold one sheet; name it in the file name, e.g. {role}.News.csv"
+                )
+            logger.debug(f"Skipping undeclared sheet: {role}.{sheet_name}")
+            return {}
+        if with_keys:
+            schema = with_key_columns(schema)
+
+        if input_format == PARQUET:
+            df = read_parquet_table(source, schema)
+        elif input_format == ARROW:
+            df = read_arrow_table(source, schema)
+        else:
+            df = read_csv_table(source, schema, gzipped)
+
+        df, skipped = filter_date_range(apply_schema(df, role, sheet_name, schema), schema, date_range)
+        if skipped:
+            logger.info(f"{role}.{sheet_name}: skipped {skipped} rows outside the report dates")
+        df.attrs['rows_skipped'] = skipped
+        return {sheet_name: df}
+    except Exception as e:
+        logger.error(f"Error parsing input {name}: {str(e)}")
+        raise
@@ -0,0 +1,127 @@
+import logging
+import os
+import shutil
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+
+from config import JOB_RETENTION_SECONDS, JOBS_DB_PATH, JOBS_DIR
+from services.ppt_generator import REPORT_REGIONS
+
+logger = logging.getLogger(__name__)
+
+# Job lifecycle
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    stage TEXT,
+    stages_done INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    output_path TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+)
+"""
+
+
+@contextmanager
+def _connect():
+    # One short-lived connection per call: the API process and every pool
+    # worker update the same database file.
+    os.makedirs(os.path.dirname(JOBS_DB_PATH) or ".", exist_ok=True)
+    conn = sqlite3.connect(JOBS_DB_PATH, timeout=30)
+    try:
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(_SCHEMA)
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _update(job_id, **fields):
+    fields['updated_at'] = time.time()
+    assignments = ", ".join(f"{name} = ?" for name in fields)
+    with _connect() as conn:
+        conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+
+def job_dir(job_id):
+    return os.path.join(JOBS_DIR, job_id)
+
+
+def create_job():
+    """Register a new queued job and return its id"""
+    job_id = uuid.uuid4().hex
+    now = time.time()
+    with _connect() as conn:
+        conn.execute(
+            "INSERT INTO jobs (id, status, created_at, updated_at) VALUES (?, ?, ?, ?)",
+            (job_id, QUEUED, now, now),
+        )
+    os.makedirs(job_dir(job_id), exist_ok=True)
+    logger.debug(f"Created job {job_id}")
+    return job_id
+
+
+def mark_running(job_id):
+    _update(job_id, status=RUNNING)
+
+
+def update_stage(job_id, stage):
+    """Record the deck region the job has started building"""
+    stages_done = REPORT_REGIONS.index(stage) if stage in REPORT_REGIONS else 0
+    _update(job_id, stage=stage, stages_done=stages_done)
+
+
+def mark_done(job_id, output_path):
+    _update(job_id, status=DONE, stage=None, stages_done=len(REPORT_REGIONS), output_path=output_path)
+
+
+def mark_failed(job_id, error):
+    _update(job_id, status=FAILED, error=error)
+
+
+def get_job(job_id):
+    """Return the job as a dict, or None if it does not exist"""
+    with _connect() as conn:
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    if row is None:
+        return None
+    job = dict(row)
+    job['stages_total'] = len(REPORT_REGIONS)
+    return job
+
+
+def fail_interrupted_jobs():
+    """Mark jobs left queued or running by a previous server process as failed"""
+    with _connect() as conn:
+        cursor = conn.execute(
+            "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE status IN (?, ?)",
+            (FAILED, "Interrupted by a server restart", time.time(), QUEUED, RUNNING),
+        )
+    if cursor.rowcount:
+        logger.warning(f"Marked {cursor.rowcount} interrupted job(s) as failed")
+
+
+def purge_expired_jobs(retention_seconds=JOB_RETENTION_SECONDS):
+    """Delete finished jobs (and their decks) older than retention_seconds"""
+    cutoff = time.time() - retention_seconds
+    with _connect() as conn:
+        rows = conn.execute(
+            "SELECT id FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+            (DONE, FAILED, cutoff),
+        ).fetchall()
+        conn.executemany("DELETE FROM jobs WHERE id = ?", [(row['id'],) for row in rows])
+    for row in rows:
+        shutil.rmtree(job_dir(row['id']), ignore_errors=True)
+    if rows:
+        logger.debug(f"Purged {len(rows)} expired job(s)")
@@ -0,0 +1,391 @@
+import io
+import logging
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+from config import MENTION_STORE_PATH
+from services.aggregations import ENGAGEMENT_SUMS
+from services.excel_stream import STREAMED_ROLE
+from services.input_formats import parse_input, split_input_name
+from services.sheet_schemas import MENTION_KEY_COLUMNS, SchemaError, apply_schema, get_sheet_schema
+
+logger = logging.getLogger(__name__)
+
+# Sheet columns -> store columns. Engagement counts are only filled for Facebook
+# and authors only for News; sheets read back just the columns in their schema.
+STORE_COLUMNS = {
+    'Day': 'day',
+    'Company': 'company',
+    'Sentiment': 'sentiment',
+    'Author': 'author',
+    'comment_count': 'comment_count',
+    'like_count': 'like_count',
+    'share_count': 'share_count',
+    'view_count': 'view_count',
+    'ID': 'post_id',
+    'Url': 'url',
+}
+
+# Days are stored as ISO text so range queries compare lexically and use the index
+DAY_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# A mention is the same post seen for the same company, by id or by link; one
+# article naming two banks is two mentions. SQLite treats NULLs as distinct,
+# so a row without an id is still deduplicated by its link and vice versa;
+# the unique indexes COALESCE the company so rows without one dedupe too.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS mentions (
+    source TEXT NOT NULL,
+    company TEXT,
+    day TEXT,
+    sentiment INTEGER,
+    author TEXT,
+    comment_count INTEGER,
+    like_count INTEGER,
+    share_count INTEGER,
+    view_count INTEGER,
+    post_id TEXT,
+    url TEXT,
+    ingested_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS mentions_source_day ON mentions (source, day);
+CREATE INDEX IF NOT EXISTS mentions_company_day ON mentions (company, day);
+
+CREATE TABLE IF NOT EXISTS sentiment_daily (
+    source TEXT NOT NULL,
+    company TEXT NOT NULL,
+    day TEXT NOT NULL,
+    sentiment TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (source, company, day, sentiment)
+);
+CREATE INDEX IF NOT EXISTS sentiment_daily_day ON sentiment_daily (day);
+
+CREATE TABLE IF NOT EXISTS author_daily (
+    company TEXT NOT NULL,
+    day TEXT NOT NULL,
+    author TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (company, day, author)
+);
+CREATE INDEX IF NOT EXISTS author_daily_day ON author_daily (day);
+
+CREATE TABLE IF NOT EXISTS engagement_daily (
+    company TEXT NOT NULL,
+    day TEXT NOT NULL,
+    comment_count INTEGER NOT NULL,
+    like_count INTEGER NOT NULL,
+    share_count INTEGER NOT NULL,
+    view_count INTEGER NOT NULL,
+    post_count INTEGER NOT NULL,
+    PRIMARY KEY (company, day)
+);
+"""
+
+# Daily rollups of the slide aggregates (see services.aggregations), kept up to
+# date at ingestion from the rows each batch actually inserted. Rollup keys are
+# NOT NULL so upserts can match them; a missing company, day, author or
+# sentiment is stored as MISSING_KEY and read back as NaN.
+MISSING_KEY = ''
+
+_ROLLUPS = [
+    """
+    INSERT INTO sentiment_daily (source, company, day, sentiment, count)
+    SELECT source, COALESCE(company, ''), COALESCE(day, ''), COALESCE(CAST(sentiment AS TEXT), ''), COUNT(*)
+    FROM mentions WHERE rowid > ?
+    GROUP BY 1, 2, 3, 4
+    ON CONFLICT (source, company, day, sentiment) DO UPDATE SET count = count + excluded.count
+    """,
+    """
+    INSERT INTO author_daily (company, day, author, count)
+    SELECT COALESCE(company, ''), COALESCE(day, ''), COALESCE(author, ''), COUNT(*)
+    FROM mentions WHERE rowid > ? AND source = 'News'
+    GROUP BY 1, 2, 3
+    ON CONFLICT (company, day, author) DO UPDATE SET count = count + excluded.count
+    """,
+    """
+    INSERT INTO engagement_daily (company, day, comment_count, like_count, share_count, view_count, post_count)
+    SELECT COALESCE(company, ''), COALESCE(day, ''),
+        SUM(COALESCE(comment_count, 0)), SUM(COALESCE(like_count, 0)),
+        SUM(COALESCE(share_count, 0)), SUM(COALESCE(view_count, 0)), COUNT(*)
+    FROM mentions WHERE rowid > ? AND source = 'Facebook'
+    GROUP BY 1, 2
+    ON CONFLICT (company, day) DO UPDATE SET
+        comment_count = comment_count + excluded.comment_count,
+        like_count = like_count + excluded.like_count,
+        share_count = share_count + excluded.share_count,
+        view_count = view_count + excluded.view_count,
+        post_count = post_count + excluded.post_count
+    """,
+]
+
+
+# Store layout version, kept in PRAGMA user_version
+SCHEMA_VERSION = 1
+
+_UNIQUE_INDEXES = [
+    "CREATE UNIQUE INDEX IF NOT EXISTS mentions_post ON mentions (source, COALESCE(company, ''), post_id)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS mentions_url ON mentions (source, COALESCE(company, ''), url)",
+]
+
+
+def _migrate(conn):
+    """Bring a store written by an older version up to SCHEMA_VERSION"""
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+        return
+    with conn:
+        # Version 0 kept Excel's numeric ids as "12345.0"; store them as key_text() does
+        conn.execute(
+            "UPDATE OR REPLACE mentions SET post_id = substr(post_id, 1, length(post_id) - 2) "
+            "WHERE post_id GLOB '[0-9]*.0' AND substr(post_id, 1, length(post_id) - 2) NOT GLOB '*[^0-9]*'"
+        )
+        # It also deduplicated on company as given, so mentions without a
+        # company could be stored more than once; keep the first of each
+        for key in ('post_id', 'url'):
+            conn.execute(
+                f"DELETE FROM mentions WHERE {key} IS NOT NULL AND rowid NOT IN "
+                f"(SELECT MIN(rowid) FROM mentions WHERE {key} IS NOT NULL GROUP BY source, COALESCE(company, ''), {key})"
+            )
+        for statement in _UNIQUE_INDEXES:
+            conn.execute(statement)
+        for table in ('sentiment_daily', 'author_daily', 'engagement_daily'):
+            conn.execute(f"DELETE FROM {table}")
+        _roll_up(conn, 0)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    logger.debug(f"Migrated mention store to version {SCHEMA_VERSION}")
+
+
+@contextmanager
+def _connect():
+    # Short-lived connections, as in services.job_store: ingestion and report
+    # builds run in different pool workers against the same file.
+    os.makedirs(os.path.dirname(MENTION_STORE_PATH) or ".", exist_ok=True)
+    conn = sqlite3.connect(MENTION_STORE_PATH, timeout=30)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        _migrate(conn)
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _store_rows(source, df):
+    """(store columns, rows to insert, count of rows without an id or link) for one typed sheet"""
+    keyed = df['ID'].notna() | df['Url'].notna()
+    columns = [column for column in STORE_COLUMNS if column in df.columns]
+    frame = df.loc[keyed, columns].copy()
+    frame['Day'] = frame['Day'].dt.strftime(DAY_FORMAT)
+    # Plain Python values for sqlite3: NA/NaT -> None, numpy ints -> int
+    frame = frame.astype(object).where(frame.notna(), None)
+    now = time.time()
+    rows = [(source, *values, now) for values in frame.itertuples(index=False, name=None)]
+    return [STORE_COLUMNS[column] for column in columns], rows, int((~keyed).sum())
+
+
+def _first_mentions(columns, rows):
+    """The rows, less those sharing a post id or link (for the same company) with an earlier row"""
+    company, post_id, url = (columns.index(column) + 1 for column in ('company', 'post_id', 'url'))
+    seen = set()
+    first = []
+    for row in rows:
+        keys = [(key, row[company] or '', row[index]) for key, index in (('id', post_id), ('url', url)) if row[index] is not None]
+        if not any(key in seen for key in keys):
+            seen.update(keys)
+            first.append(row)
+    return first
+
+
+def ingest_mentions(sheets):
+    """Append typed combined_sources sheets to the store, skipping known mentions.
+
+    The daily rollups are updated with the newly inserted rows in the same
+    transaction. sheets must carry the mention key columns (parse_input(with_keys=True)).
+    Returns {sheet: {'rows', 'inserted', 'duplicates', 'repeated', 'unkeyed'}}:
+    duplicates were already stored, and repeated rows repeat a mention
+    listed earlier in the same sheet. Both are collapsed into one stored
+    mention, so an export that lists a post twice counts it once in
+    load_aggregates but twice when uploaded for a report. Rows with neither
+    a post id nor a link cannot be deduplicated and are not stored.
+    """
+    try:
+        summary = {}
+        with _connect() as conn:
+            last_rowid = conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM mentions").fetchone()[0]
+            for sheet_name, df in sheets.items():
+                columns, rows, unkeyed = _store_rows(sheet_name, df)
+                mentions = _first_mentions(columns, rows)
+                before = conn.total_changes
+                conn.executemany(
+                    f"INSERT OR IGNORE INTO mentions (source, {', '.join(columns)}, ingested_at) "
+                    f"VALUES ({', '.join('?' * (len(columns) + 2))})",
+                    mentions,
+                )
+                inserted = conn.total_changes - before
+                summary[sheet_name] = {
+                    'rows': len(df),
+                    'inserted': inserted,
+                    'duplicates': len(mentions) - inserted,
+                    'repeated': len(rows) - len(mentions),
+                    'unkeyed': unkeyed,
+                }
+                if unkeyed:
+                    logger.warning(f"{STREAMED_ROLE}.{sheet_name}: {unkeyed} rows have no ID or Url and were not stored")
+                logger.debug(f"Stored {inserted} of {len(df)} {sheet_name} mentions")
+            # Same transaction as the inserts, so rollups never lag the mentions
+            _roll_up(conn, last_rowid)
+        return summary
+    except Exception as e:
+        logger.error(f"Error storing mentions: {str(e)}")
+        raise
+
+
+def ingest_upload(content, name):
+    """Parse one uploaded combined_sources input and append it; runs in a report pool worker"""
+    if split_input_name(name)[0] != STREAMED_ROLE:
+        raise SchemaError(f"{name}: only {STREAMED_ROLE} inputs can be ingested into the mention store")
+    return ingest_mentions(parse_input(io.BytesIO(content), name, with_keys=True))
+
+
+def _roll_up(conn, after_rowid):
+    """Add mentions stored after after_rowid to the daily rollups"""
+    for statement in _ROLLUPS:
+        conn.execute(statement, (after_rowid,))
+
+
+def rebuild_rollups():
+    """Recompute the daily rollups from every stored mention"""
+    with _connect() as conn:
+        for table in ('sentiment_daily', 'author_daily', 'engagement_daily'):
+            conn.execute(f"DELETE FROM {table}")
+        _roll_up(conn, 0)
+    logger.debug("Rebuilt mention rollups")
+
+
+def _stored_sources(conn):
+    """Sheets present in the store, in the order they were first ingested"""
+    return [row[0] for row in conn.execute("SELECT source FROM mentions GROUP BY source ORDER BY MIN(rowid)")]
+
+
+def load_mentions(date_range=None, companies=None):
+    """Stored mentions as {sheet: typed DataFrame}, like parse_input for combined_sources.
+
+    date_range (start, end) is inclusive and keeps undated rows, as
+    filter_date_range does; companies limits the rows to those companies.
+    Both are answered from the (source, day) and (company, day) indexes.
+    """
+    try:
+        data = {}
+        with _connect() as conn:
+            for sheet_name in _stored_sources(conn):
+                schema = get_sheet_schema(STREAMED_ROLE, sheet_name)
+                if schema is None:
+                    continue
+                columns = [column for column in schema['columns'] if column not in MENTION_KEY_COLUMNS]
+                query = f"SELECT {', '.join(STORE_COLUMNS[column] for column in columns)} FROM mentions WHERE source = ?"
+                params = [sheet_name]
+                if date_range is not None:
+                    start, end = date_range
+                    query += " AND (day IS NULL OR (day >= ? AND day < ?))"
+                    params += [start.strftime(DAY_FORMAT), (end + pd.Timedelta(days=1)).strftime(DAY_FORMAT)]
+                if companies is not None:
+                    query += f" AND company IN ({', '.join('?' * len(companies))})"
+                    params += list(companies)
+                query += " ORDER BY rowid"
+
+                df = pd.read_sql_query(query, conn, params=params)
+                df.columns = columns
+                df = apply_schema(df, STREAMED_ROLE, sheet_name, schema)
+                df.attrs['rows_skipped'] = 0
+                data[sheet_name] = df
+                logger.debug(f"Loaded {len(df)} stored {sheet_name} mentions")
+        return data
+    except Exception as e:
+        logger.error(f"Error loading stored mentions: {str(e)}")
+        raise
+
+
+def _rollup_filter(date_range, companies):
+    """WHERE clause and parameters for a report period over a rollup table"""
+    clauses, params = [], []
+    if date_range is not None:
+        start, end = date_range
+        clauses.append("(day = '' OR (day >= ? AND day < ?))")
+        params += [start.strftime(DAY_FORMAT), (end + pd.Timedelta(days=1)).strftime(DAY_FORMAT)]
+    if companies is not None:
+        clauses.append(f"company IN ({', '.join('?' * len(companies))})")
+        params += list(companies)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def _missing_as_nan(df, columns):
+    for column in columns:
+        df[column] = df[column].where(df[column] != MISSING_KEY)
+    return df
+
+
+def load_aggregates(date_range=None, companies=None, exclude_sources=()):
+    """Slide aggregates for a report period, summed from the daily rollups.
+
+    Returns the same structure as services.aggregations.build_aggregates over
+    the stored mentions, so create_ppt(aggregates=...) can use it directly;
+    a post repeated within one export is stored, and counted, once (see
+    ingest_mentions);
+    the cost depends on the number of rollup rows in the period, not on the
+    number of mentions. Sheets in exclude_sources are left out entirely.
+    """
+    try:
+        exclude_sources = list(exclude_sources)
+        where, params = _rollup_filter(date_range, companies)
+        # Author counts come from News and engagement from Facebook only
+        no_rows = " AND 0" if where else " WHERE 0"
+        sentiment_where, sentiment_params = where, params
+        if exclude_sources:
+            sentiment_where += f"{' AND' if where else ' WHERE'} source NOT IN ({', '.join('?' * len(exclude_sources))})"
+            sentiment_params = params + exclude_sources
+        with _connect() as conn:
+            sentiment = pd.read_sql_query(
+                f"SELECT source AS Source, company AS Company, day AS Day, sentiment AS Sentiment, count "
+                f"FROM sentiment_daily{sentiment_where} ORDER BY rowid",
+                conn, params=sentiment_params,
+            )
+            authors = pd.read_sql_query(
+                f"SELECT company AS Company, author AS Author, SUM(count) AS count "
+                f"FROM author_daily{where}{no_rows if 'News' in exclude_sources else ''} GROUP BY company, author ORDER BY MIN(rowid)",
+                conn, params=params,
+            )
+            engagement = pd.read_sql_query(
+                f"SELECT company AS Company, {', '.join(f'SUM({column}) AS {column}' for column in ENGAGEMENT_SUMS)}, "
+                f"SUM(post_count) AS post_count "
+                f"FROM engagement_daily{where}{no_rows if 'Facebook' in exclude_sources else ''} GROUP BY company ORDER BY MIN(rowid)",
+                conn, params=params,
+            )
+            sources = [
+                row[0] for row in conn.execute("SELECT source FROM sentiment_daily GROUP BY source ORDER BY MIN(rowid)")
+                if row[0] not in exclude_sources
+            ]
+
+        sentiment = _missing_as_nan(sentiment, ['Company', 'Day', 'Sentiment'])
+        sentiment['Day'] = pd.to_datetime(sentiment['Day'], format=DAY_FORMAT)
+        sentiment['Sentiment'] = pd.to_numeric(sentiment['Sentiment']).astype('Int8')
+        sentiment['count'] = sentiment['count'].astype('int64')
+        authors = _missing_as_nan(authors, ['Company', 'Author'])
+        engagement = _missing_as_nan(engagement, ['Company']).astype(
+            {column: 'int64' for column in ENGAGEMENT_SUMS + ['post_count']}
+        )
+        logger.debug(f"Loaded {len(sentiment)} sentiment, {len(authors)} author and {len(engagement)} engagement rollup rows")
+        return {
+            'sources': [source for source in sources if get_sheet_schema(STREAMED_ROLE, source) is not None],
+            'rows_skipped': {},
+            'sentiment': sentiment,
+            'authors': authors,
+            'facebook_engagement': engagement,
+        }
+    except Exception as e:
+        logger.error(f"Error loading mention rollups: {str(e)}")
+        raise
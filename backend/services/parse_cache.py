@@ -0,0 +1,187 @@
+import hashlib
+import io
+import logging
+import os
+import pickle
+import tempfile
+
+import pandas as pd
+
+from config import PARSE_CACHE_DIR, PARSE_CACHE_ENABLED, PARSE_CACHE_MAX_BYTES
+from services.excel_stream import stream_aggregates
+from services.input_formats import parse_input, split_input_name
+from services.sheet_schemas import SHEET_SCHEMAS, date_range_tag
+
+logger = logging.getLogger(__name__)
+
+CACHE_SUFFIX = ".pkl"
+
+# What a cache entry holds: parse_input() frames, or stream_aggregates() counts
+FRAMES = "frames"
+AGGREGATES = "aggregates"
+
+# Cached frames are only valid for the schemas and pandas version that produced
+# them, so both are folded into every cache key.
+SCHEMA_TAG = hashlib.sha256(
+    f"{pd.__version__}:{sorted((k, sorted(v['columns'].items())) for k, v in SHEET_SCHEMAS.items())}".encode()
+).hexdigest()[:12]
+
+
+def content_digest(content, name):
+    """SHA-256 of an upload's input name and bytes.
+
+    The same bytes parse differently under another role or sheet, so the
+    name is part of the digest; it never appears in a cache path itself.
+    """
+    digest = hashlib.sha256(name.encode() + b"\0")
+    digest.update(content)
+    return digest.hexdigest()
+
+
+def _cache_path(digest, cache_dir, kind=FRAMES, date_range=None):
+    return os.path.join(cache_dir, f"{kind}-{digest}-{date_range_tag(date_range)}-{SCHEMA_TAG}{CACHE_SUFFIX}")
+
+
+def _parse(content, name, kind, date_range):
+    if kind == AGGREGATES:
+        return stream_aggregates(io.BytesIO(content), split_input_name(name)[0], date_range=date_range)
+    return parse_input(io.BytesIO(content), name, date_range)
+
+
+def _load(path):
+    try:
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Discarding unreadable cache entry {path}: {str(e)}")
+        _remove(path)
+        return None
+
+    # Mark as recently used for LRU eviction
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return data
+
+
+def _read_payload(path):
+    """Raw pickle bytes of a cache entry, or None"""
+    try:
+        with open(path, "rb") as f:
+            payload = f.read()
+    except FileNotFoundError:
+        return None
+
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return payload
+
+
+def _store(path, payload, cache_dir):
+    os.makedirs(cache_dir, exist_ok=True)
+    # Write to a temp file and rename so concurrent readers never see partial entries
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except Exception:
+        _remove(tmp_path)
+        raise
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def evict(cache_dir=PARSE_CACHE_DIR, max_bytes=PARSE_CACHE_MAX_BYTES, suffix=CACHE_SUFFIX):
+    """Delete least recently used entries (files ending in suffix) until the cache fits in max_bytes"""
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.is_file() and entry.name.endswith(suffix):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        logger.debug(f"Evicting cache entry: {path}")
+        _remove(path)
+        total -= size
+
+
+def parse_excel_data_cached(content, name, cache_dir=PARSE_CACHE_DIR, date_range=None):
+    """parse_input for uploaded bytes, memoised on disk by content hash.
+
+    Identical uploads (same bytes, input name and date range) are served from
+    a pickle of the already typed DataFrames instead of being parsed again.
+    Any supported format is accepted despite the name; see services.input_formats.
+    """
+    if not PARSE_CACHE_ENABLED:
+        return parse_input(io.BytesIO(content), name, date_range)
+
+    digest = content_digest(content, name)
+    path = _cache_path(digest, cache_dir, FRAMES, date_range)
+
+    data = _load(path)
+    if data is not None:
+        logger.debug(f"Parsed workbook cache hit: {name} ({digest[:12]})")
+        return data
+
+    logger.debug(f"Parsed workbook cache miss: {name} ({digest[:12]})")
+    data = parse_input(io.BytesIO(content), name, date_range)
+    _store_quietly(path, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL), cache_dir)
+    return data
+
+
+def _store_quietly(path, payload, cache_dir):
+    try:
+        _store(path, payload, cache_dir)
+        evict(cache_dir)
+    except OSError as e:
+        logger.warning(f"Could not write parsed workbook cache entry {path}: {str(e)}")
+
+
+def cached_payload(content, name, cache_dir=PARSE_CACHE_DIR, kind=FRAMES, date_range=None):
+    """Pickled frames for an upload if they are already cached, else None.
+
+    Cheap enough to call from the event loop before dispatching a parse.
+    """
+    if not PARSE_CACHE_ENABLED:
+        return None
+    return _read_payload(_cache_path(content_digest(content, name), cache_dir, kind, date_range))
+
+
+def parse_excel_payload(content, name, cache_dir=PARSE_CACHE_DIR, kind=FRAMES, date_range=None):
+    """Parse an upload and return the result pickled; runs in a report pool worker.
+
+    kind is FRAMES (parse_input) or AGGREGATES (stream_aggregates). The
+    pickle is the cache entry format, so results cross the process boundary
+    and land in the cache without being serialized twice.
+    """
+    if not PARSE_CACHE_ENABLED:
+        return pickle.dumps(_parse(content, name, kind, date_range), protocol=pickle.HIGHEST_PROTOCOL)
+
+    digest = content_digest(content, name)
+    path = _cache_path(digest, cache_dir, kind, date_range)
+    payload = _read_payload(path)
+    if payload is not None:
+        logger.debug(f"Parsed workbook cache hit: {name} ({digest[:12]})")
+        return payload
+
+    logger.debug(f"Parsed workbook cache miss: {name} ({digest[:12]})")
+    payload = pickle.dumps(_parse(content, name, kind, date_range), protocol=pickle.HIGHEST_PROTOCOL)
+    _store_quietly(path, payload, cache_dir)
+    return payload
@@ -5,11 +5,19 @@ from pptx.enum.chart import XL_CHART_TYPE, XL_LEGEND_POSITION, XL_TICK_LABEL_POS
 from pptx.dml.color import RGBColor
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR, MSO_AUTO_SIZE
 from pptx.enum.shapes import MSO_SHAPE
-from services.excel_parser import get_sentiment_counts, get_company_sentiment_counts
+from services.chart_factory import ChartFactory
+from services.chart_workbooks import ChartWorkbooks
+from services.asset_store import is_asset_embed
+from services.aggregations import author_counts, build_aggregates, facebook_engagement, mention_count, sentiment_by_company, sentiment_by_date_label, sentiment_by_day, sentiment_totals
+from services.image_optimizer import optimize_images
+from services.image_registry import ImageRegistry
+from services.pptx_stream import write_pptx
+from services.pptx_tables import add_frame_table, table_pages
+from services.slide_fragments import ShapeFragment
 import logging
 import pandas as pd
 import os
-from PIL import Image
+from config import CHART_WORKBOOK_MODE, IMAGE_OPTIMIZE, PPTX_RELEASE_PARTS
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +43,30 @@ METRIC_ICONS = {
     'Baxış sayı': '👁'
 }
 
+# Deck regions in build order, as reported to create_ppt's progress_callback
+REPORT_REGIONS = ['images', 'title', 'methodology', 'news', 'facebook', 'instagram', 'twitter', 'linkedin', 'posts', 'saving']
+
+# (header, column) of the metrics tables on slides 7 and 8, after the company column
+METRICS_TABLE_COLUMNS = [
+    ('Post sayı', 'post_count'),
+    ('Şərh sayı', 'comment_count'),
+    ('Bəyənmə sayı', 'like_count'),
+    ('Paylaşım sayı', 'share_count'),
+    ('Baxış sayı', 'view_count'),
+]
+# Data rows per slide; longer tables continue on extra slides
+METRICS_TABLE_ROWS_PER_SLIDE = 16
+
+# Largest (width, height) in inches each image is shown at; None leaves a side free.
+# The company logo is widest on the title slide, headers show it 0.4" high.
+IMAGE_DISPLAY_SIZES = {
+    'company_logo': (5, None),
+    'mediaeye_logo': (4.5, 4.5),
+    'neurotime_logo': (4, None),
+    'competitor_logo': (1.1, 0.5),
+    'post': (2.2, None),
+}
+
 CHARTS_ICONS = {
     'Sentiment Trend': '📉',
     'Sentiment Distribution': '📊',
@@ -66,8 +98,14 @@ def format_chart_axes(chart, category_font_size=6, value_font_size=6, rotation_a
             chart.value_axis.axis_title.text_frame.paragraphs[0].font.size = Pt(value_font_size)
         chart.value_axis.tick_labels.font.color.rgb = RGBColor(89, 89, 89)
         chart.value_axis.has_major_gridlines = False
-def add_slide_header(slide, company_logo_path, start_date, end_date, title, title_color=DEFAULT_COLOR, template_color=DEFAULT_COLOR):
-    """Helper function to add a consistent header to slides"""
+def header_title(title):
+    """Text of a slide header's title box"""
+    return f"📊 {title}"
+
+def add_slide_header(slide, company_logo_path, start_date, end_date, title, title_color=DEFAULT_COLOR, template_color=DEFAULT_COLOR, images=None):
+    """Helper function to add a consistent header to slides; images is the build's ImageRegistry"""
+    if images is None:
+        images = ImageRegistry(slide.part.package)
 
     # Set constants
     FULL_SLIDE_WIDTH_INCHES = 13.33
@@ -86,9 +124,9 @@ def add_slide_header(slide, company_logo_path, start_date, end_date, title, titl
     header.line.fill.background()  # Remove border
 
     # Add company logo (left-aligned within the header)
-    if os.path.exists(company_logo_path):
-        slide.shapes.add_picture(
-            company_logo_path,
+    if images.available(company_logo_path):
+        images.add_picture(
+            slide.shapes, company_logo_path,
             Inches(HEADER_LEFT_MARGIN + 0.2), Inches(0.2),
             height=Inches(0.4)
         )
@@ -101,7 +139,7 @@ def add_slide_header(slide, company_logo_path, start_date, end_date, title, titl
     tf = title_box.text_frame
     tf.clear()
     p = tf.paragraphs[0]
-    p.text = f"📊 {title}"
+    p.text = header_title(title)
     p.font.size = Pt(16)
     p.font.bold = True
     p.alignment = PP_ALIGN.CENTER
@@ -160,6 +198,18 @@ def add_side_line(slide, template_color=DEFAULT_COLOR):
     side_line.fill.fore_color.rgb = template_color
     side_line.line.fill.background()
     
+def capture_slide_header(slide, company_logo_path, start_date, end_date, title, title_color=DEFAULT_COLOR, template_color=DEFAULT_COLOR, images=None):
+    """Add the header and side line to slide and return them as a fragment.
+
+    Only the title differs between slides, so the other content slides get a
+    clone of this fragment: fragment.clone_into(slide, title=header_title(title)).
+    """
+    def build(slide):
+        add_slide_header(slide, company_logo_path, start_date, end_date, title, title_color, template_color, images=images)
+        add_side_line(slide, template_color)
+
+    return ShapeFragment.capture(slide, build, texts={'title': header_title(title)})
+
 # Function to apply consistent chart formatting
 def apply_chart_formatting(chart, use_legend=True, legend_position=XL_LEGEND_POSITION.TOP, 
                          category_font_size=6, value_font_size=6, 
@@ -222,28 +272,313 @@ def add_bg_box(slide, left, top, width, height, color=RGBColor(255, 255, 255)):
     bg_box.adjustments[0] = 0.01  # Adjust roundness if needed
     return bg_box
 
-def create_sentiment_line_chart(slide, x, y, cx, cy, chart_data, title, icon=CHARTS_ICONS['Sentiment Trend'], graph_color=DEFAULT_COLOR):
-    """Helper function to create a sentiment line chart."""
-    
-    add_bg_box(slide, x, y, cx, cy, color=CHART_BG_COLOR)
-
-    chart = slide.shapes.add_chart(
-        XL_CHART_TYPE.LINE, x, y, cx, cy, chart_data
-    ).chart
-
+def style_sentiment_line(chart, title, icon=CHARTS_ICONS['Sentiment Trend'], graph_color=DEFAULT_COLOR):
+    """Preset styling of the sentiment-over-time line charts"""
     chart.has_legend = True
     chart.legend.position = XL_LEGEND_POSITION.TOP
     chart.legend.font.size = Pt(12)
 
     apply_chart_formatting(chart, title=title, icon=icon, graph_color=graph_color)
-    
+
     for i, series in enumerate(chart.series):
         series.format.line.color.rgb = SENTIMENT_COLORS[list(SENTIMENT_COLORS.keys())[i]]
         series.format.line.width = Pt(2)
-        
-    return chart
 
-def create_sentiment_donut_chart(slide, x, y, cx, cy, sentiment_counts, graph_color = DEFAULT_COLOR, title = f"{CHARTS_ICONS['Time Distribution']} Bank postlarının sentiment bölgüsü"):
+def style_sentiment_donut(chart, title, graph_color=DEFAULT_COLOR):
+    """Preset styling of the sentiment donuts; data labels depend on the values and are added per chart"""
+    chart.has_legend = True
+    chart.legend.position = XL_LEGEND_POSITION.TOP
+    chart.legend.font.size = Pt(12)
+
+    chart.has_title = True
+    chart.chart_title.text_frame.text = title
+    chart.chart_title.text_frame.paragraphs[0].font.size = Pt(14)
+    chart.chart_title.text_frame.paragraphs[0].font.bold = False
+    chart.chart_title.text_frame.paragraphs[0].font.color.rgb = graph_color
+
+    chart.chart_style = 2  # White background
+
+    for i, point in enumerate(chart.series[0].points):
+        point.format.fill.solid()
+        point.format.fill.fore_color.rgb = SENTIMENT_COLORS[list(SENTIMENT_COLORS.keys())[i]]
+
+def style_company_overview(chart, graph_color=DEFAULT_COLOR):
+    """Preset styling of the news mentions per company chart on slide 4"""
+    # Configure legend
+    chart.has_legend = True
+    chart.legend.position = XL_LEGEND_POSITION.TOP
+    chart.legend.include_in_layout = True
+    chart.legend.font.size = Pt(12)
+    chart.legend.font.bold = False
+
+    # Set chart title with icon
+    chart.has_title = True
+    chart.chart_title.text_frame.text = "📊 Post saylarına görə bankların bölgüsü"
+    chart.chart_title.text_frame.paragraphs[0].font.size = Pt(14)
+    chart.chart_title.text_frame.paragraphs[0].font.bold = False
+    chart.chart_title.text_frame.paragraphs[0].font.color.rgb = graph_color
+    # Set white background for chart
+    chart.chart_style = 2  # White background style
+
+    # Apply fill to plot area if available and remove gridlines
+    try:
+        if hasattr(chart, 'plot_area'):
+            chart.plot_area.format.fill.solid()
+            chart.plot_area.format.fill.fore_color.rgb = RGBColor(255, 255, 255)
+
+        # Remove all gridlines
+        # Remove major and minor gridlines from the plot
+        chart.plots[0].has_major_gridlines = False
+        chart.plots[0].has_minor_gridlines = False
+
+        # Also remove gridlines from both axes
+        if hasattr(chart, 'category_axis') and chart.category_axis:
+            chart.category_axis.has_major_gridlines = False
+            chart.category_axis.has_minor_gridlines = False
+
+        if hasattr(chart, 'value_axis') and chart.value_axis:
+            chart.value_axis.has_major_gridlines = False
+            chart.value_axis.has_minor_gridlines = False
+
+        # Remove axis lines
+        chart.category_axis.format.line.fill.background()
+        chart.value_axis.format.line.fill.background()
+    except Exception as e:
+        logger.warning(f"Could not set plot area formatting: {e}")
+
+    # Set diagonal labels for x-axis
+    if hasattr(chart, 'category_axis'):
+        chart.category_axis.tick_label_position = XL_TICK_LABEL_POSITION.LOW
+        chart.category_axis.text_rotation = 90
+
+    # Set axis titles and labels
+    if hasattr(chart, 'category_axis'):
+        chart.category_axis.tick_labels.font.size = Pt(7)
+        if hasattr(chart.category_axis, 'axis_title') and chart.category_axis.axis_title:
+            chart.category_axis.axis_title.text_frame.paragraphs[0].font.size = Pt(8)
+    if hasattr(chart, 'value_axis'):
+        chart.value_axis.tick_labels.font.size = Pt(7)
+        if hasattr(chart.value_axis, 'axis_title') and chart.value_axis.axis_title:
+            chart.value_axis.axis_title.text_frame.paragraphs[0].font.size = Pt(8)
+
+    # Set colors for bar chart
+    for i, series in enumerate(chart.series):
+        series.format.fill.solid()
+        series.format.fill.fore_color.rgb = SENTIMENT_COLORS[list(SENTIMENT_COLORS.keys())[i]]
+        # Add data labels to outside end
+        series.has_data_labels = True
+        data_labels = series.data_labels
+        data_labels.position = XL_DATA_LABEL_POSITION.OUTSIDE_END
+        data_labels.font.size = Pt(10)
+        data_labels.font.color.rgb = RGBColor(0, 0, 0)  # Black text
+        data_labels.font.bold = True
+        data_labels.number_format = '0'  # Show whole numbers only
+
+def style_author_bar(chart):
+    """Preset styling of the horizontal mentions per site chart on slide 5"""
+    # Remove legend
+    chart.has_legend = False
+    chart.has_title = False
+
+    # Set white background for chart area and plot area
+    try:
+        # Chart area background
+        chart.chart_area.fill.solid()
+        chart.chart_area.fill.fore_color.rgb = RGBColor(255, 255, 255)
+
+        # Plot area background - solid white fill
+        try:
+            chart.plot_area.format.fill.solid()
+            chart.plot_area.format.fill.fore_color.rgb = RGBColor(255, 255, 255)
+        except Exception as e:
+            logger.warning(f"Could not set plot area fill color: {e}")
+
+    except Exception as e:
+        logger.warning(f"Could not set chart background: {e}")
+
+    # Remove all gridlines
+    try:
+        # Remove major and minor gridlines from the plot
+        chart.plots[0].has_major_gridlines = False
+        chart.plots[0].has_minor_gridlines = False
+
+        # Also remove gridlines from both axes
+        if hasattr(chart, 'category_axis') and chart.category_axis:
+            chart.category_axis.has_major_gridlines = False
+            chart.category_axis.has_minor_gridlines = False
+
+        if hasattr(chart, 'value_axis') and chart.value_axis:
+            chart.value_axis.has_major_gridlines = False
+            chart.value_axis.has_minor_gridlines = False
+
+    except Exception as e:
+        logger.warning(f"Could not remove gridlines: {e}")
+
+    # Configure category axis (Y-axis for horizontal bar chart) - keep only this axis
+    try:
+        if hasattr(chart, 'category_axis') and chart.category_axis:
+            chart.category_axis.tick_labels.font.size = Pt(9)
+            chart.category_axis.tick_label_position = XL_TICK_LABEL_POSITION.LOW  # Keep Y-axis labels on left
+            # Remove axis title
+            chart.category_axis.has_title = False
+            # Keep the axis line visible
+            chart.category_axis.format.line.color.rgb = RGBColor(0, 0, 0)  # Black axis line
+    except Exception as e:
+        logger.warning(f"Could not configure category axis: {e}")
+
+    # Remove/hide value axis (X-axis for horizontal bar chart)
+    try:
+        if hasattr(chart, 'value_axis') and chart.value_axis:
+            # Hide the axis completely
+            chart.value_axis.visible = False
+            # Alternative: make axis line transparent
+            chart.value_axis.format.line.fill.background()
+            # Remove axis title
+            chart.value_axis.has_title = False
+            # Hide tick labels
+            chart.value_axis.tick_labels.font.size = Pt(1)
+            chart.value_axis.tick_labels.font.color.rgb = RGBColor(255, 255, 255)  # Make invisible
+    except Exception as e:
+        logger.warning(f"Could not configure value axis: {e}")
+
+    # Format bars and add data labels
+    try:
+        for series in chart.series:
+            # Set bar color
+            series.format.fill.solid()
+            series.format.fill.fore_color.rgb = RGBColor(160, 208, 255)  # Blue color
+
+            # Make bars thick but add space between them
+            series.format.gap_width = 40  # Thick bars with some spacing
+
+            # Remove line around bars to prevent errors
+            series.format.line.fill.background()
+
+            # Add data labels to outside end
+            series.has_data_labels = True
+            data_labels = series.data_labels
+            data_labels.position = XL_DATA_LABEL_POSITION.OUTSIDE_END
+            data_labels.font.size = Pt(10)
+            data_labels.font.color.rgb = RGBColor(0, 0, 0)  # Black text
+            data_labels.font.bold = True
+            data_labels.number_format = '0'  # Show whole numbers only
+
+    except Exception as e:
+        logger.warning(f"Could not format series or data labels: {e}")
+
+    # Additional formatting for bars spacing
+    try:
+        # Access the plot area and modify bar thickness
+        plot = chart.plots[0]
+        plot.gap_width = 40  # Set plot-level gap width for spacing
+    except Exception as e:
+        logger.warning(f"Could not set plot formatting: {e}")
+
+    # Remove chart title if it exists
+    try:
+        if chart.has_title:
+            chart.chart_title.text_frame.text = ''
+            chart.chart_title.include_in_layout = False
+    except Exception as e:
+        logger.warning(f"Could not remove chart title: {e}")
+
+def style_company_multibar(chart, title, graph_color=DEFAULT_COLOR, data_labels=False):
+    """Preset styling of the sentiment per company column charts; data_labels adds grey labels above the bars"""
+    chart.has_legend = True
+    if data_labels:
+        chart.has_data_labels = True
+    chart.legend.position = XL_LEGEND_POSITION.TOP
+    chart.legend.font.size = Pt(12)
+
+    # Set chart background and formatting
+    apply_chart_formatting(chart, title=title, graph_color=graph_color)
+    apply_sentiment_colors(chart)
+
+    if data_labels:
+        # Add data labels at outside end with size 10
+        for series in chart.series:
+            series.has_data_labels = True
+            labels = series.data_labels
+            labels.position = XL_DATA_LABEL_POSITION.OUTSIDE_END
+            labels.font.size = Pt(10)
+            labels.font.bold = False
+            labels.font.color.rgb = RGBColor(89, 89, 89)
+
+def style_day_multibar(chart, title, icon=CHARTS_ICONS['Sentiment Trend'], graph_color=DEFAULT_COLOR):
+    """Preset styling of the labelled sentiment per day column chart"""
+    chart.has_legend = True
+    chart.legend.position = XL_LEGEND_POSITION.TOP
+    chart.legend.font.size = Pt(12)
+    chart.has_title = True
+    chart.chart_title.text_frame.text = f"{icon} {title}"
+    chart.chart_title.text_frame.paragraphs[0].font.size = Pt(14)
+    chart.chart_title.text_frame.paragraphs[0].font.bold = False
+    chart.chart_title.text_frame.paragraphs[0].font.color.rgb = graph_color
+
+    # Set chart background and formatting
+    apply_chart_formatting(chart, title=title, icon=icon, graph_color=graph_color)
+    for i, series in enumerate(chart.series):
+        series.format.fill.solid()
+        series.format.fill.fore_color.rgb = SENTIMENT_COLORS[list(SENTIMENT_COLORS.keys())[i]]
+        series.has_data_labels = True
+        series.data_labels.font.size = Pt(10)
+        series.data_labels.font.bold = True
+        series.data_labels.position = XL_DATA_LABEL_POSITION.OUTSIDE_END
+
+def style_stacked_day_bar(chart, title, graph_color=DEFAULT_COLOR, data_labels=False):
+    """Preset styling of the stacked sentiment per day charts; data_labels adds white labels inside the stacks"""
+    # Configure chart appearance
+    chart.has_legend = True
+    if data_labels:
+        chart.has_data_labels = True
+    chart.legend.position = XL_LEGEND_POSITION.TOP
+    chart.legend.font.size = Pt(12)
+
+    # Apply custom formatting and sentiment colors
+    try:
+        apply_chart_formatting(chart, title=title, graph_color=graph_color)
+        apply_sentiment_colors(chart)
+    except Exception as e:
+        print(f"Error applying chart formatting: {e}")
+
+    if data_labels:
+        # Add data labels at center with size 10
+        try:
+            for series in chart.series:
+                series.has_data_labels = True
+                labels = series.data_labels
+                labels.position = XL_DATA_LABEL_POSITION.CENTER
+                labels.font.size = Pt(10)
+                labels.font.bold = False
+                labels.font.color.rgb = RGBColor(255, 255, 255)  # White text for better visibility on colored background
+        except Exception as e:
+            print(f"Error setting data labels: {e}")
+
+# Named chart presets: (chart type, style function). Each preset's styled chart
+# XML is built once per process and style; charts only substitute their data.
+CHART_PRESETS = {
+    'sentiment_line': (XL_CHART_TYPE.LINE, style_sentiment_line),
+    'sentiment_donut': (XL_CHART_TYPE.DOUGHNUT, style_sentiment_donut),
+    'company_overview': (XL_CHART_TYPE.COLUMN_CLUSTERED, style_company_overview),
+    'company_multibar': (XL_CHART_TYPE.COLUMN_CLUSTERED, style_company_multibar),
+    'author_bar': (XL_CHART_TYPE.BAR_CLUSTERED, style_author_bar),
+    'day_multibar': (XL_CHART_TYPE.COLUMN_CLUSTERED, style_day_multibar),
+    'stacked_day_bar': (XL_CHART_TYPE.COLUMN_STACKED, style_stacked_day_bar),
+}
+
+# Presets whose style function colours individual points
+POINT_STYLED_PRESETS = {'sentiment_donut'}
+
+CHART_FACTORY = ChartFactory(CHART_PRESETS, point_styled=POINT_STYLED_PRESETS)
+
+def create_sentiment_line_chart(slide, x, y, cx, cy, chart_data, title, icon=CHARTS_ICONS['Sentiment Trend'], graph_color=DEFAULT_COLOR, workbooks=None):
+    """Helper function to create a sentiment line chart."""
+    
+    add_bg_box(slide, x, y, cx, cy, color=CHART_BG_COLOR)
+
+    return CHART_FACTORY.add_chart(slide.shapes, 'sentiment_line', x, y, cx, cy, chart_data, workbooks=workbooks, title=title, icon=icon, graph_color=graph_color)
+
+def create_sentiment_donut_chart(slide, x, y, cx, cy, sentiment_counts, graph_color = DEFAULT_COLOR, title = f"{CHARTS_ICONS['Time Distribution']} Bank postlarının sentiment bölgüsü", workbooks=None):
     """Helper function to create a sentiment donut chart."""
     
     add_bg_box(slide, x, y, cx, cy, color=CHART_BG_COLOR)
@@ -259,29 +594,13 @@ def create_sentiment_donut_chart(slide, x, y, cx, cy, sentiment_counts, graph_co
     
     donut_data.add_series('', values)
 
-    donut = slide.shapes.add_chart(
-        XL_CHART_TYPE.DOUGHNUT, x, y, cx, cy, donut_data
-    ).chart
-
-    donut.has_legend = True
-    donut.legend.position = XL_LEGEND_POSITION.TOP
-    donut.legend.font.size = Pt(12)
-
-    donut.has_title = True
-    donut.chart_title.text_frame.text = title
-    donut.chart_title.text_frame.paragraphs[0].font.size = Pt(14)
-    donut.chart_title.text_frame.paragraphs[0].font.bold = False
-    donut.chart_title.text_frame.paragraphs[0].font.color.rgb = graph_color
-
-    donut.chart_style = 2  # White background
+    donut = CHART_FACTORY.add_chart(slide.shapes, 'sentiment_donut', x, y, cx, cy, donut_data, workbooks=workbooks, title=title, graph_color=graph_color)
 
     total = sum(values)
 
+    # Labels depend on the values, so they go on top of the preset's point fills
     for i, point in enumerate(donut.series[0].points):
         current_value = values[i]
-    
-        point.format.fill.solid()
-        point.format.fill.fore_color.rgb = SENTIMENT_COLORS[list(SENTIMENT_COLORS.keys())[i]]
 
         if current_value == 0:
             point.has_data_label = False
@@ -300,6 +619,48 @@ def create_sentiment_donut_chart(slide, x, y, cx, cy, sentiment_counts, graph_co
     
     return donut
 
+def image_available(image):
+    """Whether an image argument (file path or file-like object) can be embedded"""
+    if image is None:
+        return False
+    if isinstance(image, (str, os.PathLike)):
+        return os.path.exists(image)
+    return True
+
+def optimize_report_images(company_logo_path, mediaeye_logo_path, neurotime_logo_path, competitor_logo_paths, positive_posts, negative_posts):
+    """Downsample create_ppt's images to their display sizes.
+
+    Returns the image arguments in the same shape, with each shown image
+    replaced by its optimized copy, and the optimizer's byte stats.
+    """
+    competitor_logo_paths = list(competitor_logo_paths or [])
+    positive_posts = list(positive_posts or [])
+    negative_posts = list(negative_posts or [])
+    # Only the first 25 competitor logos and 3 posts per group make it onto the slides
+    shown_posts = positive_posts[:3] + negative_posts[:3]
+    images = [
+        (company_logo_path, IMAGE_DISPLAY_SIZES['company_logo']),
+        (mediaeye_logo_path, IMAGE_DISPLAY_SIZES['mediaeye_logo']),
+        (neurotime_logo_path, IMAGE_DISPLAY_SIZES['neurotime_logo']),
+    ]
+    images += [(logo_path, IMAGE_DISPLAY_SIZES['competitor_logo']) for logo_path in competitor_logo_paths[:25]]
+    images += [(post["image_path"], IMAGE_DISPLAY_SIZES['post']) for post in shown_posts]
+
+    # Asset embeds were already downsampled when they were stored
+    optimizable = [image_available(image) and not is_asset_embed(image) for image, _ in images]
+    optimized, stats = optimize_images([pair for pair, ok in zip(images, optimizable) if ok])
+    results = iter(optimized)
+    images = [next(results) if ok else image for (image, _), ok in zip(images, optimizable)]
+
+    logos = images[3:3 + len(competitor_logo_paths[:25])] + competitor_logo_paths[25:]
+    post_images = images[3 + len(competitor_logo_paths[:25]):]
+    posts = [{**post, "image_path": image} for post, image in zip(shown_posts, post_images)]
+    shown_positive = len(positive_posts[:3])
+    return (
+        images[0], images[1], images[2], logos,
+        posts[:shown_positive] + positive_posts[3:], posts[shown_positive:] + negative_posts[3:],
+    ), stats
+
 def hex_to_rgbcolor(hex_color):
     if isinstance(hex_color, str) and hex_color.startswith("#") and len(hex_color) == 7:
         r = int(hex_color[1:3], 16)
@@ -308,7 +669,13 @@ def hex_to_rgbcolor(hex_color):
         return RGBColor(r, g, b)
     return hex_color
 
-def create_ppt(data_frames, output_path, start_date, end_date, company_name, company_logo_path, mediaeye_logo_path, neurotime_logo_path, competitor_logo_paths=None, positive_links=None, negative_links=None, positive_posts=None, negative_posts=None, has_competitors=True, template_color=None, title_color=None, graph_color=None):
+def create_ppt(data_frames, output_path, start_date, end_date, company_name, company_logo_path, mediaeye_logo_path, neurotime_logo_path, competitor_logo_paths=None, positive_links=None, negative_links=None, positive_posts=None, negative_posts=None, has_competitors=True, template_color=None, title_color=None, graph_color=None, progress_callback=None, aggregates=None, chart_workbook_mode=CHART_WORKBOOK_MODE):
+    def report_progress(region):
+        # Let callers (job status, benchmarks) follow the build region by region
+        logger.debug(f"Building region: {region}")
+        if progress_callback is not None:
+            progress_callback(region)
+
     try:
         logger.debug("Creating PowerPoint presentation")
         logger.debug("TEMPLATE COLOR: %s", template_color)
@@ -334,8 +701,69 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
         else:
             graph_color = DEFAULT_COLOR
 
+        # Every picture of this build reads its image through one registry
+        images = ImageRegistry(prs.part.package)
+        # Embedded workbook behind every chart, written per chart_workbook_mode
+        workbooks = ChartWorkbooks(prs.part.package, chart_workbook_mode)
+
+        # The header and side line are built on the first content slide and
+        # cloned onto the others with their own title
+        header_fragment = None
+
+        def add_header(slide, title):
+            nonlocal header_fragment
+            if header_fragment is None:
+                header_fragment = capture_slide_header(slide, company_logo_path, start_date, end_date, title, title_color, template_color, images=images)
+            else:
+                header_fragment.clone_into(slide, title=header_title(title))
+
+        def add_content_slide(title):
+            """Blank content slide with the header, side line and background"""
+            slide = prs.slides.add_slide(prs.slide_layouts[5])
+            for shape in slide.shapes:
+                if shape.has_text_frame:
+                    sp = shape._element
+                    sp.getparent().remove(sp)
+            add_header(slide, title)
+            fill = slide.background.fill
+            fill.solid()
+            fill.fore_color.rgb = SLIDE_BG_COLOR
+            return slide
+
+        def add_metrics_table(slide, title, grouped_data, name_column):
+            """Per-company metrics table, continued on extra slides when it has too many rows"""
+            # Table is 12.33" wide, 0.5" from each side, below the header
+            columns = [('Banklar ', name_column, Inches(3))] + [(header, column, Inches(1.866)) for header, column in METRICS_TABLE_COLUMNS]
+            style = {'header_fill': template_color}
+            for page, (first_row, rows) in enumerate(table_pages(grouped_data, METRICS_TABLE_ROWS_PER_SLIDE)):
+                if page:
+                    slide = add_content_slide(title)
+                add_frame_table(slide.shapes, rows, columns, Inches(0.5), Inches(1), Inches(5), style, first_row)
+
+        # Downsample and re-encode every image to the size it is shown at
+        report_progress('images')
+        image_stats = None
+        if IMAGE_OPTIMIZE:
+            (company_logo_path, mediaeye_logo_path, neurotime_logo_path, competitor_logo_paths,
+             positive_posts, negative_posts), image_stats = optimize_report_images(
+                company_logo_path, mediaeye_logo_path, neurotime_logo_path, competitor_logo_paths, positive_posts, negative_posts
+            )
+            logger.info(
+                f"Optimized {image_stats['optimized']} of {image_stats['images']} images: "
+                f"{image_stats['bytes_in']} -> {image_stats['bytes_out']} bytes ({image_stats['bytes_saved']} saved)"
+            )
+
+        # Slides read combined_sources through these count tables; streamed
+        # ingestion passes them in without the raw sheets
+        if aggregates is None:
+            aggregates = build_aggregates(data_frames)
+        combined_sources = aggregates['sources']
+        # Every sentiment chart slices this one (source, company, day, sentiment) count table
+        sentiment_cube = aggregates['sentiment']
+
         
         # region  First slide - Title slide with logos and text
+        report_progress('title')
         logger.debug("Creating title slide")
         title_slide = prs.slides.add_slide(prs.slide_layouts[5])  # Blank layout
 
@@ -368,8 +796,8 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
         LEFT_MARGIN = LEFT_HALF_CENTER - LEFT_CONTENT_WIDTH / 2
 
         # NeuroTime logo (top left half)
-        if os.path.exists(neurotime_logo_path):
-            title_slide.shapes.add_picture(neurotime_logo_path, LEFT_MARGIN, top, width=Inches(4))
+        if images.available(neurotime_logo_path):
+            images.add_picture(title_slide.shapes, neurotime_logo_path, LEFT_MARGIN, top, width=Inches(4))
             top += Inches(1.5)
 
         # Main Title
@@ -431,11 +859,11 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
 
         # --- RIGHT Side Company Logo ---
 
-        if os.path.exists(company_logo_path):
+        if images.available(company_logo_path):
             logo_top = Inches(2.5)
             right_logo_left = RIGHT_HALF_CENTER - LOGO_WIDTH / 2
-            title_slide.shapes.add_picture(
-                company_logo_path,
+            images.add_picture(
+                title_slide.shapes, company_logo_path,
                 right_logo_left, logo_top,
                 width=LOGO_WIDTH
             )
@@ -443,6 +871,7 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
         # endregion
 
         # region Second slide - Methodology description
+        report_progress('methodology')
         logger.debug("Creating methodology slide")
         method_slide = prs.slides.add_slide(prs.slide_layouts[5])
 
@@ -472,34 +901,33 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
         p.font.color.rgb = RGBColor(0, 123, 191)
 
         # --- NeuroTime logo (top-right corner) ---
-        if os.path.exists(neurotime_logo_path):
-            method_slide.shapes.add_picture(
-                neurotime_logo_path,
+        if images.available(neurotime_logo_path):
+            images.add_picture(
+                method_slide.shapes, neurotime_logo_path,
                 SLIDE_WIDTH - Inches(1.5), Inches(0.3),
                 width=Inches(1.2)
             )
 
         # --- MediaEye logo (centered in left half) ---
-        if os.path.exists(mediaeye_logo_path):
+        if images.available(mediaeye_logo_path):
             max_logo_width = Inches(4.5)
             max_logo_height = Inches(4.5)
 
-            with Image.open(mediaeye_logo_path) as img:
-                width, height = img.size
-                aspect_ratio = width / height
+            width, height = images.size(mediaeye_logo_path)
+            aspect_ratio = width / height
 
-                if aspect_ratio > 1:  # Wider than tall
-                    display_width = max_logo_width
-                    display_height = max_logo_width / aspect_ratio
-                else:
-                    display_height = max_logo_height
-                    display_width = max_logo_height * aspect_ratio
+            if aspect_ratio > 1:  # Wider than tall
+                display_width = max_logo_width
+                display_height = max_logo_width / aspect_ratio
+            else:
+                display_height = max_logo_height
+                display_width = max_logo_height * aspect_ratio
 
             logo_left = (HALF_WIDTH - display_width) / 2
             logo_top = (SLIDE_HEIGHT - display_height) / 2
 
-            method_slide.shapes.add_picture(
-                mediaeye_logo_path,
+            images.add_picture(
+                method_slide.shapes, mediaeye_logo_path,
                 logo_left, logo_top,
                 width=display_width,
                 height=display_height
@@ -522,25 +950,24 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
             grid_top_start = (SLIDE_HEIGHT - grid_height) / 2
 
             for i, logo_path in enumerate(competitor_logo_paths[:max_logos]):
-                if os.path.exists(logo_path):
+                if images.available(logo_path):
                     row = i // logos_per_row
                     col = i % logos_per_row
                     left = grid_left_start + col * (max_logo_width + spacing)
                     top = grid_top_start + row * (max_logo_height + spacing)
 
-                    with Image.open(logo_path) as img:
-                        width, height = img.size
-                        aspect_ratio = width / height
+                    width, height = images.size(logo_path)
+                    aspect_ratio = width / height
 
-                        if aspect_ratio > 1:
-                            display_width = max_logo_width
-                            display_height = max_logo_width / aspect_ratio
-                        else:
-                            display_height = max_logo_height
-                            display_width = max_logo_height * aspect_ratio
+                    if aspect_ratio > 1:
+                        display_width = max_logo_width
+                        display_height = max_logo_width / aspect_ratio
+                    else:
+                        display_height = max_logo_height
+                        display_width = max_logo_height * aspect_ratio
 
-                    method_slide.shapes.add_picture(
-                        logo_path,
+                    images.add_picture(
+                        method_slide.shapes, logo_path,
                         left + (max_logo_width - display_width) / 2,
                         top + (max_logo_height - display_height) / 2,
                         width=display_width,
@@ -549,6 +976,7 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
         # endregion
 
         # region Third slide - Grid layout with links and charts
+        report_progress('news')
         logger.debug("Creating third slide with grid layout")
         slide3 = prs.slides.add_slide(prs.slide_layouts[5])
 
@@ -558,8 +986,7 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                 sp = shape._element
                 sp.getparent().remove(sp)
 
-        add_slide_header(slide3, company_logo_path, start_date, end_date, "XƏBƏRLƏRİN ANALİZİ", title_color, template_color)
-        add_side_line(slide3, template_color)
+        add_header(slide3, "XƏBƏRLƏRİN ANALİZİ")
 
         # Set slide background
         background = slide3.background
@@ -672,21 +1099,14 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
 
         # Get data from combined_sources
         logger.debug("Processing combined sources data")
-        if 'combined_sources' not in data_frames:
+        if 'combined_sources' not in data_frames and not combined_sources:
             raise ValueError("combined_sources Excel file is missing")
 
-        if 'News' not in data_frames['combined_sources']:
+        if 'News' not in combined_sources:
             raise ValueError("News sheet is missing in combined_sources Excel file")
 
-        combined_data = data_frames['combined_sources']['News']
-        combined_data['Day'] = pd.to_datetime(combined_data['Day'])
-        if has_competitors:
-            company_data = combined_data[combined_data['Company'] == company_name]
-        else:
-            company_data = combined_data
-        sentiment_data = company_data.groupby(['Day', 'Sentiment']).size().unstack(fill_value=0)
-        sentiment_data = sentiment_data.sort_index()
-        sentiment_counts = get_sentiment_counts(combined_data)
+        sentiment_data = sentiment_by_day(sentiment_cube, 'News', company_name if has_competitors else None)
+        sentiment_counts = sentiment_totals(sentiment_cube, 'News')
 
         # Create multiline chart (bottom left) - wider
         logger.debug("Creating multiline chart")
@@ -701,13 +1121,13 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
         left, top = multiline_chart_x, bottom_row_y
         x, y, cx, cy = left, top, multiline_chart_width, bottom_section_height
 
-        create_sentiment_line_chart(slide3, x, y, cx, cy, chart_data, title="Xəbərlərin sentiment və zamana görə bölgüsü", graph_color=graph_color)
+        create_sentiment_line_chart(slide3, x, y, cx, cy, chart_data, title="Xəbərlərin sentiment və zamana görə bölgüsü", graph_color=graph_color, workbooks=workbooks)
 
         # Create donut chart (bottom right) - narrower and centered
         logger.debug("Creating donut chart")
         left, top = donut_chart_x, bottom_row_y
         x, y, cx, cy = left, top, donut_chart_width, bottom_section_height
-        create_sentiment_donut_chart(slide3, x, y, cx, cy, sentiment_counts, graph_color=graph_color)
+        create_sentiment_donut_chart(slide3, x, y, cx, cy, sentiment_counts, graph_color=graph_color, workbooks=workbooks)
         # endregion
 
         # region Fourth slide - Vertical multibar chart
@@ -720,8 +1140,7 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                     sp = shape._element
                     sp.getparent().remove(sp)
 
-            add_slide_header(slide4, company_logo_path, start_date, end_date, "XƏBƏRLƏRİN ANALİZİ", title_color, template_color)
-            add_side_line(slide4, template_color)
+            add_header(slide4, "XƏBƏRLƏRİN ANALİZİ")
 
             # Set slide background
             background = slide4.background
@@ -730,7 +1149,7 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
             fill.fore_color.rgb = SLIDE_BG_COLOR
             
             # Get company sentiment data and sort it by total values
-            company_sentiments = get_company_sentiment_counts(combined_data)
+            company_sentiments = sentiment_by_company(sentiment_cube, 'News')
             # Calculate total posts for each company
             totals = company_sentiments.sum(axis=1)
             # Sort the sentiment data based on totals
@@ -755,77 +1174,7 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
             cy = Inches(5)   # Chart height
 
             bg_box = add_bg_box(slide4, x, y, cx, cy, color=CHART_BG_COLOR)
-            chart = slide4.shapes.add_chart(XL_CHART_TYPE.COLUMN_CLUSTERED, x, y, cx, cy, chart_data).chart
-            
-            # Configure legend
-            chart.has_legend = True
-            chart.legend.position = XL_LEGEND_POSITION.TOP
-            chart.legend.include_in_layout = True
-            chart.legend.font.size = Pt(12)
-            chart.legend.font.bold = False
-            
-            # Set chart title with icon
-            chart.has_title = True
-            chart.chart_title.text_frame.text = "📊 Post saylarına görə bankların bölgüsü"
-            chart.chart_title.text_frame.paragraphs[0].font.size = Pt(14)
-            chart.chart_title.text_frame.paragraphs[0].font.bold = False
-            chart.chart_title.text_frame.paragraphs[0].font.color.rgb = graph_color
-            # Set white background for chart
-            chart.chart_style = 2  # White background style
-            
-            # Apply fill to plot area if available and remove gridlines
-            try:
-                if hasattr(chart, 'plot_area'):
-                    chart.plot_area.format.fill.solid()
-                    chart.plot_area.format.fill.fore_color.rgb = RGBColor(255, 255, 255)
-                    
-                # Remove all gridlines
-                # Remove major and minor gridlines from the plot
-                chart.plots[0].has_major_gridlines = False
-                chart.plots[0].has_minor_gridlines = False
-                
-                # Also remove gridlines from both axes
-                if hasattr(chart, 'category_axis') and chart.category_axis:
-                    chart.category_axis.has_major_gridlines = False
-                    chart.category_axis.has_minor_gridlines = False
-                
-                if hasattr(chart, 'value_axis') and chart.value_axis:
-                    chart.value_axis.has_major_gridlines = False
-                    chart.value_axis.has_minor_gridlines = False
-                
-                # Remove axis lines
-                chart.category_axis.format.line.fill.background()
-                chart.value_axis.format.line.fill.background()
-            except Exception as e:
-                logger.warning(f"Could not set plot area formatting: {e}")
-            
-            # Set diagonal labels for x-axis
-            if hasattr(chart, 'category_axis'):
-                chart.category_axis.tick_label_position = XL_TICK_LABEL_POSITION.LOW
-                chart.category_axis.text_rotation = 90
-            
-            # Set axis titles and labels
-            if hasattr(chart, 'category_axis'):
-                chart.category_axis.tick_labels.font.size = Pt(7)
-                if hasattr(chart.category_axis, 'axis_title') and chart.category_axis.axis_title:
-                    chart.category_axis.axis_title.text_frame.paragraphs[0].font.size = Pt(8)
-            if hasattr(chart, 'value_axis'):
-                chart.value_axis.tick_labels.font.size = Pt(7)
-                if hasattr(chart.value_axis, 'axis_title') and chart.value_axis.axis_title:
-                    chart.value_axis.axis_title.text_frame.paragraphs[0].font.size = Pt(8)
-            
-            # Set colors for bar chart
-            for i, series in enumerate(chart.series):
-                series.format.fill.solid()
-                series.format.fill.fore_color.rgb = SENTIMENT_COLORS[list(SENTIMENT_COLORS.keys())[i]]
-                # Add data labels to outside end
-                series.has_data_labels = True
-                data_labels = series.data_labels
-                data_labels.position = XL_DATA_LABEL_POSITION.OUTSIDE_END
-                data_labels.font.size = Pt(10)
-                data_labels.font.color.rgb = RGBColor(0, 0, 0)  # Black text
-                data_labels.font.bold = True
-                data_labels.number_format = '0'  # Show whole numbers only
+            chart = CHART_FACTORY.add_chart(slide4.shapes, 'company_overview', x, y, cx, cy, chart_data, workbooks=workbooks, graph_color=graph_color)
         # endregion
 
         # region Fifth slide - Author count horizontal bar chart
@@ -837,8 +1186,7 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                 sp = shape._element
                 sp.getparent().remove(sp)
 
-        add_slide_header(slide5, company_logo_path, start_date, end_date, "Xəbər saylarının saytlar üzərindən bölgüsü", title_color, template_color)
-        add_side_line(slide5, template_color)
+        add_header(slide5, "Xəbər saylarının saytlar üzərindən bölgüsü")
 
         # Set slide background
         background = slide5.background
@@ -849,10 +1197,10 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
         # Filter and group data by author
         if has_competitors:
             # Filter by company, then group by Author
-            author_data = combined_data[combined_data['Company'] == company_name].groupby('Author').size().sort_values(ascending=True)
+            author_data = author_counts(aggregates, company_name).sort_values(ascending=True)
         else:
             # Group by Author for all companies
-            author_data = combined_data.groupby('Author').size().sort_values(ascending=True)
+            author_data = author_counts(aggregates).sort_values(ascending=True)
         author_data = author_data.tail(20)
         # Ensure we have data to prevent errors
         if len(author_data) == 0:
@@ -876,117 +1224,12 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
             y = Inches(1.15)
             
             bg_box = add_bg_box(slide5, x, y, chart_width, chart_height, color=CHART_BG_COLOR)
-            chart = slide5.shapes.add_chart(XL_CHART_TYPE.BAR_CLUSTERED, x, y, chart_width, chart_height, chart_data).chart
-            
-            # Remove legend
-            chart.has_legend = False
-            chart.has_title = False
-            
-            # Set white background for chart area and plot area
-            try:
-                # Chart area background
-                chart.chart_area.fill.solid()
-                chart.chart_area.fill.fore_color.rgb = RGBColor(255, 255, 255)
-                
-                # Plot area background - solid white fill
-                try:
-                    chart.plot_area.format.fill.solid()
-                    chart.plot_area.format.fill.fore_color.rgb = RGBColor(255, 255, 255)
-                except Exception as e:
-                    logger.warning(f"Could not set plot area fill color: {e}")
-
-            except Exception as e:
-                logger.warning(f"Could not set chart background: {e}")
-            
-            # Remove all gridlines
-            try:
-                # Remove major and minor gridlines from the plot
-                chart.plots[0].has_major_gridlines = False
-                chart.plots[0].has_minor_gridlines = False
-                
-                # Also remove gridlines from both axes
-                if hasattr(chart, 'category_axis') and chart.category_axis:
-                    chart.category_axis.has_major_gridlines = False
-                    chart.category_axis.has_minor_gridlines = False
-                
-                if hasattr(chart, 'value_axis') and chart.value_axis:
-                    chart.value_axis.has_major_gridlines = False
-                    chart.value_axis.has_minor_gridlines = False
-                    
-            except Exception as e:
-                logger.warning(f"Could not remove gridlines: {e}")
-            
-            # Configure category axis (Y-axis for horizontal bar chart) - keep only this axis
-            try:
-                if hasattr(chart, 'category_axis') and chart.category_axis:
-                    chart.category_axis.tick_labels.font.size = Pt(9)
-                    chart.category_axis.tick_label_position = XL_TICK_LABEL_POSITION.LOW  # Keep Y-axis labels on left
-                    # Remove axis title
-                    chart.category_axis.has_title = False
-                    # Keep the axis line visible
-                    chart.category_axis.format.line.color.rgb = RGBColor(0, 0, 0)  # Black axis line
-            except Exception as e:
-                logger.warning(f"Could not configure category axis: {e}")
-            
-            # Remove/hide value axis (X-axis for horizontal bar chart)
-            try:
-                if hasattr(chart, 'value_axis') and chart.value_axis:
-                    # Hide the axis completely
-                    chart.value_axis.visible = False
-                    # Alternative: make axis line transparent
-                    chart.value_axis.format.line.fill.background()
-                    # Remove axis title
-                    chart.value_axis.has_title = False
-                    # Hide tick labels
-                    chart.value_axis.tick_labels.font.size = Pt(1)
-                    chart.value_axis.tick_labels.font.color.rgb = RGBColor(255, 255, 255)  # Make invisible
-            except Exception as e:
-                logger.warning(f"Could not configure value axis: {e}")
-            
-            # Format bars and add data labels
-            try:
-                for series in chart.series:
-                    # Set bar color
-                    series.format.fill.solid()
-                    series.format.fill.fore_color.rgb = RGBColor(160, 208, 255)  # Blue color
-                    
-                    # Make bars thick but add space between them
-                    series.format.gap_width = 40  # Thick bars with some spacing
-                    
-                    # Remove line around bars to prevent errors
-                    series.format.line.fill.background()
-                    
-                    # Add data labels to outside end
-                    series.has_data_labels = True
-                    data_labels = series.data_labels
-                    data_labels.position = XL_DATA_LABEL_POSITION.OUTSIDE_END
-                    data_labels.font.size = Pt(10)
-                    data_labels.font.color.rgb = RGBColor(0, 0, 0)  # Black text
-                    data_labels.font.bold = True
-                    data_labels.number_format = '0'  # Show whole numbers only
-                    
-            except Exception as e:
-                logger.warning(f"Could not format series or data labels: {e}")
-            
-            # Additional formatting for bars spacing
-            try:
-                # Access the plot area and modify bar thickness
-                plot = chart.plots[0]
-                plot.gap_width = 40  # Set plot-level gap width for spacing
-            except Exception as e:
-                logger.warning(f"Could not set plot formatting: {e}")
-            
-            # Remove chart title if it exists
-            try:
-                if chart.has_title:
-                    chart.chart_title.text_frame.text = ''
-                    chart.chart_title.include_in_layout = False
-            except Exception as e:
-                logger.warning(f"Could not remove chart title: {e}")
+            chart = CHART_FACTORY.add_chart(slide5.shapes, 'author_bar', x, y, chart_width, chart_height, chart_data, workbooks=workbooks)
 
         # endregion
 
         # region Sixth slide - Facebook metrics and sentiment analysis
+        report_progress('facebook')
         logger.debug("Creating Sixth slide with Facebook metrics")
         slide6 = prs.slides.add_slide(prs.slide_layouts[5])
         # Remove default textbox
@@ -994,8 +1237,7 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
             if shape.has_text_frame:
                 sp = shape._element
                 sp.getparent().remove(sp)
-        add_slide_header(slide6, company_logo_path, start_date, end_date, "Facebook postlarının analizi", title_color, template_color)
-        add_side_line(slide6, template_color)
+        add_header(slide6, "Facebook postlarının analizi")
 
         # Set slide background
         background = slide6.background
@@ -1096,12 +1338,9 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                 metric_p.font.color.rgb = RGBColor(102, 102, 102)  # Medium gray
 
             # Right side - Sentiment analysis
-            if 'Facebook' in data_frames['combined_sources']:
-                fb_sentiment_data = data_frames['combined_sources']['Facebook']
-                company_sentiment = fb_sentiment_data[fb_sentiment_data['Company'] == company_name]
-                
+            if 'Facebook' in combined_sources:
                 # Donut chart
-                sentiment_counts = company_sentiment['Sentiment'].value_counts()
+                sentiment_counts = sentiment_totals(sentiment_cube, 'Facebook', company_name)
                 donut_data = ChartData()
                 donut_data.categories = ['Positive', 'Neutral', 'Negative']
                 donut_data.add_series('', [
@@ -1119,10 +1358,10 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                 x = right_section_left
                 y = Inches(1.2)
                 
-                create_sentiment_donut_chart(slide6, x, y, donut_size, donut_size - Inches(0.4), sentiment_counts, graph_color=graph_color)
+                create_sentiment_donut_chart(slide6, x, y, donut_size, donut_size - Inches(0.4), sentiment_counts, graph_color=graph_color, workbooks=workbooks)
 
                 # Multiline chart
-                sentiment_by_date = company_sentiment.groupby('Day')['Sentiment'].value_counts().unstack(fill_value=0)
+                sentiment_by_date = sentiment_by_date_label(sentiment_cube, 'Facebook', company_name)
                 chart_data = CategoryChartData()
                 chart_data.categories = sentiment_by_date.index.tolist()
                 
@@ -1138,7 +1377,7 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                 cy = donut_size - Inches(0.4)  # Same height as donut
                 
                 title = "Postların zamana və sentimentə görə bölgüsü"
-                create_sentiment_line_chart(slide6, x, y, cx, cy, chart_data, title, graph_color=graph_color)
+                create_sentiment_line_chart(slide6, x, y, cx, cy, chart_data, title, graph_color=graph_color, workbooks=workbooks)
                     
                 # Vertical multibar chart
                 x = right_section_left
@@ -1147,7 +1386,7 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                 cy = Inches(2.5)  # Remaining height
                 bg_box = add_bg_box(slide6, x, y, cx, cy, color=CHART_BG_COLOR)
 
-                company_sentiments = fb_sentiment_data.groupby('Company')['Sentiment'].value_counts().unstack(fill_value=0)
+                company_sentiments = sentiment_by_company(sentiment_cube, 'Facebook')
                 # Sort by total sentiment values
                 totals = company_sentiments.sum(axis=1)
                 company_sentiments = company_sentiments.loc[totals.sort_values(ascending=False).index]
@@ -1161,14 +1400,7 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                         chart_data.add_series(series_name, company_sentiments[sentiment].tolist())
                 
                 # Position multibar chart to span full width of right section
-                chart = slide6.shapes.add_chart(XL_CHART_TYPE.COLUMN_CLUSTERED, x, y, cx, cy, chart_data).chart
-                chart.has_legend = True
-                chart.legend.position = XL_LEGEND_POSITION.TOP
-                chart.legend.font.size = Pt(12)
-
-                # Set chart background and formatting
-                apply_chart_formatting(chart, title="Post saylarına görə bankların bölgüsü", graph_color=graph_color)
-                apply_sentiment_colors(chart)
+                chart = CHART_FACTORY.add_chart(slide6.shapes, 'company_multibar', x, y, cx, cy, chart_data, workbooks=workbooks, title="Post saylarına görə bankların bölgüsü", graph_color=graph_color)
         else: # no competitiors
             left = Inches(0.5)
 
@@ -1267,12 +1499,9 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                 metric_p.font.color.rgb = RGBColor(102, 102, 102)
                 
             # Middle side - Sentiment analysis
-            if 'Facebook' in data_frames['combined_sources']:
-                fb_sentiment_data = data_frames['combined_sources']['Facebook']
-                company_sentiment = fb_sentiment_data
-                
+            if 'Facebook' in combined_sources:
                 # Donut chart
-                sentiment_counts = company_sentiment['Sentiment'].value_counts()
+                sentiment_counts = sentiment_totals(sentiment_cube, 'Facebook')
                 donut_data = ChartData()
                 donut_data.categories = ['Positive', 'Neutral', 'Negative']
                 donut_data.add_series('', [
@@ -1290,7 +1519,7 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                 x = right_section_left
                 y = Inches(1.2)
                 
-                create_sentiment_donut_chart(slide6, x, y, donut_size, donut_size - Inches(0.4), sentiment_counts, graph_color=graph_color)
+                create_sentiment_donut_chart(slide6, x, y, donut_size, donut_size - Inches(0.4), sentiment_counts, graph_color=graph_color, workbooks=workbooks)
 
                 # Text section instead of multiline chart
                 x_text = right_section_left + donut_size + Inches(0.3)  # After donut chart
@@ -1420,37 +1649,17 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                 bg_box = add_bg_box(slide6, x, y, cx, cy, color=CHART_BG_COLOR)
 
                 # Group data by Day instead of Company
-                sentiment_by_day = fb_sentiment_data.groupby('Day')['Sentiment'].value_counts().unstack(fill_value=0)
-                # Sort by date
-                sentiment_by_day = sentiment_by_day.sort_index()
+                day_sentiments = sentiment_by_date_label(sentiment_cube, 'Facebook')
 
                 chart_data = CategoryChartData()
-                chart_data.categories = sentiment_by_day.index.tolist()
+                chart_data.categories = day_sentiments.index.tolist()
                 
                 for sentiment in [1, 0, -1]:
                     series_name = "Positive" if sentiment == 1 else "Neutral" if sentiment == 0 else "Negative"
-                    if sentiment in sentiment_by_day.columns:
-                        chart_data.add_series(series_name, sentiment_by_day[sentiment].tolist())
-
-                chart = slide6.shapes.add_chart(XL_CHART_TYPE.COLUMN_CLUSTERED, x, y, cx, cy, chart_data).chart
-                chart.has_legend = True
-                chart.legend.position = XL_LEGEND_POSITION.TOP
-                chart.legend.font.size = Pt(12)
-                chart.has_title = True
-                chart.chart_title.text_frame.text = f"{CHARTS_ICONS['Sentiment Trend']} Postların günlər üzrə bölgüsü"
-                chart.chart_title.text_frame.paragraphs[0].font.size = Pt(14)
-                chart.chart_title.text_frame.paragraphs[0].font.bold = False
-                chart.chart_title.text_frame.paragraphs[0].font.color.rgb = graph_color
-
-                # Set chart background and formatting
-                apply_chart_formatting(chart, title="Postların günlər üzrə bölgüsü", icon=CHARTS_ICONS['Sentiment Trend'], graph_color=graph_color)
-                for i, series in enumerate(chart.series):
-                    series.format.fill.solid()
-                    series.format.fill.fore_color.rgb = SENTIMENT_COLORS[list(SENTIMENT_COLORS.keys())[i]]
-                    series.has_data_labels = True
-                    series.data_labels.font.size = Pt(10)
-                    series.data_labels.font.bold = True
-                    series.data_labels.position = XL_DATA_LABEL_POSITION.OUTSIDE_END
+                    if sentiment in day_sentiments.columns:
+                        chart_data.add_series(series_name, day_sentiments[sentiment].tolist())
+
+                chart = CHART_FACTORY.add_chart(slide6.shapes, 'day_multibar', x, y, cx, cy, chart_data, workbooks=workbooks, title="Postların günlər üzrə bölgüsü", graph_color=graph_color)
 
             # right side - Metrics
             if 'facebook_reachs' in data_frames and len(data_frames['facebook_reachs']) > 0:
@@ -1560,8 +1769,7 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                 if shape.has_text_frame:
                     sp = shape._element
                     sp.getparent().remove(sp)
-            add_slide_header(slide7, company_logo_path, start_date, end_date, "Banklar haqqında paylaşılan postların analizi", title_color, template_color)
-            add_side_line(slide7, template_color)
+            add_header(slide7, "Banklar haqqında paylaşılan postların analizi")
 
             # Set slide background
             background = slide7.background
@@ -1569,80 +1777,11 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
             fill.solid()
             fill.fore_color.rgb = SLIDE_BG_COLOR
             
-            if 'combined_sources' in data_frames and 'Facebook' in data_frames['combined_sources']:
-                fb_data = data_frames['combined_sources']['Facebook']
-                
-                # Group data by Company
-                grouped_data = fb_data.groupby('Company').agg({
-                    'comment_count': 'sum',
-                    'like_count': 'sum',
-                    'share_count': 'sum',
-                    'view_count': 'sum'
-                }).reset_index()
-                
-                # Add post count
-                post_counts = fb_data.groupby('Company').size().reset_index(name='post_count')
-                grouped_data = grouped_data.merge(post_counts, on='Company')
-                
-                # Create table
-                rows = len(grouped_data) + 1  # +1 for header
-                cols = 6  # Company, post_count, comment_count, like_count, share_count, view_count
-                
-                # Calculate centered position
-                # Slide width: 13.33", Table width: 12.33" (leaving 0.5" on each side)
-                # Center horizontally: (13.33 - 12.33) / 2 = 0.5"
-                left = Inches(0.5)
-                
-                # Slide height: 7.5", Header: 0.8", Table height: 5"
-                # Center vertically in remaining space: 0.8 + (6.7 - 5) / 2 = 1.65"
-                top = Inches(1)
-                width = Inches(12.33)
-                height = Inches(5)
+            if 'Facebook' in combined_sources:
+                # Engagement sums and post count per company
+                grouped_data = facebook_engagement(aggregates)
                 
-                table = slide7.shapes.add_table(rows, cols, left, top, width, height).table
-                
-                # Set column widths with wider spacing
-                table.columns[0].width = Inches(3)  # Company name (wider for longer names)
-                for i in range(1, cols):
-                    table.columns[i].width = Inches(1.866)  # Metrics (remaining width distributed evenly)
-                
-                # Add headers with red background
-                headers = ['Banklar ', 'Post sayı', 'Şərh sayı', 'Bəyənmə sayı', 'Paylaşım sayı', 'Baxış sayı']
-                for i, header in enumerate(headers):
-                    cell = table.cell(0, i)
-                    cell.text = header
-                    cell.text_frame.paragraphs[0].font.size = Pt(12)
-                    cell.text_frame.paragraphs[0].font.bold = True
-                    cell.fill.solid()
-                    cell.fill.fore_color.rgb = template_color
-                    cell.text_frame.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)  # White text
-                
-                # Add data with alternating row colors
-                for i, row in grouped_data.iterrows():
-                    for j in range(cols):
-                        cell = table.cell(i + 1, j)
-                        if j == 0:
-                            cell.text = str(row['Company'])
-                        elif j == 1:
-                            cell.text = str(row['post_count'])
-                        elif j == 2:
-                            cell.text = str(row['view_count'])
-                        elif j == 3:
-                            cell.text = str(row['comment_count'])
-                        elif j == 4:
-                            cell.text = str(row['like_count'])
-                        else:
-                            cell.text = str(row['share_count'])
-                        
-                        cell.text_frame.paragraphs[0].font.size = Pt(10)
-                        
-                        # Set alternating row colors
-                        if i % 2 == 0:
-                            cell.fill.solid()
-                            cell.fill.fore_color.rgb = RGBColor(240, 240, 240)  # Light gray
-                        else:
-                            cell.fill.solid()
-                            cell.fill.fore_color.rgb = RGBColor(255, 255, 255)  # White
+                add_metrics_table(slide7, "Banklar haqqında paylaşılan postların analizi", grouped_data, 'Company')
         # endregion
 
         # region Eighth slide - Official Facebook metrics table
@@ -1654,8 +1793,7 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                 if shape.has_text_frame:
                     sp = shape._element
                     sp.getparent().remove(sp)
-            add_slide_header(slide8, company_logo_path, start_date, end_date, "Bankların rəsmi Facebook səhifələrinin analizi", title_color, template_color)
-            add_side_line(slide8, template_color)
+            add_header(slide8, "Bankların rəsmi Facebook səhifələrinin analizi")
 
             # Set slide background
             background = slide8.background
@@ -1673,7 +1811,7 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                     raise ValueError("Facebook data is missing required columns")
                 
                 # Group data by author_name
-                grouped_data = fb_data.groupby('author_name').agg({
+                grouped_data = fb_data.groupby('author_name', observed=True).agg({
                     'comment_count': 'sum',
                     'like_count': 'sum',
                     'share_count': 'sum',
@@ -1681,71 +1819,14 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                 }).reset_index()
                 
                 # Add post count
-                post_counts = fb_data.groupby('author_name').size().reset_index(name='post_count')
+                post_counts = fb_data.groupby('author_name', observed=True).size().reset_index(name='post_count')
                 grouped_data = grouped_data.merge(post_counts, on='author_name')
                 
-                # Create table
-                rows = len(grouped_data) + 1  # +1 for header
-                cols = 6  # Company, post_count, comment_count, like_count, share_count, view_count
-                
-                # Calculate centered position
-                # Slide width: 13.33", Table width: 12.33" (leaving 0.5" on each side)
-                # Center horizontally: (13.33 - 12.33) / 2 = 0.5"
-                left = Inches(0.5)
-                
-                # Slide height: 7.5", Header: 0.8", Table height: 5"
-                # Center vertically in remaining space: 0.8 + (6.7 - 5) / 2 = 1.65"
-                top = Inches(1)
-                width = Inches(12.33)
-                height = Inches(5)
-                
-                table = slide8.shapes.add_table(rows, cols, left, top, width, height).table
-                
-                # Set column widths with wider spacing
-                table.columns[0].width = Inches(3)  # Company name (wider for longer names)
-                for i in range(1, cols):
-                    table.columns[i].width = Inches(1.866)  # Metrics (remaining width distributed evenly)
-                
-                # Add headers with red background
-                headers = ['Banklar ', 'Post sayı', 'Şərh sayı', 'Bəyənmə sayı', 'Paylaşım sayı', 'Baxış sayı']
-                for i, header in enumerate(headers):
-                    cell = table.cell(0, i)
-                    cell.text = header
-                    cell.text_frame.paragraphs[0].font.size = Pt(12)
-                    cell.text_frame.paragraphs[0].font.bold = True
-                    cell.fill.solid()
-                    cell.fill.fore_color.rgb = template_color
-                    cell.text_frame.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)  # White text
-                
-                # Add data with alternating row colors
-                for i, row in grouped_data.iterrows():
-                    for j in range(cols):
-                        cell = table.cell(i + 1, j)
-                        if j == 0:
-                            cell.text = str(row['author_name'])
-                        elif j == 1:
-                            cell.text = str(row['post_count'])
-                        elif j == 2:
-                            cell.text = str(row['comment_count'])  # Changed order to match headers
-                        elif j == 3:
-                            cell.text = str(row['like_count'])    # Changed order to match headers
-                        elif j == 4:
-                            cell.text = str(row['share_count'])   # Changed order to match headers
-                        else:
-                            cell.text = str(row['view_count'])    # Changed order to match headers
-                        
-                        cell.text_frame.paragraphs[0].font.size = Pt(10)
-                        
-                        # Set alternating row colors
-                        if i % 2 == 0:
-                            cell.fill.solid()
-                            cell.fill.fore_color.rgb = RGBColor(240, 240, 240)  # Light gray
-                        else:
-                            cell.fill.solid()
-                            cell.fill.fore_color.rgb = RGBColor(255, 255, 255)  # White
+                add_metrics_table(slide8, "Bankların rəsmi Facebook səhifələrinin analizi", grouped_data, 'author_name')
         # endregion
 
         # region Ninth slide - Instagram metrics and sentiment analysis
+        report_progress('instagram')
         logger.debug("Creating ninth slide with Instagram metrics and sentiment analysis")
         slide9 = prs.slides.add_slide(prs.slide_layouts[5])
         # Remove default textbox
@@ -1753,8 +1834,7 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
             if shape.has_text_frame:
                 sp = shape._element
                 sp.getparent().remove(sp)
-        add_slide_header(slide9, company_logo_path, start_date, end_date, "Instagram postlarının analizi", title_color, template_color)
-        add_side_line(slide9, template_color)
+        add_header(slide9, "Instagram postlarının analizi")
 
         # Set slide background
         background = slide9.background
@@ -1858,14 +1938,9 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
             metric_p.font.color.rgb = RGBColor(102, 102, 102)  # Medium gray
             
         # Right side - Sentiment analysis from combined_sources
-        if 'combined_sources' in data_frames and 'Instagram' in data_frames['combined_sources']:
-            insta_sentiment_data = data_frames['combined_sources']['Instagram']
-            if has_competitors:
-                company_sentiment = insta_sentiment_data[insta_sentiment_data['Company'] == company_name]
-            else:
-                company_sentiment = insta_sentiment_data
-            
-            sentiment_counts = company_sentiment['Sentiment'].value_counts()
+        if 'Instagram' in combined_sources:
+            insta_company = company_name if has_competitors else None
+            sentiment_counts = sentiment_totals(sentiment_cube, 'Instagram', insta_company)
 
             # Right section (80% width) layout
             right_section_left = Inches(3.7)  # After left 20% section
@@ -1877,14 +1952,14 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                 x = right_section_left
                 y = Inches(1.2)
 
-                create_sentiment_donut_chart(slide9, x, y, donut_size + Inches(0.3), donut_size - Inches(0.4), sentiment_counts, graph_color=graph_color)
+                create_sentiment_donut_chart(slide9, x, y, donut_size + Inches(0.3), donut_size - Inches(0.4), sentiment_counts, graph_color=graph_color, workbooks=workbooks)
 
                 # Multiline chart
                 x = right_section_left + donut_size + Inches(0.5)  # After donut chart
                 y = Inches(1.2)
                 cx = right_width - donut_size - Inches(0.5)  # Remaining width
                 cy = donut_size - Inches(0.4)  # Same height as donut
-                sentiment_by_date = company_sentiment.groupby('Day')['Sentiment'].value_counts().unstack(fill_value=0)
+                sentiment_by_date = sentiment_by_date_label(sentiment_cube, 'Instagram', insta_company)
                 chart_data = CategoryChartData()
                 chart_data.categories = sentiment_by_date.index.tolist()
                 for sentiment in [1, 0, -1]:
@@ -1893,7 +1968,7 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                         chart_data.add_series(series_name, sentiment_by_date[sentiment].tolist())
                 
                 title = "Postların zamana və sentimentə görə bölgüsü"
-                create_sentiment_line_chart(slide9, x, y, cx, cy, chart_data, title, icon=CHARTS_ICONS['Sentiment Trend'], graph_color=graph_color)
+                create_sentiment_line_chart(slide9, x, y, cx, cy, chart_data, title, icon=CHARTS_ICONS['Sentiment Trend'], graph_color=graph_color, workbooks=workbooks)
                     
                 # Vertical multibar chart for Instagram company sentiment comparison
                 # Position multibar chart to take full width of right section
@@ -1903,8 +1978,7 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                 cy = Inches(2.5)  # Height
                 bg_box = add_bg_box(slide9, x, y, cx, cy, color=CHART_BG_COLOR)
 
-                insta_sentiment_data = insta_sentiment_data[insta_sentiment_data['Sentiment'].isin([-1, 0, 1])]
-                company_sentiments = insta_sentiment_data.groupby('Company')['Sentiment'].value_counts().unstack(fill_value=0)
+                company_sentiments = sentiment_by_company(sentiment_cube, 'Instagram')
                 # Sort by total sentiment values
                 totals = company_sentiments.sum(axis=1)
                 company_sentiments = company_sentiments.loc[totals.sort_values(ascending=False).index]
@@ -1917,14 +1991,7 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                     if sentiment in company_sentiments.columns:
                         chart_data.add_series(series_name, company_sentiments[sentiment].tolist())
 
-                chart = slide9.shapes.add_chart(XL_CHART_TYPE.COLUMN_CLUSTERED, x, y, cx, cy, chart_data).chart
-                chart.has_legend = True
-                chart.legend.position = XL_LEGEND_POSITION.TOP
-                chart.legend.font.size = Pt(12)
-
-                # Set chart background and formatting
-                apply_sentiment_colors(chart)
-                apply_chart_formatting(chart, title="Post saylarına görə bankların bölgüsü", graph_color=graph_color)
+                chart = CHART_FACTORY.add_chart(slide9.shapes, 'company_multibar', x, y, cx, cy, chart_data, workbooks=workbooks, title="Post saylarına görə bankların bölgüsü", graph_color=graph_color)
 
             else:
                 # Position smaller donut chart centered in its section
@@ -1932,7 +1999,7 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                 x = right_section_left + right_width - donut_size - Inches(0.3)  # Centered in right section
                 y = Inches(1.2)
 
-                create_sentiment_donut_chart(slide9, x, y, donut_size + Inches(0.3), donut_size - Inches(0.4), sentiment_counts, graph_color=graph_color)
+                create_sentiment_donut_chart(slide9, x, y, donut_size + Inches(0.3), donut_size - Inches(0.4), sentiment_counts, graph_color=graph_color, workbooks=workbooks)
                                                         
                 # Info section with separated text boxes
                 x = right_section_left
@@ -2050,11 +2117,8 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                 cy = Inches(2.5)  # Height
                 bg_box = add_bg_box(slide9, x, y, cx, cy, color=CHART_BG_COLOR)
 
-                # Filter relevant sentiments
-                insta_sentiment_data = insta_sentiment_data[insta_sentiment_data['Sentiment'].isin([-1, 0, 1])]
-
-                # Group and reshape the sentiment data
-                company_sentiments = insta_sentiment_data.groupby('Day')['Sentiment'].value_counts().unstack(fill_value=0)
+                # Sentiment counts per day
+                company_sentiments = sentiment_by_date_label(sentiment_cube, 'Instagram')
 
                 # Ensure all expected sentiment columns exist, even if some are missing
                 for sentiment in [-1, 0, 1]:
@@ -2074,23 +2138,12 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                     chart_data.add_series(series_name, company_sentiments[sentiment].tolist())
 
                 # Add stacked column chart
-                chart = slide9.shapes.add_chart(
-                    XL_CHART_TYPE.COLUMN_STACKED,
-                    x, y, cx, cy, chart_data
-                ).chart
-
-                # Configure chart appearance
-                chart.has_legend = True
-                chart.legend.position = XL_LEGEND_POSITION.TOP
-                chart.legend.font.size = Pt(12)
-
-                # Apply custom formatting and sentiment colors
-                apply_sentiment_colors(chart)
-                apply_chart_formatting(chart, title="Post saylarına görə bankların bölgüsü", graph_color=graph_color)
+                chart = CHART_FACTORY.add_chart(slide9.shapes, 'stacked_day_bar', x, y, cx, cy, chart_data, workbooks=workbooks, title="Post saylarına görə bankların bölgüsü", graph_color=graph_color)
 
         # endregion
 
         # region Tenth slide - Twitter sentiment analysis
+        report_progress('twitter')
         if not has_competitors:
             logger.debug("Creating tenth slide with Linkedin sentiment analysis")
             slide10 = prs.slides.add_slide(prs.slide_layouts[5])
@@ -2099,8 +2152,7 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                 if shape.has_text_frame:
                     sp = shape._element
                     sp.getparent().remove(sp)
-            add_slide_header(slide10, company_logo_path, start_date, end_date, "Twitter postlarının analizi", title_color, template_color)
-            add_side_line(slide10, template_color)
+            add_header(slide10, "Twitter postlarının analizi")
 
             # Set slide background
             background = slide10.background
@@ -2108,14 +2160,8 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
             fill.solid()
             fill.fore_color.rgb = SLIDE_BG_COLOR
             
-            if 'combined_sources' in data_frames and 'Twitter' in data_frames['combined_sources']:
-                linkedin_data = data_frames['combined_sources']['Twitter']
-                if has_competitors:
-                    company_sentiment = linkedin_data[linkedin_data['Company'] == company_name]
-                else:
-                    company_sentiment = linkedin_data
-                
-                if not company_sentiment.empty:
+            if 'Twitter' in combined_sources:
+                if mention_count(sentiment_cube, 'Twitter', company_name if has_competitors else None) > 0:
                     # Calculate heights accounting for header
                     available_height = Inches(7.5 - HEADER_HEIGHT)  # Total height minus header
                     half_height = available_height / 2
@@ -2248,7 +2294,7 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                     # Donut chart on right top half (where multiline was)
                     x_donut = full_content_width - donut_width + Inches(0.5) # Start after text section
                     y_donut = Inches(1.2)  # Same vertical alignment as text
-                    create_sentiment_donut_chart(slide10, x_donut, y_donut, donut_width, donut_heigth, sentiment_counts, graph_color=graph_color)
+                    create_sentiment_donut_chart(slide10, x_donut, y_donut, donut_width, donut_heigth, sentiment_counts, graph_color=graph_color, workbooks=workbooks)
 
 
                     # Stacked progress bar chart for sentiment by day
@@ -2261,15 +2307,8 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                     try:
                         bg_box = add_bg_box(slide10, x_bar, y_bar, cx_bar, cy_bar, color=CHART_BG_COLOR)
 
-                        # Group data by Day instead of Company - with error handling
-                        linkedin_data_copy = linkedin_data.copy()
-                        linkedin_data_filtered = linkedin_data_copy[linkedin_data_copy['Sentiment'].isin([-1, 0, 1])]
-                        
-                        # Convert Day column to string to avoid datetime comparison issues
-                        if 'Day' in linkedin_data_filtered.columns:
-                            linkedin_data_filtered.loc[:, 'Day'] = linkedin_data_filtered['Day'].astype(str)
-                        
-                        day_sentiments = linkedin_data_filtered.groupby('Day')['Sentiment'].value_counts().unstack(fill_value=0)
+                        # Group data by Day instead of Company, with ISO date strings as categories
+                        day_sentiments = sentiment_by_date_label(sentiment_cube, 'Twitter')
                         
                         # Sort by day (now as strings)
                         try:
@@ -2296,37 +2335,8 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                                 # Add empty series if sentiment not found
                                 chart_data.add_series(series_name, [0] * len(day_sentiments))
                         
-                        chart = slide10.shapes.add_chart(
-                            XL_CHART_TYPE.COLUMN_STACKED,
-                            x_bar, y_bar,
-                            cx_bar, cy_bar,
-                            chart_data
-                        ).chart
-                        
-                        chart.has_legend = True
-                        chart.has_data_labels = True
-                        chart.legend.position = XL_LEGEND_POSITION.TOP
-                        chart.legend.font.size = Pt(12)
-                        
-                        # Apply formatting and colors
-                        try:
-                            apply_chart_formatting(chart, title="Günlük sentiment dağılımı", graph_color=graph_color)
-                            apply_sentiment_colors(chart)
-                        except Exception as e:
-                            print(f"Error applying chart formatting: {e}")
-                        
-                        # Add data labels at center with size 10
-                        try:
-                            for series in chart.series:
-                                series.has_data_labels = True
-                                data_labels = series.data_labels
-                                data_labels.position = XL_DATA_LABEL_POSITION.CENTER
-                                data_labels.font.size = Pt(10)
-                                data_labels.font.bold = False
-                                data_labels.font.color.rgb = RGBColor(255, 255, 255)  # White text for better visibility on colored background
-                        except Exception as e:
-                            print(f"Error setting data labels: {e}")
-                            
+                        chart = CHART_FACTORY.add_chart(slide10.shapes, 'stacked_day_bar', x_bar, y_bar, cx_bar, cy_bar, chart_data, workbooks=workbooks, title="Günlük sentiment dağılımı", graph_color=graph_color, data_labels=True)
+
                     except Exception as e:
                         print(f"Error creating stacked bar chart: {e}")
                 else:
@@ -2334,6 +2344,7 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
         # endregion
 
         # region eleveth slide - Linkedin sentiment analysis
+        report_progress('linkedin')
         logger.debug("Creating eleveth slide with Linkedin sentiment analysis")
         slide11 = prs.slides.add_slide(prs.slide_layouts[5])
         # Remove default textbox
@@ -2341,8 +2352,7 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
             if shape.has_text_frame:
                 sp = shape._element
                 sp.getparent().remove(sp)
-        add_slide_header(slide11, company_logo_path, start_date, end_date, "Linkedln postlarının analizi", title_color, template_color)
-        add_side_line(slide11, template_color)
+        add_header(slide11, "Linkedln postlarının analizi")
 
         # Set slide background
         background = slide11.background
@@ -2350,14 +2360,9 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
         fill.solid()
         fill.fore_color.rgb = SLIDE_BG_COLOR
         
-        if 'combined_sources' in data_frames and 'Linkedin' in data_frames['combined_sources']:
-            linkedin_data = data_frames['combined_sources']['Linkedin']
-            if has_competitors:
-                company_sentiment = linkedin_data[linkedin_data['Company'] == company_name]
-            else:
-                company_sentiment = linkedin_data
-            
-            if not company_sentiment.empty:
+        if 'Linkedin' in combined_sources:
+            linkedin_company = company_name if has_competitors else None
+            if mention_count(sentiment_cube, 'Linkedin', linkedin_company) > 0:
                 # Calculate heights accounting for header
                 available_height = Inches(7.5 - HEADER_HEIGHT)  # Total height minus header
                 half_height = available_height / 2
@@ -2370,7 +2375,7 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                     x_donut = Inches(0.5)
                     y_donut = Inches(1.2)  # Just below header
                     create_sentiment_donut_chart(slide11, x_donut, y_donut, donut_size, 
-                        donut_size - Inches(0.4), sentiment_counts, graph_color=graph_color)
+                        donut_size - Inches(0.4), sentiment_counts, graph_color=graph_color, workbooks=workbooks)
                                             
                     # Multiline chart in right half
                     # Position multiline chart in right half of top section
@@ -2379,7 +2384,7 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                     cx_line = Inches(8.33)  # Remaining width
                     cy_line = Inches(3.1)
 
-                    sentiment_by_date = company_sentiment.groupby('Day')['Sentiment'].value_counts().unstack(fill_value=0)
+                    sentiment_by_date = sentiment_by_date_label(sentiment_cube, 'Linkedin', linkedin_company)
                     chart_data = CategoryChartData()
                     chart_data.categories = sentiment_by_date.index.tolist()
                     
@@ -2388,7 +2393,7 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                         if sentiment in sentiment_by_date.columns:
                             chart_data.add_series(series_name, sentiment_by_date[sentiment].tolist())
                     
-                    create_sentiment_line_chart(slide11, x_line, y_line, cx_line, cy_line, chart_data, title="Postların sentiment və zamana görə bölgüsü", graph_color=graph_color)
+                    create_sentiment_line_chart(slide11, x_line, y_line, cx_line, cy_line, chart_data, title="Postların sentiment və zamana görə bölgüsü", graph_color=graph_color, workbooks=workbooks)
 
                     # Vertical multibar chart for LinkedIn company sentiment comparison
                     # Position multibar chart in bottom half, full width
@@ -2399,8 +2404,7 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
 
                     bg_box = add_bg_box(slide11, x_bar, y_bar, cx_bar, cy_bar, color=CHART_BG_COLOR)
 
-                    linkedin_data = linkedin_data[linkedin_data['Sentiment'].isin([-1, 0, 1])]
-                    company_sentiments = linkedin_data.groupby('Company')['Sentiment'].value_counts().unstack(fill_value=0)
+                    company_sentiments = sentiment_by_company(sentiment_cube, 'Linkedin')
                     
                     # Sort by total sentiment values
                     totals = company_sentiments.sum(axis=1)
@@ -2414,30 +2418,7 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                         if sentiment in company_sentiments.columns:
                             chart_data.add_series(series_name, company_sentiments[sentiment].tolist())
                     
-                    chart = slide11.shapes.add_chart(
-                        XL_CHART_TYPE.COLUMN_CLUSTERED,
-                        x_bar, y_bar,
-                        cx_bar, cy_bar,
-                        chart_data
-                    ).chart
-                    
-                    chart.has_legend = True
-                    chart.has_data_labels = True
-                    chart.legend.position = XL_LEGEND_POSITION.TOP
-                    chart.legend.font.size = Pt(12)
-                    
-                    # Apply formatting and colors
-                    apply_chart_formatting(chart, title="Post saylarına görə bankların bölgüsü", graph_color=graph_color)
-                    apply_sentiment_colors(chart)
-                    
-                    # Add data labels at outside end with size 10
-                    for series in chart.series:
-                        series.has_data_labels = True
-                        data_labels = series.data_labels
-                        data_labels.position = XL_DATA_LABEL_POSITION.OUTSIDE_END
-                        data_labels.font.size = Pt(10)
-                        data_labels.font.bold = False
-                        data_labels.font.color.rgb = RGBColor(89, 89, 89)
+                    chart = CHART_FACTORY.add_chart(slide11.shapes, 'company_multibar', x_bar, y_bar, cx_bar, cy_bar, chart_data, workbooks=workbooks, title="Post saylarına görə bankların bölgüsü", graph_color=graph_color, data_labels=True)
                 else:  # has no cempoetitors
                     # Top half section for text and donut charts
                     donut_width = Inches(5)
@@ -2541,7 +2522,7 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                     # Donut chart on right top half (where multiline was)
                     x_donut = full_content_width - donut_width + Inches(0.5) # Start after text section
                     y_donut = Inches(1.2)  # Same vertical alignment as text
-                    create_sentiment_donut_chart(slide11, x_donut, y_donut, donut_width, donut_heigth, sentiment_counts, graph_color=graph_color)
+                    create_sentiment_donut_chart(slide11, x_donut, y_donut, donut_width, donut_heigth, sentiment_counts, graph_color=graph_color, workbooks=workbooks)
 
                     # Stacked progress bar chart for sentiment by day
                     # Position stacked bar chart in bottom half, full width
@@ -2553,15 +2534,8 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                     try:
                         bg_box = add_bg_box(slide11, x_bar, y_bar, cx_bar, cy_bar, color=CHART_BG_COLOR)
 
-                        # Group data by Day instead of Company - with error handling
-                        linkedin_data_copy = linkedin_data.copy()
-                        linkedin_data_filtered = linkedin_data_copy[linkedin_data_copy['Sentiment'].isin([-1, 0, 1])]
-                        
-                        # Convert Day column to string to avoid datetime comparison issues
-                        if 'Day' in linkedin_data_filtered.columns:
-                            linkedin_data_filtered.loc[:, 'Day'] = linkedin_data_filtered['Day'].astype(str)
-                        
-                        day_sentiments = linkedin_data_filtered.groupby('Day')['Sentiment'].value_counts().unstack(fill_value=0)
+                        # Group data by Day instead of Company, with ISO date strings as categories
+                        day_sentiments = sentiment_by_date_label(sentiment_cube, 'Linkedin')
                         
                         # Sort by day (now as strings)
                         try:
@@ -2588,37 +2562,8 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
                                 # Add empty series if sentiment not found
                                 chart_data.add_series(series_name, [0] * len(day_sentiments))
                         
-                        chart = slide11.shapes.add_chart(
-                            XL_CHART_TYPE.COLUMN_STACKED,
-                            x_bar, y_bar,
-                            cx_bar, cy_bar,
-                            chart_data
-                        ).chart
-                        
-                        chart.has_legend = True
-                        chart.has_data_labels = True
-                        chart.legend.position = XL_LEGEND_POSITION.TOP
-                        chart.legend.font.size = Pt(12)
-                        
-                        # Apply formatting and colors
-                        try:
-                            apply_chart_formatting(chart, title="Günlük sentiment dağılımı", graph_color=graph_color)
-                            apply_sentiment_colors(chart)
-                        except Exception as e:
-                            print(f"Error applying chart formatting: {e}")
-                        
-                        # Add data labels at center with size 10
-                        try:
-                            for series in chart.series:
-                                series.has_data_labels = True
-                                data_labels = series.data_labels
-                                data_labels.position = XL_DATA_LABEL_POSITION.CENTER
-                                data_labels.font.size = Pt(10)
-                                data_labels.font.bold = False
-                                data_labels.font.color.rgb = RGBColor(255, 255, 255)  # White text for better visibility on colored background
-                        except Exception as e:
-                            print(f"Error setting data labels: {e}")
-                            
+                        chart = CHART_FACTORY.add_chart(slide11.shapes, 'stacked_day_bar', x_bar, y_bar, cx_bar, cy_bar, chart_data, workbooks=workbooks, title="Günlük sentiment dağılımı", graph_color=graph_color, data_labels=True)
+
                     except Exception as e:
                         print(f"Error creating stacked bar chart: {e}")
             else:
@@ -2626,6 +2571,7 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
         # endregion
 
         # region Twelveth slide - Positive and Negative Posts
+        report_progress('posts')
         logger.debug("Creating Twelveth slide with positive and negative posts")
         slide12 = prs.slides.add_slide(prs.slide_layouts[5])
         # Remove default textbox
@@ -2633,8 +2579,7 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
             if shape.has_text_frame:
                 sp = shape._element
                 sp.getparent().remove(sp)
-        add_slide_header(slide12, company_logo_path, start_date, end_date, "Sosial media postlarının analizi", title_color, template_color)
-        add_side_line(slide12, template_color)
+        add_header(slide12, "Sosial media postlarının analizi")
 
         # Layout constants
         header_height = Inches(0.8)
@@ -2748,11 +2693,11 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
         positive_p.alignment = PP_ALIGN.CENTER
 
         def add_post(slide, post, left, top):
-            if not os.path.exists(post["image_path"]):
+            if not images.available(post["image_path"]):
                 return 0
 
             # Add image and get actual height
-            img = slide.shapes.add_picture(post["image_path"], left, top, width=image_width)
+            img = images.add_picture(slide.shapes, post["image_path"], left, top, width=image_width)
             img_height = img.height / 914400
 
             # Link
@@ -2862,9 +2807,13 @@ def create_ppt(data_frames, output_path, start_date, end_date, company_name, com
 
         # endregion
 
+        report_progress('saving')
+        logger.debug(f"Embedded {workbooks.workbooks} {workbooks.mode} chart workbooks for {workbooks.charts} charts in {workbooks.seconds * 1000:.1f} ms")
         logger.debug("Saving PowerPoint file")
-        prs.save(output_path)
+        # Streams parts into output_path; prs is not used after this, so its blobs may be dropped as they are written
+        write_pptx(prs, output_path, release_parts=PPTX_RELEASE_PARTS)
         logger.debug("PowerPoint file saved successfully")
+        return image_stats
     except Exception as e:
         logger.error(f"Error creating PowerPoint: {str(e)}")
         raise
\ No newline at end of file
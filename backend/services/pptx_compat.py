@@ -0,0 +1,46 @@
+import functools
+import inspect
+import logging
+
+import pptx
+from pptx import Presentation
+from pptx.opc import serialized
+from pptx.opc.package import OpcPackage
+from pptx.parts.chart import ChartPart
+
+logger = logging.getLogger(__name__)
+
+# python-pptx release the private attributes below were checked against (requirements.txt pins it)
+TESTED_PPTX_VERSION = "1.0.2"
+
+# Slide shape tree internals used by image_registry, chart_factory and slide_fragments
+SHAPE_INTERNALS = ['_grpSp', '_spTree', '_next_shape_id', '_recalculate_extents', '_shape_factory', '_add_chart_graphicFrame']
+# Part internals used by pptx_stream and chart_factory
+PART_INTERNALS = ['_rels', '_blob', '_element']
+
+
+@functools.cache
+def require_pptx_internals():
+    """Raise ImportError if python-pptx lacks the private APIs the deck builder relies on.
+
+    The registry, chart factory, slide fragments and streaming writer reach
+    past python-pptx's public API; a release that moves those internals
+    fails here on import instead of writing broken decks.
+    """
+    prs = Presentation()
+    shapes = prs.slides.add_slide(prs.slide_layouts[6]).shapes
+    missing = [f"SlideShapes.{name}" for name in SHAPE_INTERNALS if not hasattr(shapes, name)]
+    missing += [f"Part.{name}" for name in PART_INTERNALS if not hasattr(prs.part, name)]
+    if not hasattr(OpcPackage, '_rels'):
+        missing.append("OpcPackage._rels")
+    if not hasattr(getattr(serialized, '_ContentTypesItem', None), 'xml_for'):
+        missing.append("_ContentTypesItem.xml_for")
+    if list(inspect.signature(ChartPart.load).parameters) != ['partname', 'content_type', 'package', 'blob']:
+        missing.append("ChartPart.load(partname, content_type, package, blob)")
+    if missing:
+        raise ImportError(
+            f"python-pptx {pptx.__version__} lacks internals used to build decks ({', '.join(missing)}); "
+            f"install python-pptx=={TESTED_PPTX_VERSION}"
+        )
+    if pptx.__version__ != TESTED_PPTX_VERSION:
+        logger.warning(f"python-pptx {pptx.__version__} is untested, decks are built against {TESTED_PPTX_VERSION}")
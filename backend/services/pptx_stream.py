@@ -0,0 +1,77 @@
+import logging
+import os
+import tempfile
+import zipfile
+
+from pptx.opc.oxml import serialize_part_xml
+from pptx.opc.package import XmlPart
+from pptx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+from pptx.opc.serialized import _ContentTypesItem
+
+from services.pptx_compat import require_pptx_internals
+
+logger = logging.getLogger(__name__)
+
+# Relies on python-pptx internals; fails on import if they moved
+require_pptx_internals()
+
+
+def _write_members(prs, zipf, release_parts):
+    """Write the package into zipf one member at a time.
+
+    Same member layout as Presentation.save(). With release_parts, binary part
+    blobs (images, embedded workbooks) are dropped once written, so the deck's
+    memory shrinks as the archive grows; the presentation cannot be saved again.
+    """
+    package = prs.part.package
+    parts = tuple(package.iter_parts())
+
+    zipf.writestr(CONTENT_TYPES_URI.membername, serialize_part_xml(_ContentTypesItem.xml_for(parts)))
+    zipf.writestr(PACKAGE_URI.rels_uri.membername, package._rels.xml)
+
+    for part in parts:
+        zipf.writestr(part.partname.membername, part.blob)
+        if part._rels:
+            zipf.writestr(part.partname.rels_uri.membername, part.rels.xml)
+        if release_parts and not isinstance(part, XmlPart):
+            part._blob = b''
+
+
+def write_pptx(prs, pkg_file, release_parts=False):
+    """Save prs to a path or file-like object, writing parts as they are serialized.
+
+    pkg_file does not need to be seekable (pipes, sockets, response bodies).
+    A path is written through a temp file and renamed, so a failed or timed
+    out save never leaves a partial deck behind. release_parts empties prs's
+    image and workbook parts as they are written, for callers that discard
+    the deck once it is saved.
+    """
+    try:
+        logger.debug("Writing presentation package")
+        if isinstance(pkg_file, (str, os.PathLike)):
+            _write_path(prs, os.fspath(pkg_file), release_parts)
+        else:
+            _write_zip(prs, pkg_file, release_parts)
+        logger.debug("Successfully wrote presentation package")
+    except Exception as e:
+        logger.error(f"Error writing presentation package: {str(e)}")
+        raise
+
+
+def _write_zip(prs, pkg_file, release_parts):
+    with zipfile.ZipFile(pkg_file, 'w', compression=zipfile.ZIP_DEFLATED) as zipf:
+        _write_members(prs, zipf, release_parts)
+
+
+def _write_path(prs, path, release_parts):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            _write_zip(prs, f, release_parts)
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
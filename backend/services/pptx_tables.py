@@ -0,0 +1,104 @@
+import logging
+import re
+from xml.sax.saxutils import escape
+
+import numpy as np
+from pptx.dml.color import RGBColor
+from pptx.oxml import parse_xml
+from pptx.util import Emu, Pt
+
+logger = logging.getLogger(__name__)
+
+_NAMESPACES = 'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"'
+
+# Characters XML 1.0 cannot hold; python-pptx would otherwise reject the text
+_INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+DEFAULT_TABLE_STYLE = {
+    'header_fill': RGBColor(214, 55, 64),
+    'header_font_color': RGBColor(255, 255, 255),
+    'header_font_size': Pt(12),
+    'header_bold': True,
+    'body_font_size': Pt(10),
+    # Row fills cycled from the first data row
+    'band_fills': [RGBColor(240, 240, 240), RGBColor(255, 255, 255)],
+}
+
+
+def _header_cell_xml(text, font_size, fill, bold=False, font_color=None):
+    # Same cell markup python-pptx writes for cell.text, font size/bold/color and fill.solid()
+    bold_attr = ' b="1"' if bold else ''
+    if font_color is None:
+        run_props = f'<a:defRPr sz="{font_size.centipoints}"{bold_attr}/>'
+    else:
+        run_props = (
+            f'<a:defRPr sz="{font_size.centipoints}"{bold_attr}>'
+            f'<a:solidFill><a:srgbClr val="{font_color}"/></a:solidFill></a:defRPr>'
+        )
+    return (
+        f'<a:tc><a:txBody><a:bodyPr/><a:lstStyle/><a:p><a:pPr>{run_props}</a:pPr>'
+        f'<a:r><a:t>{text}</a:t></a:r></a:p></a:txBody>'
+        f'<a:tcPr><a:solidFill><a:srgbClr val="{fill}"/></a:solidFill></a:tcPr></a:tc>'
+    )
+
+
+def _row_heights(rows, height):
+    # Split like python-pptx's add_table: the last row absorbs the remainder
+    row_height = height // rows
+    return [row_height] * (rows - 1) + [height - (rows - 1) * row_height]
+
+
+def add_frame_table(shapes, frame, columns, left, top, height, style=None, first_row=0):
+    """Add a DataFrame as a styled table, writing the a:tbl rows as one XML string.
+
+    columns is a list of (header, frame column, width) tuples; the table is
+    as wide as its columns. style overrides DEFAULT_TABLE_STYLE keys.
+    first_row is the position of the frame's first row in the whole table,
+    so banding continues across pages. Cell by cell, the result is what
+    add_table plus cell.text, font and fill.solid() calls produce.
+    """
+    try:
+        style = {**DEFAULT_TABLE_STYLE, **(style or {})}
+        rows = len(frame) + 1
+        widths = [width for _, _, width in columns]
+        graphic_frame = shapes.add_table(1, len(columns), left, top, Emu(sum(widths)), height)
+        tbl = graphic_frame._element.graphic.graphicData.tbl
+        for grid_col, width in zip(tbl.tblGrid.gridCol_lst, widths):
+            grid_col.w = width
+        tbl.remove(tbl.tr_lst[0])
+
+        heights = _row_heights(rows, height)
+        header_cells = ''.join(
+            _header_cell_xml(escape(header), style['header_font_size'], style['header_fill'], style['header_bold'], style['header_font_color'])
+            for header, _, _ in columns
+        )
+        body = f'<a:tr h="{heights[0]}">{header_cells}</a:tr>'
+
+        if len(frame):
+            band_fills = style['band_fills']
+            fills = np.array([str(fill) for fill in band_fills], dtype=object)[(first_row + np.arange(len(frame))) % len(band_fills)]
+            cell_start = f'<a:tc><a:txBody><a:bodyPr/><a:lstStyle/><a:p><a:pPr><a:defRPr sz="{style["body_font_size"].centipoints}"/></a:pPr><a:r><a:t>'
+            fill_start = '</a:t></a:r></a:p></a:txBody><a:tcPr><a:solidFill><a:srgbClr val="'
+            cell_end = '"/></a:solidFill></a:tcPr></a:tc>'
+            # Whole columns of cell markup at once; object arrays concatenate element-wise
+            row_xml = np.array([f'<a:tr h="{row_height}">' for row_height in heights[1:]], dtype=object)
+            for _, column, _ in columns:
+                texts = frame[column].astype(str).map(lambda text: escape(_INVALID_XML_CHARS.sub('', text))).to_numpy(dtype=object)
+                row_xml = row_xml + cell_start + texts + fill_start + fills + cell_end
+            body += ''.join(row_xml + '</a:tr>')
+
+        # parse_xml gives the rows python-pptx's element classes, so table.cell() still works
+        for tr in list(parse_xml(f'<a:tbl {_NAMESPACES}>{body}</a:tbl>')):
+            tbl.append(tr)
+        logger.debug(f"Added table of {rows} rows")
+        return graphic_frame
+    except Exception as e:
+        logger.error(f"Error adding table: {str(e)}")
+        raise
+
+
+def table_pages(frame, rows_per_page):
+    """Split a frame into (first row position, page frame) chunks of at most rows_per_page rows"""
+    if len(frame) <= rows_per_page:
+        return [(0, frame)]
+    return [(start, frame.iloc[start:start + rows_per_page]) for start in range(0, len(frame), rows_per_page)]
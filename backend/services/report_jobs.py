@@ -0,0 +1,230 @@
+import asyncio
+import functools
+import io
+import logging
+import os
+import pickle
+
+from config import INGEST_MODE
+from services import job_store, mention_store
+from services.aggregations import build_aggregates, merge_aggregates
+from services.excel_stream import STREAMED_ROLE
+from services.input_formats import EXCEL, detect_format, split_input_name
+from services.parse_cache import AGGREGATES, FRAMES, cached_payload, parse_excel_data_cached, parse_excel_payload
+from services.ppt_generator import create_ppt
+from services.sheet_schemas import has_schemas, parse_date_range, require_sheets
+
+logger = logging.getLogger(__name__)
+
+# create_ppt options that vary per company in a batch; the rest are shared
+BATCH_COMPANY_OPTIONS = ["company_name", "template_color", "title_color", "graph_color"]
+
+
+def ingest_kind(name, content):
+    """Whether an input is loaded as frames or streamed into aggregates.
+
+    Only combined_sources workbooks are streamed; columnar inputs are cheap
+    enough to load as frames in either mode.
+    """
+    if INGEST_MODE != "stream" or split_input_name(name)[0] != STREAMED_ROLE:
+        return FRAMES
+    return AGGREGATES if detect_format(content)[0] == EXCEL else FRAMES
+
+
+def combine_inputs(parsed_inputs):
+    """Merge {input name: {sheet: df}} into {role: {sheet: df}}.
+
+    A role may arrive as one workbook or as several single-sheet files
+    ("combined_sources.News", "combined_sources.Facebook", ...); required
+    sheets are checked once all of its inputs are in.
+    """
+    data_frames = {}
+    for name, sheets in parsed_inputs.items():
+        data_frames.setdefault(split_input_name(name)[0], {}).update(sheets)
+    for role, sheets in data_frames.items():
+        if has_schemas(role):
+            require_sheets(role, list(sheets))
+    return data_frames
+
+
+def report_date_range(report_options):
+    """Report window used to filter rows at ingestion"""
+    return parse_date_range(report_options.get("start_date"), report_options.get("end_date"))
+
+
+def rows_skipped(data_frames, aggregates):
+    """{role.sheet: rows dropped for falling outside the report dates}"""
+    skipped = {
+        f"{role}.{sheet_name}": df.attrs.get('rows_skipped', 0)
+        for role, sheets in data_frames.items()
+        for sheet_name, df in sheets.items()
+    }
+    if aggregates is not None:
+        skipped.update({f"{STREAMED_ROLE}.{sheet_name}": count for sheet_name, count in aggregates['rows_skipped'].items()})
+    return skipped
+
+
+async def parse_workbooks(request, excel_files, date_range=None):
+    """Parse uploaded inputs concurrently on the report pool.
+
+    request is the caller's admitted ReportRequest; every parse runs under
+    its deadline and takes a queue slot while it runs. excel_files maps input names (see
+    services.input_formats.input_name) to uploaded bytes. Returns
+    {name: (kind, pickled result)} for build_report(parsed_workbooks=...),
+    where kind says whether the input was streamed into aggregates. Uploads
+    already in the parse cache are read without a worker, on a thread so
+    hashing them does not block the event loop. Rows dated outside
+    date_range are dropped while parsing.
+    """
+    async def parse(name, content):
+        kind = ingest_kind(name, content)
+        payload = await asyncio.to_thread(cached_payload, content, name, kind=kind, date_range=date_range)
+        if payload is not None:
+            logger.debug(f"Parsed workbook cache hit: {name} ({kind})")
+            return kind, payload
+        return kind, await request.run(parse_excel_payload, content, name, kind=kind, date_range=date_range)
+
+    names = list(excel_files)
+    payloads = await asyncio.gather(*(parse(name, excel_files[name]) for name in names))
+    return dict(zip(names, payloads))
+
+
+def load_report_data(excel_files, date_range=None, parsed_workbooks=None, from_store=False):
+    """Parse the uploaded inputs into (data_frames, aggregates) for create_ppt.
+
+    aggregates is None unless combined_sources was streamed or read from the
+    mention store; see build_report for the arguments.
+    """
+    excel_files = excel_files or {}
+    parsed_inputs = {}
+    streamed = []
+    aggregates = None
+
+    def add_aggregates(counts):
+        nonlocal aggregates
+        aggregates = counts if aggregates is None else merge_aggregates(aggregates, counts)
+
+    for name, (kind, payload) in (parsed_workbooks or {}).items():
+        if kind == AGGREGATES:
+            streamed.append(pickle.loads(payload))
+        else:
+            parsed_inputs[name] = pickle.loads(payload)
+    for name, content in excel_files.items():
+        if ingest_kind(name, content) == AGGREGATES:
+            streamed.append(pickle.loads(parse_excel_payload(content, name, kind=AGGREGATES, date_range=date_range)))
+            continue
+        # Parse the input (identical uploads are served from the parse cache)
+        parsed_inputs[name] = parse_excel_data_cached(content, name, date_range=date_range)
+
+    if from_store:
+        # An uploaded combined_sources sheet replaces the store's rows of that sheet for the report dates
+        uploaded = [source for counts in streamed for source in counts['sources']]
+        uploaded += [
+            sheet_name
+            for name, sheets in parsed_inputs.items() if split_input_name(name)[0] == STREAMED_ROLE
+            for sheet_name in sheets
+        ]
+        add_aggregates(mention_store.load_aggregates(date_range, exclude_sources=uploaded))
+    for counts in streamed:
+        add_aggregates(counts)
+
+    if aggregates is not None:
+        # combined_sources sheets sent as files alongside streamed or stored counts are added to them
+        loaded = {STREAMED_ROLE: {}}
+        for name in [name for name in parsed_inputs if split_input_name(name)[0] == STREAMED_ROLE]:
+            loaded[STREAMED_ROLE].update(parsed_inputs.pop(name))
+        if loaded[STREAMED_ROLE]:
+            add_aggregates(build_aggregates(loaded))
+        require_sheets(STREAMED_ROLE, aggregates['sources'])
+    data_frames = combine_inputs(parsed_inputs)
+
+    skipped = rows_skipped(data_frames, aggregates)
+    if date_range is not None:
+        logger.info(f"Report dates {date_range[0]:%Y-%m-%d}..{date_range[1]:%Y-%m-%d}: skipped {sum(skipped.values())} rows at ingestion")
+    return data_frames, aggregates
+
+
+def render_report(data_frames, aggregates, report_options):
+    """create_ppt into report_options["output_path"], or into memory when it is None"""
+    if report_options.get("output_path") is None:
+        buffer = io.BytesIO()
+        create_ppt(data_frames=data_frames, aggregates=aggregates, **{**report_options, "output_path": buffer})
+        return buffer.getvalue()
+
+    create_ppt(data_frames=data_frames, aggregates=aggregates, **report_options)
+    return report_options["output_path"]
+
+
+def build_report(report_options, excel_files=None, parsed_workbooks=None, from_store=False):
+    """Parse the uploaded inputs and build the deck; runs in a report pool worker.
+
+    excel_files maps each input name ("combined_sources", "official_facebook",
+    "combined_sources.News", ...) to the uploaded bytes in any supported
+    format; parsed_workbooks holds inputs already parsed by parse_workbooks
+    with the same report dates. With from_store, the combined_sources
+    aggregates are summed from the mention store's daily rollups for the
+    report dates; an uploaded combined_sources sheet replaces the stored
+    mentions of that sheet instead of being counted on top of them.
+    report_options are passed to create_ppt; when output_path is None the
+    deck is built in memory and its bytes returned.
+    """
+    data_frames, aggregates = load_report_data(excel_files, report_date_range(report_options), parsed_workbooks, from_store)
+    return render_report(data_frames, aggregates, report_options)
+
+
+def prepare_batch(excel_files=None, date_range=None, parsed_workbooks=None, from_store=False):
+    """Parse and aggregate the inputs of a batch once; runs in a report pool worker.
+
+    Returns a pickle of (data_frames, aggregates) with combined_sources
+    already reduced to its count tables, so every deck of the batch starts
+    from the same small payload instead of re-parsing or re-grouping the
+    mention rows.
+    """
+    data_frames, aggregates = load_report_data(excel_files, date_range, parsed_workbooks, from_store)
+    if aggregates is None:
+        aggregates = build_aggregates(data_frames)
+    data_frames.pop(STREAMED_ROLE, None)
+    return pickle.dumps((data_frames, aggregates), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def build_batch_deck(prepared, report_options):
+    """Build one deck of a batch from prepare_batch() output; runs in a report pool worker"""
+    data_frames, aggregates = pickle.loads(prepared)
+    return render_report(data_frames, aggregates, report_options)
+
+
+def batch_deck_name(company_name, used_names):
+    """File name for a company's deck that is safe in zips and directories, and unique in the batch"""
+    stem = "".join(char if char.isalnum() or char in "-_" else "_" for char in company_name.strip()) or "report"
+    name, suffix = f"{stem}.pptx", 1
+    while name in used_names:
+        suffix += 1
+        name = f"{stem}-{suffix}.pptx"
+    used_names.add(name)
+    return name
+
+
+def build_report_job(job_id, report_options, excel_files=None, parsed_workbooks=None, from_store=False):
+    """build_report for an asynchronous job, tracking its progress in the job store.
+
+    The deck is written to the job's directory so it can be downloaded later.
+    """
+    output_path = os.path.join(job_store.job_dir(job_id), "report.pptx")
+    job_store.mark_running(job_id)
+    try:
+        build_report(
+            {
+                **report_options,
+                "output_path": output_path,
+                "progress_callback": functools.partial(job_store.update_stage, job_id),
+            },
+            excel_files,
+            parsed_workbooks=parsed_workbooks,
+            from_store=from_store,
+        )
+    except Exception as e:
+        logger.error(f"Report job {job_id} failed: {str(e)}")
+        job_store.mark_failed(job_id, str(e))
+        raise
+    job_store.mark_done(job_id, output_path)
+    return output_path
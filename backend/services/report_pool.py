@@ -0,0 +1,191 @@
+import asyncio
+import functools
+import logging
+import multiprocessing
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from config import REPORT_JOB_TIMEOUT, REPORT_MAX_WORKERS, REPORT_POOL_START_METHOD, REPORT_QUEUE_DEPTH
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_in_flight = 0
+
+
+class ReportPoolSaturated(Exception):
+    """Raised when every worker is busy and the wait queue is full"""
+
+
+class ReportTimeout(Exception):
+    """Raised when a report job does not finish within its time limit"""
+
+
+def get_executor():
+    """Return the shared report process pool, creating it on first use"""
+    global _executor
+    if _executor is None:
+        logger.debug(f"Starting report pool with {REPORT_MAX_WORKERS} workers")
+        _executor = ProcessPoolExecutor(
+            max_workers=REPORT_MAX_WORKERS,
+            mp_context=multiprocessing.get_context(REPORT_POOL_START_METHOD),
+        )
+    return _executor
+
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        logger.debug("Shutting down report pool")
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def pool_status():
+    return {
+        "max_workers": REPORT_MAX_WORKERS,
+        "queue_depth": REPORT_QUEUE_DEPTH,
+        "in_flight": _in_flight,
+    }
+
+
+def _raise_timeout(signum, frame):
+    raise ReportTimeout("Report job exceeded its time limit")
+
+
+def _run_with_deadline(func, deadline, args, kwargs):
+    """Run func inside a worker process, aborting it once the wall-clock deadline passes.
+
+    The event loop stops waiting at the same deadline, but a process pool
+    cannot cancel a job that has already started, so the worker enforces the
+    limit itself (POSIX only) to get its slot back. The alarm raises
+    ReportTimeout between Python statements, so the job unwinds like any
+    other error: decks and cache entries are written to temp files and
+    renamed (see services.pptx_stream.write_pptx), and an interrupted write
+    removes its temp file instead of leaving a partial output behind.
+    """
+    use_alarm = deadline is not None and hasattr(signal, "SIGALRM")
+    if use_alarm:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            raise ReportTimeout("Report job reached a worker after its deadline")
+        previous = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, remaining)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+
+def ensure_report_capacity():
+    """Raise ReportPoolSaturated if a new request would exceed the queue limit"""
+    if _in_flight >= REPORT_MAX_WORKERS + REPORT_QUEUE_DEPTH:
+        raise ReportPoolSaturated(
+            f"Report queue is full ({_in_flight} jobs in progress), try again later"
+        )
+
+
+def _call_in_loop(loop, callback, future):
+    # Done callbacks of pool futures run on the pool's management thread
+    try:
+        loop.call_soon_threadsafe(callback, future)
+    except RuntimeError:
+        # The event loop is already closed
+        pass
+
+
+class ReportRequest:
+    """One admitted request on the report pool.
+
+    The jobs run through the same request (its parses and its deck) share
+    one deadline, timeout seconds after admission. Queue slots count jobs:
+    a request holds one slot per job submitted and not yet finished, and at
+    least one while its block is open. Use as an async context manager;
+    entering raises ReportPoolSaturated when REPORT_MAX_WORKERS +
+    REPORT_QUEUE_DEPTH slots are taken. Jobs of an admitted request are
+    never rejected, so a request fanning out to several parses can take the
+    count past the limit until they finish; new requests wait for that. The
+    slots are held until the block is left and every job it submitted has
+    stopped running, even after the caller gave up on a job with
+    ReportTimeout.
+    """
+
+    def __init__(self, timeout=REPORT_JOB_TIMEOUT):
+        self.timeout = timeout
+        self.deadline = None
+        self._jobs = set()
+        self._open = False
+        self._slots = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    async def __aenter__(self):
+        ensure_report_capacity()
+        self._open = True
+        self._idle.clear()
+        self._update_slots()
+        # Wall clock, so the worker process can check the same deadline
+        self.deadline = time.time() + self.timeout if self.timeout else None
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._open = False
+        self._update_slots()
+
+    def _job_done(self, future):
+        self._jobs.discard(future)
+        self._update_slots()
+
+    def _update_slots(self):
+        global _in_flight
+        slots = max(len(self._jobs), 1 if self._open else 0)
+        _in_flight += slots - self._slots
+        self._slots = slots
+        if not slots:
+            self._idle.set()
+
+    async def finished(self):
+        """Wait until the request has left its block and none of its jobs is still running"""
+        await self._idle.wait()
+
+    async def run(self, func, *args, **kwargs):
+        """Run a CPU-bound job of this request on the process pool without blocking the event loop.
+
+        Raises ReportTimeout when the request's deadline passes first.
+        """
+        remaining = None
+        if self.deadline is not None:
+            remaining = self.deadline - time.time()
+            if remaining <= 0:
+                raise ReportTimeout(f"Report request did not finish within {self.timeout:g}s")
+        loop = asyncio.get_running_loop()
+        job = functools.partial(_run_with_deadline, func, self.deadline, args, kwargs)
+        future = get_executor().submit(job)
+        self._jobs.add(future)
+        self._update_slots()
+        future.add_done_callback(functools.partial(_call_in_loop, loop, self._job_done))
+        try:
+            # Cancelling the wrapper on timeout only cancels jobs still waiting for a worker
+            return await asyncio.wait_for(asyncio.wrap_future(future), remaining)
+        except asyncio.TimeoutError:
+            raise ReportTimeout(f"Report request did not finish within {self.timeout:g}s")
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); start a fresh pool for later jobs
+            logger.error("Report pool is broken, restarting it")
+            shutdown_executor()
+            raise
+
+
+async def run_in_report_pool(func, *args, timeout=REPORT_JOB_TIMEOUT, **kwargs):
+    """Run a single CPU-bound report job on the process pool as its own request.
+
+    Raises ReportPoolSaturated when the queue is full, and ReportTimeout when
+    the job does not complete within timeout seconds of submission; see
+    ReportRequest for requests made of several jobs.
+    """
+    async with ReportRequest(timeout) as request:
+        return await request.run(func, *args, **kwargs)
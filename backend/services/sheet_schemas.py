@@ -0,0 +1,231 @@
+import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Column kinds understood by apply_schema
+DATETIME = 'datetime'    # parsed once to datetime64, unparseable values become NaT
+SENTIMENT = 'sentiment'  # -1/0/1 stored as nullable Int8, anything else becomes <NA>
+CATEGORY = 'category'    # repeated labels (companies, authors, pages)
+COUNT = 'count'          # engagement counters, missing values count as 0
+KEY = 'key'              # optional identifiers kept as text; a missing column becomes all-NA
+
+COUNT_DTYPE = 'int32'
+
+# Report window formats: the upload form sends ISO dates, older callers day-first ones
+REPORT_DATE_FORMATS = ['%Y-%m-%d', '%d.%m.%Y']
+
+MENTION_COLUMNS = {
+    'Day': DATETIME,
+    'Company': CATEGORY,
+    'Sentiment': SENTIMENT,
+}
+
+# Post id and link of a mention, loaded only when ingesting into the mention
+# store (services/mention_store.py), which deduplicates on them
+MENTION_KEY_COLUMNS = {
+    'ID': KEY,
+    'Url': KEY,
+}
+
+ENGAGEMENT_COLUMNS = {
+    'comment_count': COUNT,
+    'like_count': COUNT,
+    'share_count': COUNT,
+    'view_count': COUNT,
+}
+
+# Declared inputs per uploaded file, keyed "<file>.<sheet>". A "*" sheet applies
+# to every sheet of that file (single-sheet exports whose sheet name varies).
+# Only the listed columns are loaded, and sheets of a declared file that have
+# no schema are skipped entirely.
+SHEET_SCHEMAS = {
+    'combined_sources.News': {
+        'columns': {**MENTION_COLUMNS, 'Author': CATEGORY},
+        'required': True,
+    },
+    'combined_sources.Facebook': {
+        'columns': {**MENTION_COLUMNS, **ENGAGEMENT_COLUMNS},
+        'required': False,
+    },
+    'combined_sources.Instagram': {
+        'columns': MENTION_COLUMNS,
+        'required': False,
+    },
+    'combined_sources.Twitter': {
+        'columns': MENTION_COLUMNS,
+        'required': False,
+    },
+    'combined_sources.Linkedin': {
+        'columns': MENTION_COLUMNS,
+        'required': False,
+    },
+    'official_facebook.*': {
+        'columns': {'author_name': CATEGORY, **ENGAGEMENT_COLUMNS},
+        'required': True,
+    },
+    'official_instagram.*': {
+        'columns': {'Company': CATEGORY, 'Likes': COUNT, 'Comments': COUNT},
+        'required': True,
+    },
+    'facebook_reachs.*': {
+        'columns': ENGAGEMENT_COLUMNS,
+        'required': True,
+    },
+}
+
+
+class SchemaError(ValueError):
+    """Raised when an uploaded file does not match its declared schema"""
+
+
+def has_schemas(role):
+    """Whether any sheet schema is declared for the given input file"""
+    prefix = f"{role}."
+    return any(key.startswith(prefix) for key in SHEET_SCHEMAS)
+
+
+def get_sheet_schema(role, sheet_name):
+    """Return the schema declared for role.sheet_name (or role.*), if any"""
+    return SHEET_SCHEMAS.get(f"{role}.{sheet_name}") or SHEET_SCHEMAS.get(f"{role}.*")
+
+
+def select_sheets(role, sheet_names):
+    """Return {sheet_name: schema} for the sheets that should be loaded.
+
+    Files without declared schemas keep every sheet (schema None). Missing
+    required sheets raise SchemaError before any sheet is parsed.
+    """
+    if not has_schemas(role):
+        return {sheet_name: None for sheet_name in sheet_names}
+
+    selected = {}
+    for sheet_name in sheet_names:
+        schema = get_sheet_schema(role, sheet_name)
+        if schema is not None:
+            selected[sheet_name] = schema
+        else:
+            logger.debug(f"Skipping undeclared sheet: {role}.{sheet_name}")
+
+    require_sheets(role, sheet_names)
+    if not selected and any(key == f"{role}.*" for key in SHEET_SCHEMAS):
+        raise SchemaError(f"{role}: workbook has no sheets")
+    return selected
+
+
+def require_sheets(role, sheet_names):
+    """Raise SchemaError if a required named sheet of role is not among sheet_names"""
+    missing = [
+        key.split('.', 1)[1]
+        for key, schema in SHEET_SCHEMAS.items()
+        if key.startswith(f"{role}.") and schema['required']
+        and not key.endswith('.*') and key.split('.', 1)[1] not in sheet_names
+    ]
+    if missing:
+        raise SchemaError(f"{role}: missing required sheet(s): {', '.join(missing)}")
+
+
+def with_key_columns(schema):
+    """schema extended with the optional mention key columns"""
+    if schema is None:
+        return None
+    return {**schema, 'columns': {**schema['columns'], **MENTION_KEY_COLUMNS}}
+
+
+def usecols_for(schema):
+    """Column projection for pd.read_excel / ExcelFile.parse"""
+    if schema is None:
+        return None
+    columns = set(schema['columns'])
+    return lambda column: column in columns
+
+
+def key_text(value):
+    """Identifier as comparable text: 12345.0 from Excel and "12345" from CSV both give "12345"; blanks give None"""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    text = str(value).strip()
+    if text.endswith('.0') and text[:-2].isdigit():
+        text = text[:-2]
+    return text or None
+
+
+def apply_schema(df, role, sheet_name, schema):
+    """Validate the projected columns and convert them to their declared dtypes"""
+    if schema is None:
+        return df
+
+    missing = [column for column, kind in schema['columns'].items() if column not in df.columns and kind != KEY]
+    if missing:
+        raise SchemaError(
+            f"{role}.{sheet_name}: missing required column(s): {', '.join(missing)}"
+        )
+
+    converted = {}
+    for column, kind in schema['columns'].items():
+        if kind == KEY:
+            values = df[column] if column in df.columns else pd.Series(None, index=df.index, dtype=object)
+            converted[column] = values.map(key_text, na_action='ignore').astype(object)
+            continue
+        values = df[column]
+        if kind == DATETIME:
+            converted[column] = pd.to_datetime(values, errors='coerce', format='mixed')
+        elif kind == SENTIMENT:
+            numeric = pd.to_numeric(values, errors='coerce')
+            converted[column] = numeric.where(numeric.isin([-1, 0, 1])).astype('Int8')
+        elif kind == CATEGORY:
+            converted[column] = values.astype('category')
+        elif kind == COUNT:
+            converted[column] = pd.to_numeric(values, errors='coerce').fillna(0).astype(COUNT_DTYPE)
+        else:
+            raise ValueError(f"Unknown column kind {kind!r} for {role}.{sheet_name}.{column}")
+
+    return pd.DataFrame(converted, index=df.index)
+
+
+def parse_date_range(start_date, end_date):
+    """(start, end) Timestamps of the report window, or None if either date is unusable"""
+    bounds = []
+    for value in (start_date, end_date):
+        parsed = None
+        for date_format in REPORT_DATE_FORMATS:
+            try:
+                parsed = pd.to_datetime(value, format=date_format)
+                break
+            except (TypeError, ValueError):
+                continue
+        if parsed is None:
+            logger.warning(f"Ignoring report date range, cannot parse {value!r}")
+            return None
+        bounds.append(parsed)
+    return tuple(bounds)
+
+
+def date_range_tag(date_range):
+    """Short stable label for a date range, used in cache keys"""
+    if date_range is None:
+        return 'all'
+    start, end = date_range
+    return f"{start:%Y%m%d}-{end:%Y%m%d}"
+
+
+def filter_date_range(df, schema, date_range):
+    """Drop rows dated outside the report window; returns (df, rows_skipped).
+
+    Sheets without a date column are returned unchanged. The end date is
+    inclusive, and undated rows are kept since they cannot be placed outside
+    the window.
+    """
+    if date_range is None or schema is None:
+        return df, 0
+    date_columns = [column for column, kind in schema['columns'].items() if kind == DATETIME]
+    if not date_columns:
+        return df, 0
+
+    start, end = date_range
+    day = df[date_columns[0]]
+    inside = day.isna() | ((day >= start) & (day < end + pd.Timedelta(days=1)))
+    skipped = int(len(df) - inside.sum())
+    if skipped:
+        df = df[inside].reset_index(drop=True)
+    return df, skipped
@@ -0,0 +1,84 @@
+import copy
+import logging
+import re
+
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml.ns import qn
+
+from services.pptx_compat import require_pptx_internals
+
+logger = logging.getLogger(__name__)
+
+# Relies on python-pptx internals; fails on import if they moved
+require_pptx_internals()
+
+
+class ShapeFragment:
+    """Shapes built once with the python-pptx API and cloned into other slides as XML.
+
+    capture() records the shapes a builder adds to one slide; clone_into()
+    deep-copies them into another slide's shape tree with fresh shape ids
+    and names, pictures related to that slide, and named texts replaced.
+    """
+
+    def __init__(self, elements, image_parts, text_slots):
+        self._elements = elements
+        # rId on the captured slide -> ImagePart, re-related on every clone
+        self._image_parts = image_parts
+        # slot name -> (element index, index of the a:t among the element's a:t)
+        self._text_slots = text_slots
+
+    @classmethod
+    def capture(cls, slide, build, texts=None):
+        """Run build(slide) and record the shapes it added.
+
+        texts maps slot names to text exactly as build wrote it; clone_into
+        replaces those a:t elements by slot name.
+        """
+        sp_tree = slide.shapes._spTree
+        before = set(sp_tree)
+        build(slide)
+        elements = [copy.deepcopy(element) for element in sp_tree if element not in before]
+
+        image_parts = {}
+        for element in elements:
+            for blip in element.iter(qn('a:blip')):
+                rId = blip.get(qn('r:embed'))
+                image_parts[rId] = slide.part.related_part(rId)
+
+        text_slots = {}
+        for name, text in (texts or {}).items():
+            text_slots[name] = next(
+                (index, position)
+                for index, element in enumerate(elements)
+                for position, t in enumerate(element.iter(qn('a:t')))
+                if t.text == text
+            )
+        logger.debug(f"Captured fragment of {len(elements)} shapes")
+        return cls(elements, image_parts, text_slots)
+
+    def clone_into(self, slide, **texts):
+        """Append a copy of the fragment to slide, with texts replacing their slots"""
+        shapes = slide.shapes
+        sp_tree = shapes._spTree
+        rIds = {rId: slide.part.relate_to(part, RT.IMAGE) for rId, part in self._image_parts.items()}
+        clones = [copy.deepcopy(element) for element in self._elements]
+
+        for name, text in texts.items():
+            index, position = self._text_slots[name]
+            for current, t in enumerate(clones[index].iter(qn('a:t'))):
+                if current == position:
+                    t.text = text
+                    break
+
+        shape_id = shapes._next_shape_id
+        for clone in clones:
+            # Same ids and "<kind> <n>" names add_shape/add_picture would have given
+            c_nv_pr = next(clone.iter(qn('p:cNvPr')))
+            c_nv_pr.set('id', str(shape_id))
+            c_nv_pr.set('name', re.sub(r'\d+$', str(shape_id - 1), c_nv_pr.get('name')))
+            shape_id += 1
+            for blip in clone.iter(qn('a:blip')):
+                blip.set(qn('r:embed'), rIds[blip.get(qn('r:embed'))])
+            sp_tree.insert_element_before(clone, 'p:extLst')
+        return clones
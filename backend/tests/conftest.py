@@ -0,0 +1,9 @@
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# Sample inputs shipped with the repo
+UPLOADS_DIR = os.path.join(BACKEND_DIR, "uploads")
+
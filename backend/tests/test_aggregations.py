@@ -0,0 +1,38 @@
+import pandas as pd
+
+from services.aggregations import build_aggregates, facebook_engagement, mention_count, sentiment_by_date_label
+
+
+def combined_sources(**sheets):
+    return {'combined_sources': sheets}
+
+
+def test_rows_without_company_count_everywhere_but_the_engagement_table():
+    facebook = pd.DataFrame({
+        'Company': pd.Series(['A', None, 'A'], dtype='category'),
+        'Day': pd.to_datetime(['2025-04-01', '2025-04-01', '2025-04-02']),
+        'Sentiment': pd.Series([1, 0, -1], dtype='Int8'),
+        'comment_count': [1, 2, 3],
+        'like_count': [4, 5, 6],
+        'share_count': [0, 0, 0],
+        'view_count': [0, 0, 0],
+    })
+    aggregates = build_aggregates(combined_sources(Facebook=facebook))
+
+    engagement = aggregates['facebook_engagement']
+    assert int(engagement['post_count'].sum()) == mention_count(aggregates['sentiment'], 'Facebook') == 3
+    assert engagement['Company'].isna().sum() == 1
+
+    table = facebook_engagement(aggregates)
+    assert table['Company'].tolist() == ['A']
+    assert table[['comment_count', 'like_count', 'post_count']].values.tolist() == [[4, 10, 2]]
+
+
+def test_date_labels_are_iso_text():
+    instagram = pd.DataFrame({
+        'Company': pd.Series(['A', 'A'], dtype='category'),
+        'Day': pd.to_datetime(['2025-04-02', '2025-04-01']),
+        'Sentiment': pd.Series([1, 1], dtype='Int8'),
+    })
+    by_day = sentiment_by_date_label(build_aggregates(combined_sources(Instagram=instagram))['sentiment'], 'Instagram')
+    assert by_day.index.tolist() == ['2025-04-01', '2025-04-02']
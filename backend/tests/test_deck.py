@@ -0,0 +1,75 @@
+import io
+import os
+
+from PIL import Image
+from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+
+from conftest import UPLOADS_DIR
+from services.report_jobs import build_report
+
+INPUTS = ['combined_sources', 'official_facebook', 'official_instagram', 'facebook_reachs']
+
+
+def write_image(path, size, color):
+    Image.new('RGB', size, color).save(path)
+    return str(path)
+
+
+def count_shapes(shapes):
+    pictures = charts = 0
+    for shape in shapes:
+        if shape.shape_type == MSO_SHAPE_TYPE.GROUP:
+            group_pictures, group_charts = count_shapes(shape.shapes)
+            pictures += group_pictures
+            charts += group_charts
+        elif shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
+            pictures += 1
+        elif shape.has_chart:
+            charts += 1
+    return pictures, charts
+
+
+def test_sample_deck_reopens_with_its_pictures_and_charts(tmp_path, monkeypatch):
+    excel_files = {}
+    for name in INPUTS:
+        with open(os.path.join(UPLOADS_DIR, f"{name}.xlsx"), 'rb') as f:
+            excel_files[name] = f.read()
+    # Caches are created relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    logo = write_image(tmp_path / "logo.png", (192, 192), 'navy')
+    post = write_image(tmp_path / "post.jpg", (640, 480), 'teal')
+
+    deck = build_report(
+        {
+            'output_path': None,
+            'start_date': '2025-04-01',
+            'end_date': '2025-04-30',
+            'company_name': 'ABB Bank',
+            'company_logo_path': logo,
+            'mediaeye_logo_path': logo,
+            'neurotime_logo_path': logo,
+            'competitor_logo_paths': [logo],
+            'positive_links': ['http://a'],
+            'negative_links': [],
+            'positive_posts': [{'image_path': post, 'link': 'http://p'}],
+            'negative_posts': [{'image_path': post, 'link': 'http://n'}],
+            'has_competitors': True,
+            'template_color': '#112233',
+            'title_color': '#445566',
+            'graph_color': '#778899',
+        },
+        excel_files,
+    )
+
+    prs = Presentation(io.BytesIO(deck))
+    counts = [count_shapes(slide.shapes) for slide in prs.slides]
+    assert len(counts) == 13
+    assert sum(pictures for pictures, _ in counts) == 18
+    assert sum(charts for _, charts in counts) == 13
+    for slide in prs.slides:
+        for shape in slide.shapes:
+            if shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
+                assert shape.image.blob
+            elif shape.has_chart:
+                assert shape.chart.plots[0].categories
@@ -0,0 +1,54 @@
+import io
+import os
+
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+from services.aggregations import AUTHOR_KEYS, CUBE_KEYS, build_aggregates
+from services.excel_stream import STREAMED_ROLE, stream_aggregates
+from services.input_formats import parse_input
+from services.sheet_schemas import parse_date_range
+
+from conftest import UPLOADS_DIR
+
+
+@pytest.fixture(scope="module")
+def workbook_bytes():
+    """The sample combined_sources workbook plus blank rows and mentions without a company"""
+    workbook = load_workbook(os.path.join(UPLOADS_DIR, f"{STREAMED_ROLE}.xlsx"))
+    for sheet_name in ("News", "Facebook"):
+        worksheet = workbook[sheet_name]
+        header = [cell.value for cell in worksheet[1]]
+        template = [cell.value for cell in worksheet[2]]
+        worksheet.append([None] * len(header))
+        worksheet.append([None if name == "Company" else value for name, value in zip(header, template)])
+        worksheet.insert_rows(3)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def sorted_table(df, keys):
+    return df.sort_values(keys, na_position="first", ignore_index=True)
+
+
+@pytest.mark.parametrize("date_range", [None, parse_date_range("2025-04-05", "2025-04-20")])
+def test_stream_matches_frames(workbook_bytes, date_range):
+    # Small chunks so the per-chunk counts are combined several times
+    streamed = stream_aggregates(io.BytesIO(workbook_bytes), chunk_rows=100, date_range=date_range)
+    framed = build_aggregates({STREAMED_ROLE: parse_input(io.BytesIO(workbook_bytes), STREAMED_ROLE, date_range)})
+
+    assert streamed["sources"] == framed["sources"]
+    assert streamed["rows_skipped"] == framed["rows_skipped"]
+    pd.testing.assert_frame_equal(sorted_table(streamed["sentiment"], CUBE_KEYS), sorted_table(framed["sentiment"], CUBE_KEYS))
+    pd.testing.assert_frame_equal(sorted_table(streamed["authors"], AUTHOR_KEYS), sorted_table(framed["authors"], AUTHOR_KEYS))
+    pd.testing.assert_frame_equal(
+        sorted_table(streamed["facebook_engagement"], ["Company"]),
+        sorted_table(framed["facebook_engagement"], ["Company"]),
+    )
+
+
+def test_stream_keeps_mentions_without_company(workbook_bytes):
+    streamed = stream_aggregates(io.BytesIO(workbook_bytes), chunk_rows=100)
+    assert streamed["sentiment"]["Company"].isna().any()
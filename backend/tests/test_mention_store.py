@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+from conftest import UPLOADS_DIR
+from services import mention_store
+from services.aggregations import build_aggregates
+from services.input_formats import parse_input
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(mention_store, "MENTION_STORE_PATH", str(tmp_path / "mentions.sqlite3"))
+
+
+@pytest.fixture(scope="module")
+def sample_sheets():
+    return parse_input(os.path.join(UPLOADS_DIR, "combined_sources.xlsx"), "combined_sources", with_keys=True)
+
+
+def mention_total(aggregates):
+    return int(aggregates['sentiment']['count'].sum())
+
+
+def test_posts_repeated_in_an_export_are_stored_once(store, sample_sheets):
+    summary = mention_store.ingest_mentions(sample_sheets)
+
+    assert sum(counts['duplicates'] for counts in summary.values()) == 0
+    repeated = sum(counts['repeated'] for counts in summary.values())
+    assert repeated == 26
+    for counts in summary.values():
+        assert counts['rows'] == counts['inserted'] + counts['duplicates'] + counts['repeated'] + counts['unkeyed']
+
+    uploaded = mention_total(build_aggregates({'combined_sources': sample_sheets}))
+    assert mention_total(mention_store.load_aggregates()) == uploaded - repeated
+
+
+def test_reingesting_an_export_adds_nothing(store, sample_sheets):
+    first = mention_store.ingest_mentions(sample_sheets)
+    stored = mention_total(mention_store.load_aggregates())
+
+    again = mention_store.ingest_mentions(sample_sheets)
+    assert sum(counts['inserted'] for counts in again.values()) == 0
+    assert {sheet: counts['duplicates'] for sheet, counts in again.items()} == {
+        sheet: counts['inserted'] for sheet, counts in first.items()
+    }
+    assert mention_total(mention_store.load_aggregates()) == stored
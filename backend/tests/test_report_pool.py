@@ -0,0 +1,42 @@
+import asyncio
+import os
+import time
+
+import pytest
+from pptx import Presentation
+
+from services import pptx_stream, report_pool
+from services.report_pool import ReportRequest, ReportTimeout
+
+
+@pytest.fixture
+def report_pool_shutdown():
+    yield
+    report_pool.shutdown_executor()
+
+
+def test_queue_slots_count_jobs(report_pool_shutdown):
+    async def fan_out():
+        async with ReportRequest(timeout=60) as request:
+            assert report_pool.pool_status()["in_flight"] == 1
+            jobs = [asyncio.ensure_future(request.run(time.sleep, 1)) for _ in range(3)]
+            await asyncio.sleep(0)
+            assert report_pool.pool_status()["in_flight"] == 3
+            await asyncio.gather(*jobs)
+            assert report_pool.pool_status()["in_flight"] == 1
+        await request.finished()
+        return report_pool.pool_status()["in_flight"]
+
+    assert asyncio.run(fan_out()) == 0
+
+
+def test_interrupted_save_leaves_no_partial_deck(tmp_path, monkeypatch):
+    def timed_out(prs, zipf, release_parts):
+        zipf.writestr("[Content_Types].xml", b"<Types/>")
+        raise ReportTimeout("Report job exceeded its time limit")
+
+    monkeypatch.setattr(pptx_stream, "_write_members", timed_out)
+    output_path = tmp_path / "report.pptx"
+    with pytest.raises(ReportTimeout):
+        pptx_stream.write_pptx(Presentation(), str(output_path))
+    assert os.listdir(tmp_path) == []
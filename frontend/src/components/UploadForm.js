@@ -1,6 +1,11 @@
 import React, { useState } from "react";
 import axios from "axios";
 
+const JOB_POLL_INTERVAL_MS = 1000;
+const DATA_FILE_TYPES = ".xlsx,.csv,.csv.gz,.parquet,.arrow,.feather";
+// Combined sources holds several sheets, so it is only accepted as one workbook
+const WORKBOOK_FILE_TYPES = ".xlsx";
+
 function UploadForm() {
   const [excels, setExcels] = useState({
     combined_sources: null,
@@ -13,6 +18,7 @@ function UploadForm() {
   const [companyName, setCompanyName] = useState("");
   const [error, setError] = useState("");
   const [loading, setLoading] = useState(false);
+  const [progress, setProgress] = useState(null);
   const [hasCompetitors, setHasCompetitors] = useState(true);
   const [positiveLinks, setPositiveLinks] = useState([""]);
   const [negativeLinks, setNegativeLinks] = useState([""]);
@@ -32,8 +38,17 @@ function UploadForm() {
 
   const handleExcelChange = (file, type) => {
     if (file) {
-      const newFile = new File([file], `${type}.xlsx`, {
-        type: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+      if (type === "combined_sources" && !file.name.toLowerCase().endsWith(WORKBOOK_FILE_TYPES)) {
+        setError("Combined sources must be an .xlsx workbook");
+        return;
+      }
+      // Keep the original extension; the backend reads Excel, CSV, Parquet and Arrow
+      const dot = file.name.lastIndexOf(".");
+      const extension = file.name.toLowerCase().endsWith(".csv.gz")
+        ? ".csv.gz"
+        : dot >= 0 ? file.name.slice(dot) : "";
+      const newFile = new File([file], `${type}${extension}`, {
+        type: file.type,
       });
       setExcels((prev) => ({
         ...prev,
@@ -222,33 +237,29 @@ function UploadForm() {
       formData.append("graph_color", colors.graph);
       
       const apiUrl = process.env.REACT_APP_API_URL;
-      const response = await axios.post(`${apiUrl}/generate-ppt/`,
-        formData,
-        {
-          responseType: "blob",
-          headers: {
-            "Content-Type": "multipart/form-data",
-          },
-          validateStatus: function (status) {
-            return status < 500;
-          },
-        }
-      );
+      const submitResponse = await axios.post(`${apiUrl}/jobs/`, formData, {
+        headers: {
+          "Content-Type": "multipart/form-data",
+        },
+      });
 
-      if (response.status !== 200) {
-        const reader = new FileReader();
-        reader.onload = () => {
-          try {
-            const errorData = JSON.parse(reader.result);
-            setError(errorData.detail || "An error occurred.");
-          } catch {
-            setError("An error occurred.");
-          }
-        };
-        reader.readAsText(response.data);
-        setLoading(false);
-        return;
+      // Poll the job until the report is built
+      let job = submitResponse.data;
+      while (job.status !== "done") {
+        if (job.status === "failed") {
+          setError(job.error || "An error occurred.");
+          return;
+        }
+        setProgress(job);
+        await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+        const statusResponse = await axios.get(`${apiUrl}${job.status_url}`);
+        job = statusResponse.data;
       }
+      setProgress(job);
+
+      const response = await axios.get(`${apiUrl}${job.download_url}`, {
+        responseType: "blob",
+      });
 
       const blob = new Blob([response.data], {
         type: "application/vnd.openxmlformats-officedocument.presentationml.presentation",
@@ -263,7 +274,9 @@ function UploadForm() {
       window.URL.revokeObjectURL(url);
     } catch (err) {
       console.error("Error:", err);
-      if (err.response?.data) {
+      if (err.response?.data && !(err.response.data instanceof Blob)) {
+        setError(err.response.data.detail || "An error occurred.");
+      } else if (err.response?.data) {
         const reader = new FileReader();
         reader.onload = () => {
           try {
@@ -279,6 +292,7 @@ function UploadForm() {
       }
     } finally {
       setLoading(false);
+      setProgress(null);
     }
   };
 
@@ -431,7 +445,7 @@ function UploadForm() {
             <input
               id="combined_sources"
               type="file"
-              accept=".xlsx"
+              accept={WORKBOOK_FILE_TYPES}
               onChange={(e) => handleExcelChange(e.target.files?.[0], "combined_sources")}
               aria-label="Combined sources Excel file"
               style={{ marginTop: "5px" }}
@@ -443,7 +457,7 @@ function UploadForm() {
             <input
               id="official_instagram"
               type="file"
-              accept=".xlsx"
+              accept={DATA_FILE_TYPES}
               onChange={(e) => handleExcelChange(e.target.files?.[0], "official_instagram")}
               aria-label="Official Instagram Excel file"
               style={{ marginTop: "5px" }}
@@ -455,7 +469,7 @@ function UploadForm() {
             <input
               id="official_facebook"
               type="file"
-              accept=".xlsx"
+              accept={DATA_FILE_TYPES}
               onChange={(e) => handleExcelChange(e.target.files?.[0], "official_facebook")}
               aria-label="Official Facebook Excel file"
               style={{ marginTop: "5px" }}
@@ -468,7 +482,7 @@ function UploadForm() {
               <input
                 id="facebook_reachs"
                 type="file"
-                accept=".xlsx"
+                accept={DATA_FILE_TYPES}
                 onChange={(e) => handleExcelChange(e.target.files?.[0], "facebook_reachs")}
                 aria-label="Facebook reaches Excel file"
                 style={{ marginTop: "5px" }}
@@ -744,7 +758,11 @@ function UploadForm() {
           disabled={loading}
           aria-busy={loading}
         >
-          {loading ? "Generating..." : "Generate Report"}
+          {loading
+            ? progress && progress.stage
+              ? `Generating... (${progress.stages_done}/${progress.stages_total} ${progress.stage})`
+              : "Generating..."
+            : "Generate Report"}
         </button>
       </form>
     </>